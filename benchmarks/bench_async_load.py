@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Load test for QueryEngine under concurrent tool calls
+
+Compares the old path (synchronous process_query called from async handlers,
+which blocks the event loop) with aprocess_query on the aiosqlite pool.
+Besides throughput and latency it reports the worst event-loop stall seen by
+a probe task, i.e. how long other clients would have been frozen. In the
+sync mode the per-call latencies exclude that frozen time.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_async_load.py --concurrency 50 --requests 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_utils import percentile
+
+from src.database.database import dispose_async_engine
+from src.mcp_server.query_engine import QueryEngine
+
+WORKLOAD = [
+    "Show me all matches in the dataset",
+    "Which team won the most matches?",
+    "Who scored the most runs across all matches?",
+    "What was the highest total score?",
+    "Who took the most wickets?",
+    "What's the average first innings score?",
+    "Which venue has the highest scoring matches?",
+    "What are the highest partnerships?",
+    "What was RCB's score after 10 overs?",
+    "How does Kohli fare against Bumrah?",
+]
+
+
+async def probe_loop_lag(stop, interval=0.005):
+    """Measure the worst delay between asking to wake up and actually waking up"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run_load(call, total, concurrency):
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(WORKLOAD[i % len(WORKLOAD)])
+
+    async def client():
+        while not queue.empty():
+            query = queue.get_nowait()
+            start = time.perf_counter()
+            await call(query)
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, latencies, await probe
+
+
+async def main_async(args):
+    engine = QueryEngine()
+
+    async def blocking_call(query):
+        # What handle_call_tool used to do
+        return engine.process_query(query)
+
+    modes = [("sync in event loop", blocking_call), ("aprocess_query", engine.aprocess_query)]
+
+    # Warm both paths (pool connections, SQLite page cache)
+    for _, call in modes:
+        await run_load(call, len(WORKLOAD), 1)
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients\n")
+    print(f"{'mode':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max loop stall ms':>20}")
+    for label, call in modes:
+        elapsed, latencies, stall = await run_load(call, args.requests, args.concurrency)
+        print(f"{label:<22}{args.requests / elapsed:>10.0f}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}"
+              f"{stall * 1000:>20.1f}")
+
+    await dispose_async_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent QueryEngine load test")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
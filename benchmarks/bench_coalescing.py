@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Identical concurrent queries: one shared execution vs one execution each
+
+Fires --duplicates copies of the same question at once (varying case and
+spacing, as different clients would type it) through IPLMCPServer.query,
+where they coalesce, and through QueryEngine.aprocess_query directly, where
+every copy runs its own SQL. Reports backend executions per burst, which
+should stay at 1 however many copies arrive, and the burst's wall time.
+Every copy's answer is checked against a sequential run.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_coalescing.py --duplicates 1 8 32 128 --rounds 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_utils import percentile
+
+from src.database.database import dispose_async_engine
+from src.mcp_server.server import IPLMCPServer
+
+QUERIES = [
+    "Who scored the most runs across all matches?",
+    "What are the highest partnerships?",
+    "Which venue has the highest scoring matches?",
+    "Most sixes in the death overs for RCB",
+]
+
+
+def variants(query, count):
+    """count spellings of query that normalize to the same key"""
+    spellings = [query, query.lower(), query.upper(), "  " + query.replace(" ", "  ")]
+    return [spellings[i % len(spellings)] for i in range(count)]
+
+
+async def burst(call, copies):
+    started = time.perf_counter()
+    answers = await asyncio.gather(*(call(q) for q in copies))
+    return time.perf_counter() - started, answers
+
+
+async def main_async(args):
+    server = IPLMCPServer()
+    expected = {q: await server.query_engine.aprocess_query(q) for q in QUERIES}
+
+    print(f"{'duplicates':<12}{'mode':<12}{'executions':>12}{'p50 ms':>10}")
+    for duplicates in args.duplicates:
+        for mode, call in [("direct", server.query_engine.aprocess_query), ("coalesced", server.query)]:
+            executions = []
+            walls = []
+            for round_number in range(args.rounds):
+                query = QUERIES[round_number % len(QUERIES)]
+                before = server.single_flight.executions
+                wall, answers = await burst(call, variants(query, duplicates))
+                # Direct calls bypass the counter: each copy is its own execution
+                executions.append(server.single_flight.executions - before if mode == "coalesced" else duplicates)
+                walls.append(wall)
+                # The unrecognized-query message echoes the caller's spelling; these all parse
+                wrong = [a for a in answers if a != expected[query]]
+                if wrong:
+                    raise SystemExit(f"{mode} x{duplicates}: answer differs for {query!r}:\n{wrong[0][:300]}")
+            print(f"{duplicates:<12}{mode:<12}{sum(executions) / len(executions):>12.1f}"
+                  f"{percentile(walls, 50) * 1000:>10.1f}")
+
+    print(f"\nserver stats: {server.single_flight.stats()}")
+    await dispose_async_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request coalescing for identical concurrent queries")
+    parser.add_argument("--duplicates", type=int, nargs="+", default=[1, 8, 32, 128],
+                        help="Copies of the same query sent at once")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
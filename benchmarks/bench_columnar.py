@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Aggregate latency: SQLite vs the memory-mapped columnar export
+
+Builds a replicated corpus, ingests it into a temporary database, exports it
+with export_columnar and times the aggregates QueryEngine can answer from
+either store. "first" is the first call (for the columnar store this includes
+mapping the files); p50 is over the repeated warm calls.
+
+Usage:
+    python benchmarks/bench_columnar.py --data-dir data_small --copies 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_utils import percentile, replicate_corpus, temp_session_factory
+
+from src.data_processing.json_parser import IPLDataProcessor
+from src.database.columnar import ColumnarStore, export_columnar
+from src.mcp_server.statements import STATEMENTS
+
+# (label, SQLite statement, ColumnarStore method)
+AGGREGATES = [
+    ("scoring by season", 'season_scoring', 'season_scoring'),
+    ("venue scoring", 'venue_highest_scores', 'venue_scoring'),
+]
+
+
+def time_calls(call, repeats):
+    start = time.perf_counter()
+    call()
+    first = time.perf_counter() - start
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return first, percentile(samples, 50)
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite vs columnar aggregate latency")
+    parser.add_argument("--data-dir", default="data_small")
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        db_path = os.path.join(tmp, "bench.db")
+        export_dir = os.path.join(tmp, "columnar")
+
+        count = replicate_corpus(args.data_dir, corpus_dir, args.copies)
+        engine, factory = temp_session_factory(db_path)
+        IPLDataProcessor(session=factory()).process_all_matches(corpus_dir)
+
+        start = time.perf_counter()
+        row_counts = export_columnar(export_dir, bind=engine)
+        export_seconds = time.perf_counter() - start
+        print(f"Corpus: {count} matches, {row_counts['deliveries']} deliveries")
+        print(f"SQLite file {os.path.getsize(db_path) / 1e6:.1f} MB, "
+              f"columnar export {directory_size(export_dir) / 1e6:.1f} MB written in {export_seconds:.2f}s\n")
+
+        store = ColumnarStore(export_dir)
+        print(f"{'aggregate':<24}{'store':<10}{'first ms':>10}{'p50 ms':>10}")
+        with engine.connect() as conn:
+            for label, statement, method in AGGREGATES:
+                runs = [
+                    ("sqlite", lambda: conn.execute(STATEMENTS[statement]).fetchall()),
+                    ("columnar", getattr(store, method)),
+                ]
+                for store_label, call in runs:
+                    first, p50 = time_calls(call, args.repeats)
+                    print(f"{label:<24}{store_label:<10}{first * 1000:>10.1f}{p50 * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Match decoding: generic json.loads dicts vs the typed Cricsheet records
+
+For every match in --data-dir, times json.loads (what ingestion decoded
+into before the records) and decode_match, and measures with tracemalloc
+the peak allocated while decoding and what the decoded match keeps alive
+afterwards. Reported per match as the median over all matches.
+
+Usage:
+    python benchmarks/bench_decode.py --data-dir data_small --repeats 20
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from bench_utils import percentile
+
+from src.data_processing import cricsheet
+from src.data_processing.sources import open_match_source
+
+DECODERS = {
+    "json.loads (dicts)": json.loads,
+    "decode_match (records)": cricsheet.decode_match,
+}
+
+
+def memory(decode, raw):
+    """(peak, retained) bytes allocated by decoding raw"""
+    tracemalloc.start()
+    decoded = decode(raw)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="json.loads vs typed record decoding per match")
+    parser.add_argument("--data-dir", default="data_small",
+                        help="Directory or zip archive of Cricsheet JSON files")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with open_match_source(args.data_dir) as source:
+        documents = [source.read_bytes(location) for _, location in source.entries]
+    size = percentile([len(raw) for raw in documents], 50)
+    print(f"{len(documents)} matches, median {size / 1024:.0f} KiB of JSON\n")
+
+    print(f"{'decoder':<26}{'time us':>10}{'peak KiB':>10}{'kept KiB':>10}")
+    for label, decode in DECODERS.items():
+        times = []
+        for raw in documents:
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                decode(raw)
+            times.append((time.perf_counter() - start) / args.repeats)
+        peaks, kept = zip(*(memory(decode, raw) for raw in documents))
+        print(f"{label:<26}{percentile(times, 50) * 1e6:>10.0f}"
+              f"{percentile(peaks, 50) / 1024:>10.0f}{percentile(kept, 50) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
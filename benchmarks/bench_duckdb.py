@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Scan-heavy aggregates: SQLite vs the in-memory DuckDB mirror
+
+First checks that every statement in ANALYTICS_STATEMENTS returns the same
+rows from both backends (same order, same values; floats to 1e-9 relative),
+and exits with status 1 listing any that don't. Then times each one; "build"
+is the cost of copying the tables into DuckDB, paid once per data
+generation when the server runs with --analytics-backend duckdb.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_duckdb.py --repeats 20
+    python benchmarks/bench_duckdb.py --check-only
+"""
+
+import argparse
+import math
+import sys
+import time
+
+from bench_utils import percentile
+
+from src.database.database import engine
+from src.database.duckdb_mirror import DuckDBMirror
+from src.mcp_server.statements import ANALYTICS_STATEMENTS, STATEMENTS
+
+# Parameters to run each statement with; statements not listed take none
+PARAMETERS = {
+    'phase_run_rate': [{'first': 1, 'last': 6}, {'first': 7, 'last': 15}, {'first': 16, 'last': 20}],
+}
+
+
+def same_rows(expected, actual):
+    if len(expected) != len(actual):
+        return False
+    for expected_row, actual_row in zip(expected, actual):
+        if len(expected_row) != len(actual_row):
+            return False
+        for a, b in zip(expected_row, actual_row):
+            if isinstance(a, float) or isinstance(b, float):
+                if a is None or b is None or not math.isclose(a, b, rel_tol=1e-9):
+                    return False
+            elif a != b:
+                return False
+    return True
+
+
+def time_call(call, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite vs DuckDB mirror for scan-heavy aggregates")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--check-only", action="store_true",
+                        help="Only check that both backends return identical rows")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        mirror = DuckDBMirror(conn)
+        build = time.perf_counter() - start
+        print(f"deliveries rows: {mirror.row_counts['deliveries']}, build: {build * 1000:.0f} ms\n")
+
+        cases = [(name, params) for name in ANALYTICS_STATEMENTS
+                 for params in PARAMETERS.get(name, [None])]
+
+        mismatches = []
+        for name, params in cases:
+            expected = [tuple(row) for row in conn.execute(STATEMENTS[name], params)]
+            _, actual = mirror.execute(ANALYTICS_STATEMENTS[name], params)
+            if not expected:
+                print(f"warning: {name} {params or ''} returned no rows, nothing compared")
+            if not same_rows(expected, actual):
+                mismatches.append((name, params, expected[:3], actual[:3]))
+        for name, params, expected, actual in mismatches:
+            print(f"MISMATCH {name} {params or ''}\n  sqlite: {expected}\n  duckdb: {actual}")
+        if mismatches:
+            sys.exit(1)
+        print(f"{len(cases)} statements return identical rows from both backends\n")
+        if args.check_only:
+            return
+
+        print(f"{'statement':<36}{'sqlite us':>12}{'duckdb us':>12}{'speedup':>9}")
+        for name, params in cases:
+            label = name + (" " + "-".join(str(v) for v in params.values()) if params else "")
+            sqlite_p50 = time_call(lambda: conn.execute(STATEMENTS[name], params).fetchall(), args.repeats)
+            duckdb_p50 = time_call(lambda: mirror.execute(ANALYTICS_STATEMENTS[name], params), args.repeats)
+            print(f"{label:<36}{sqlite_p50 * 1e6:>12.1f}{duckdb_p50 * 1e6:>12.1f}"
+                  f"{sqlite_p50 / duckdb_p50:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Catches leaderboard: decoding deliveries.wicket_fielders vs the fielding table
+
+"json blob" is what a catches leaderboard cost before dismissals were
+normalized: fetch every wicket ball, JSON-decode its fielders and count in
+Python (and it still misses the second wicket of a ball). "fielding" is
+the statement QueryEngine runs now, a backwards walk of ix_fielding_catches.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_fielding.py --repeats 200
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+
+from bench_utils import percentile
+
+from sqlalchemy import text
+
+from src.database.database import engine
+from src.mcp_server.statements import STATEMENTS
+
+WICKET_BALLS = text("""
+    SELECT wicket_type, wicket_fielders FROM deliveries WHERE wicket_taken = 1
+""")
+
+
+def catches_from_json(conn):
+    catches = Counter()
+    for kind, fielders in conn.execute(WICKET_BALLS):
+        if kind in ('caught', 'caught and bowled') and fielders:
+            for fielder in json.loads(fielders) if isinstance(fielders, str) else fielders:
+                catches[fielder['name'] if isinstance(fielder, dict) else fielder] += 1
+    return catches.most_common(15)
+
+
+def timed(call, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catches leaderboard: JSON blobs vs fielding table")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        wickets = conn.execute(text("SELECT COUNT(*) FROM dismissals")).scalar()
+        print(f"{wickets} dismissals\n")
+        print(f"{'source':<12}{'p50 us':>12}")
+        for label, call in [
+            ("json blob", lambda: catches_from_json(conn)),
+            ("fielding", lambda: conn.execute(STATEMENTS['most_catches']).fetchall()),
+        ]:
+            print(f"{label:<12}{timed(call, args.repeats) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
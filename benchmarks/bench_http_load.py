@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Load test for the streamable-HTTP server mode as worker processes scale up
+
+For each worker count this starts `main.py --server --transport http`, waits
+until /mcp answers, drives JSON-RPC tools/call requests at it from concurrent
+HTTP clients and reports requests/sec and latency percentiles. The server is
+stopped before the next worker count is tried.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_http_load.py --workers 1 2 4 --concurrency 32 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench_utils import ROOT, percentile
+from bench_async_load import WORKLOAD
+
+HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
+
+
+def tool_call(request_id, query):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "query_ipl_data", "arguments": {"query": query}},
+    }
+
+
+def parse_response(response):
+    """Return the JSON-RPC message from a JSON or SSE response body"""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                return json.loads(line[len("data:"):])
+        raise ValueError("SSE response carried no data event")
+    return response.json()
+
+
+def start_server(port, workers):
+    command = [sys.executable, str(ROOT / "main.py"), "--server", "--transport", "http",
+               "--port", str(port), "--workers", str(workers)]
+    return subprocess.Popen(command, cwd=os.getcwd(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.post(url, json=tool_call(0, WORKLOAD[0]), headers=HEADERS, timeout=5.0)
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready within {timeout:.0f}s")
+
+
+async def run_load(url, total, concurrency):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def client(http):
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            response = await http.post(url, json=tool_call(i + 1, WORKLOAD[i % len(WORKLOAD)]),
+                                       headers=HEADERS)
+            message = parse_response(response)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or "error" in message:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP transport load test")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}/mcp"
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>10}")
+    for workers in args.workers:
+        server = start_server(args.port, workers)
+        try:
+            wait_until_ready(url)
+            # Warm every worker's caches before measuring
+            asyncio.run(run_load(url, len(WORKLOAD) * workers * 2, workers))
+            elapsed, latencies, errors = asyncio.run(run_load(url, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        print(f"{workers:<10}{args.requests / elapsed:>10.0f}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}"
+              f"{errors:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Ingest benchmark: extracted JSON directory vs streaming from the zip archive
+
+Usage:
+    python benchmarks/bench_ingest.py --data-dir data_small --copies 50
+"""
+
+import argparse
+import os
+import tempfile
+import zipfile
+
+from bench_utils import replicate_corpus, temp_session_factory, timed
+
+from src.data_processing.json_parser import IPLDataProcessor
+from src.data_processing.sources import open_match_source
+
+
+def build_archive(src_dir, archive_path):
+    """Zip every JSON file in src_dir the way Cricsheet ships ipl_json.zip"""
+    with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for filename in sorted(os.listdir(src_dir)):
+            if filename.endswith('.json'):
+                zf.write(os.path.join(src_dir, filename), arcname=filename)
+
+
+def decode_only(path, workers):
+    """Read and decode every match without touching the database"""
+    with open_match_source(path) as source:
+        return sum(1 for _, data in source.iter_matches(workers=workers) if data)
+
+
+def full_ingest(path, workers, db_path):
+    """Run process_all_matches against a fresh database"""
+    _, factory = temp_session_factory(db_path)
+    processor = IPLDataProcessor(session=factory())
+    return processor.process_all_matches(path, decode_workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark directory vs zip ingestion")
+    parser.add_argument("--data-dir", default="data_small",
+                        help="Directory of Cricsheet JSON files to build the corpus from")
+    parser.add_argument("--copies", type=int, default=50,
+                        help="Renamed copies of each match, to simulate a full archive")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Parallel decode workers for the threaded runs")
+    parser.add_argument("--skip-ingest", action="store_true",
+                        help="Only benchmark read+decode, not database inserts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        archive = os.path.join(tmp, "ipl_json.zip")
+        count = replicate_corpus(args.data_dir, corpus_dir, args.copies)
+        build_archive(corpus_dir, archive)
+        print(f"Corpus: {count} matches, archive {os.path.getsize(archive) / 1e6:.1f} MB")
+
+        runs = [
+            ("directory", corpus_dir, 1),
+            ("zip", archive, 1),
+            (f"zip x{args.workers} workers", archive, args.workers),
+        ]
+
+        results = {}
+        for label, path, workers in runs:
+            with timed(results, f"decode  {label}"):
+                decode_only(path, workers)
+
+        if not args.skip_ingest:
+            for label, path, workers in runs:
+                db_path = os.path.join(tmp, "bench.db")
+                with timed(results, f"ingest  {label}"):
+                    full_ingest(path, workers, db_path)
+
+        print()
+        print(f"{'phase':<32}{'seconds':>10}{'matches/s':>12}")
+        for label, seconds in results.items():
+            print(f"{label:<32}{seconds:>10.2f}{count / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Count the SQL statements issued while ingesting matches
+
+Every cursor execution (a single statement or one executemany batch) is one
+round trip to SQLite, so this shows how many lookups/inserts each match costs.
+
+Usage:
+    python benchmarks/bench_ingest_queries.py --data-dir data_small
+"""
+
+import argparse
+import os
+import tempfile
+from collections import Counter
+
+from sqlalchemy import event
+
+from bench_utils import temp_session_factory, timed
+
+from src.data_processing.json_parser import IPLDataProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count SQL statements per ingested match")
+    parser.add_argument("--data-dir", default="data_small",
+                        help="Directory or zip archive of Cricsheet JSON files")
+    parser.add_argument("--reingest", action="store_true",
+                        help="Also count statements for a second pass over already-loaded data")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, factory = temp_session_factory(os.path.join(tmp, "bench.db"))
+        counts = Counter()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            verb = statement.lstrip().split(None, 1)[0].upper()
+            table = ""
+            words = statement.replace("\n", " ").split()
+            for keyword in ("FROM", "INTO", "UPDATE"):
+                if keyword in words:
+                    table = words[words.index(keyword) + 1]
+                    break
+            counts[(verb, table)] += 1
+
+        passes = [("initial load", 1)] + ([("re-ingest", 2)] if args.reingest else [])
+        for label, _ in passes:
+            counts.clear()
+            results = {}
+            with timed(results, label):
+                matches = IPLDataProcessor(session=factory()).process_all_matches(args.data_dir)
+
+            total = sum(counts.values())
+            print(f"\n{label}: {total} statements for {matches} new matches "
+                  f"in {results[label]:.2f}s")
+            for (verb, table), n in counts.most_common():
+                print(f"  {verb:<8}{table:<24}{n:>8}")
+
+
+if __name__ == "__main__":
+    main()
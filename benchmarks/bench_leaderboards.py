@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Leaderboard reads: sorting player_stats/team_stats vs the stored top-k boards
+
+The "sorted" statements are what player_most_runs, player_most_wickets and
+team_most_wins ran before the leaderboards table existed: a sort of the whole
+stats table per call. The "board" reads are the statement QueryEngine uses
+now, an index range scan of rows already kept in rank order. Scoped boards
+(season, venue, team) had no previous equivalent; one season board is timed
+for reference.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_leaderboards.py --repeats 2000
+"""
+
+import argparse
+import time
+
+from bench_utils import percentile
+
+from sqlalchemy import text
+
+from src.database.database import engine
+from src.mcp_server.statements import STATEMENTS
+
+SORTED = {
+    'runs': text("""
+        SELECT player_name, total_runs, matches_batted, highest_score, batting_average, strike_rate
+        FROM player_stats WHERE total_runs > 0 ORDER BY total_runs DESC LIMIT 20
+    """),
+    'wickets': text("""
+        SELECT player_name, wickets_taken, matches_bowled, bowling_average, economy_rate, overs_bowled
+        FROM player_stats WHERE wickets_taken > 0 ORDER BY wickets_taken DESC LIMIT 20
+    """),
+    'wins': text("""
+        SELECT team_name, matches_won, matches_played, win_percentage
+        FROM team_stats ORDER BY matches_won DESC LIMIT 10
+    """),
+}
+
+
+def time_statement(conn, statement, params, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(statement, params).fetchall()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sorted stats tables vs stored leaderboards")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        players = conn.execute(text("SELECT COUNT(*) FROM player_stats")).scalar()
+        season = conn.execute(text(
+            "SELECT scope FROM leaderboards WHERE scope_type = 'season' ORDER BY scope DESC LIMIT 1"
+        )).scalar()
+        print(f"player_stats rows: {players}\n")
+        print(f"{'board':<24}{'sorted us':>12}{'board us':>12}")
+        for metric, statement in SORTED.items():
+            sorted_p50 = time_statement(conn, statement, None, args.repeats)
+            board_p50 = time_statement(conn, STATEMENTS['leaderboard'],
+                                       {'metric': metric, 'scope_type': 'all', 'scopes': ['']}, args.repeats)
+            print(f"{metric + ' (all time)':<24}{sorted_p50 * 1e6:>12.1f}{board_p50 * 1e6:>12.1f}")
+        if season:
+            board_p50 = time_statement(conn, STATEMENTS['leaderboard'],
+                                       {'metric': 'runs', 'scope_type': 'season', 'scopes': [season]}, args.repeats)
+            print(f"{'runs (' + season + ')':<24}{'-':>12}{board_p50 * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Query latency: file-backed SQLite vs the in-memory replica used by --in-memory
+
+Runs the test_queries.py workload through QueryEngine on the database file,
+then copies it into memory with use_memory_replica and runs it again. "first
+pass" is one round on fresh connections (cold SQLite page cache); p50/p99 are
+over the warm rounds that follow. Run it on a freshly booted machine, or after
+dropping the OS cache, to include disk reads in the file numbers.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_memory_replica.py --rounds 100
+"""
+
+import argparse
+import resource
+import time
+
+from bench_utils import percentile
+from bench_query_overhead import TEST_QUERIES
+
+from src.database import database
+from src.mcp_server.query_engine import QueryEngine
+
+
+def run_workload(rounds):
+    qe = QueryEngine()
+    start = time.perf_counter()
+    for query in TEST_QUERIES:
+        qe.process_query(query)
+    first_pass = time.perf_counter() - start
+
+    samples = []
+    for _ in range(rounds):
+        for query in TEST_QUERIES:
+            start = time.perf_counter()
+            qe.process_query(query)
+            samples.append(time.perf_counter() - start)
+    return first_pass, samples
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="File vs in-memory replica query latency")
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    results = [("file", *run_workload(args.rounds))]
+
+    rss_before = max_rss_mb()
+    replica = database.use_memory_replica()
+    print(f"Replica: {replica['bytes'] / 2**20:.1f} MiB copied in {replica['copy_seconds'] * 1000:.0f} ms, "
+          f"peak RSS {rss_before:.0f} -> {max_rss_mb():.0f} MiB\n")
+    results.append(("memory replica", *run_workload(args.rounds)))
+
+    print(f"{'database':<16}{'first pass ms':>15}{'p50 us':>10}{'p99 us':>10}")
+    for label, first_pass, samples in results:
+        print(f"{label:<16}{first_pass * 1000:>15.1f}"
+              f"{percentile(samples, 50) * 1e6:>10.0f}{percentile(samples, 99) * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
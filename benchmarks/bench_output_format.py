@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Response size and serialization time: text formatter vs compact JSON
+
+Runs each WORKLOAD query's handler once, then times only the formatting step
+(format_result) for format="text" and format="json", so SQL time is left
+out. The JSON encoder is orjson when installed (uv sync --extra fast-json),
+otherwise the stdlib json module; the header says which one ran.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_output_format.py --repeats 2000
+"""
+
+import argparse
+import re
+import time
+
+from bench_async_load import WORKLOAD
+from bench_utils import percentile
+
+from src.mcp_server import results
+from src.mcp_server.query_engine import QueryEngine
+
+
+def handler_result(qe, query):
+    """(result, description) of the first pattern matching the query, as _dispatch picks it"""
+    query_lower = query.lower().strip()
+    for pattern_info in qe.query_patterns:
+        if 'entity' in pattern_info:
+            continue
+        match = re.search(pattern_info['pattern'], query_lower)
+        if match:
+            params = [g.strip() for g in match.groups() if g and g.strip()]
+            return pattern_info['handler'](*params), pattern_info['description']
+    raise ValueError(f"No handler for {query!r}")
+
+
+def time_format(qe, result, description, output_format, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        qe.format_result(result, description, output_format)
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text vs JSON tool output size and formatting time")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    qe = QueryEngine()
+    encoder = "orjson" if results.orjson is not None else "json (stdlib)"
+    print(f"JSON encoder: {encoder}\n")
+    print(f"{'query':<44}{'text B':>8}{'json B':>8}{'text us':>9}{'json us':>9}")
+
+    totals = {"text": [0, 0.0], "json": [0, 0.0]}
+    for query in WORKLOAD:
+        result, description = handler_result(qe, query)
+        row = []
+        for output_format in ("text", "json"):
+            size = len(qe.format_result(result, description, output_format).encode())
+            p50 = time_format(qe, result, description, output_format, args.repeats)
+            totals[output_format][0] += size
+            totals[output_format][1] += p50
+            row.append((size, p50))
+        (text_size, text_p50), (json_size, json_p50) = row
+        print(f"{query[:42]:<44}{text_size:>8}{json_size:>8}{text_p50 * 1e6:>9.1f}{json_p50 * 1e6:>9.1f}")
+
+    print(f"{'total':<44}{totals['text'][0]:>8}{totals['json'][0]:>8}"
+          f"{totals['text'][1] * 1e6:>9.1f}{totals['json'][1] * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+First-query latency after a restart, with and without prewarming
+
+Writes a query log in which a set of popular questions were each asked
+before, then starts `main.py --server` over stdio twice: with --prewarm 0
+and with --prewarm N. Each time it waits --settle seconds after initialize
+(the time clients take to show up; the prewarm runs in the background
+meanwhile) and times the first call of every logged question, then a second
+round for the warm latency. initialize is timed too, as prewarming must not
+delay it. Sharing the OS page cache between runs, the difference is what the
+server itself warms: SQLite's per-connection page caches, compiled plans
+and the analytics mirrors.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_prewarm.py --prewarm 20 --settle 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from bench_utils import ROOT, percentile
+
+from src.mcp_server.query_log import QueryLog
+from src.mcp_server.server import STATS_URI
+
+# (query, times asked before the restart)
+POPULAR = [
+    ("Who scored the most runs across all matches?", 40),
+    ("Who took the most wickets?", 30),
+    ("Which team won the most matches?", 25),
+    ("Show me Virat Kohli batting stats", 20),
+    ("How does Kohli fare against Bumrah?", 15),
+    ("What was the highest total score?", 12),
+    ("Show runs scored by season", 10),
+    ("What is the run rate in overs 16-20?", 8),
+    ("Which venue has the highest scoring matches?", 6),
+    ("What are the highest partnerships?", 5),
+]
+
+
+async def call_all(session, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await session.call_tool("query_ipl_data", {"query": query})
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_server(log_path, prewarm, settle, extra_args):
+    queries = [query for query, _ in POPULAR]
+    server_args = [str(ROOT / "main.py"), "--server", "--query-log", log_path,
+                   "--prewarm", str(prewarm)] + extra_args
+    params = StdioServerParameters(command=sys.executable, args=server_args, cwd=os.getcwd())
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                start = time.perf_counter()
+                await session.initialize()
+                initialize = time.perf_counter() - start
+                await asyncio.sleep(settle)
+                first = await call_all(session, queries)
+                warm = await call_all(session, queries)
+                stats = (await session.read_resource(STATS_URI)).contents[0].text
+    return initialize, first, warm, stats
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "query_log.json")
+        print(f"{len(POPULAR)} logged questions, first calls {args.settle:.0f} s after initialize\n")
+        print(f"{'server':<14}{'init ms':>9}{'first p50':>11}{'first max':>11}{'first sum':>11}"
+              f"{'warm p50':>10}{'warm sum':>10}")
+        for prewarm in (0, args.prewarm):
+            # A fresh copy of the log each time, as the server adds its own calls to it
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            log = QueryLog(log_path)
+            for query, times in POPULAR:
+                for _ in range(times):
+                    log.record(query, "text")
+            log.save()
+
+            initialize, first, warm, stats = await run_server(log_path, prewarm, args.settle, args.server_args)
+            print(f"{f'--prewarm {prewarm}':<14}{initialize * 1000:>9.0f}"
+                  f"{percentile(first, 50) * 1000:>11.2f}{max(first) * 1000:>11.2f}{sum(first) * 1000:>11.1f}"
+                  f"{percentile(warm, 50) * 1000:>10.2f}{sum(warm) * 1000:>10.1f}")
+            print(f"  server stats: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First-query latency with and without prewarming")
+    parser.add_argument("--prewarm", type=int, default=20)
+    parser.add_argument("--settle", type=float, default=3.0,
+                        help="Seconds between initialize and the first call")
+    parser.add_argument("--server-args", nargs=argparse.REMAINDER, default=[],
+                        help="Extra main.py arguments, e.g. --server-args --analytics-backend duckdb")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Filtered leaderboard questions: cost of the query compiler and its plan cache
+
+Generates questions from a few templates ("most {metric} in {season} at
+{venue}", ...) over every season, venue and team in the database. Each
+template is one query shape, so after its first question every other
+combination of values reuses the cached statement. Reports, per template:
+compile time for the shape's first question (statement built) and for the
+rest (cache hit), median execution time and the plan's source ('board' for
+a stored leaderboard, 'deliveries' for a ball-level aggregate). Ends with
+the cache's hit rate over every question.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_query_compiler.py --repeats 20
+"""
+
+import argparse
+import itertools
+import time
+
+from bench_utils import percentile
+
+from sqlalchemy import text
+
+from src.database.database import get_db_session
+from src.mcp_server.entity_extractor import EntityExtractor
+from src.mcp_server.query_compiler import QueryCompiler
+
+TEMPLATES = [
+    "most runs in {season}",
+    "most wickets at {venue}",
+    "most runs in {season} at {venue}",
+    "most sixes for {team} in {season}",
+    "most wickets against {team} in the death overs",
+    "most fours in the powerplay at {venue} batting first",
+    "how many sixes were hit in {season} at {venue}",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query compiler parse/compile cost and plan cache reuse")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=25,
+                        help="Value combinations per template")
+    args = parser.parse_args()
+
+    session = get_db_session()
+    conn = session.connection()
+    extractor = EntityExtractor.from_session(session)
+    values = {
+        'season': [r[0] for r in conn.execute(text("SELECT DISTINCT season FROM matches ORDER BY season"))],
+        'venue': [r[0] for r in conn.execute(text("SELECT DISTINCT venue FROM matches ORDER BY venue"))],
+        'team': [r[0] for r in conn.execute(text("SELECT name FROM teams ORDER BY name"))],
+    }
+    compiler = QueryCompiler()
+
+    print(f"{'template':<54}{'source':>11}{'cold us':>9}{'warm us':>9}{'exec ms':>9}")
+    for template in TEMPLATES:
+        fields = [f for f in values if '{' + f + '}' in template]
+        combos = itertools.islice(itertools.product(*(values[f] for f in fields)), args.questions)
+        specs = []
+        for combo in combos:
+            query_lower = template.format(**dict(zip(fields, combo))).lower()
+            spec = compiler.parse(query_lower, extractor.extract(query_lower))
+            if spec is not None:
+                specs.append(spec)
+        if not specs:
+            print(f"{template:<54}  no parsable questions")
+            continue
+
+        # Cold: the first question of the shape builds the statement
+        start = time.perf_counter()
+        compiler.compile(specs[0])
+        cold = time.perf_counter() - start
+        warm_samples = []
+        for spec in specs[1:] or specs:
+            start = time.perf_counter()
+            compiler.compile(spec)
+            warm_samples.append(time.perf_counter() - start)
+
+        exec_samples = []
+        for _ in range(args.repeats):
+            for spec in specs:
+                start = time.perf_counter()
+                statement, params = compiler.compile(spec)
+                conn.execute(statement, params).fetchall()
+                exec_samples.append(time.perf_counter() - start)
+
+        print(f"{template:<54}{compiler._source(specs[0]):>11}{cold * 1e6:>9.1f}"
+              f"{percentile(warm_samples, 50) * 1e6:>9.1f}{percentile(exec_samples, 50) * 1000:>9.2f}")
+
+    lookups = compiler.hits + compiler.misses
+    print(f"\nplan cache: {compiler.hits}/{lookups} hits, {len(compiler.plans)} statements cached")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Per-call cost of QueryEngine.process_query on the test_queries.py workload
+
+Reports the mean time per query and how much of it is spent inside
+cursor.execute (SQLite preparing and stepping the statement), so the rest is
+Python-side overhead: pattern matching, SQLAlchemy statement construction and
+compilation, and result formatting.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_query_overhead.py --rounds 200
+"""
+
+import argparse
+import time
+
+from bench_utils import percentile
+
+from sqlalchemy import event
+
+from src.database.database import engine
+from src.mcp_server.query_engine import QueryEngine
+
+# The queries demonstrated by test_queries.py
+TEST_QUERIES = [
+    "Show me all matches in the dataset",
+    "Which team won the most matches?",
+    "Who scored the most runs across all matches?",
+    "What was the highest total score?",
+    "Show matches played in Mumbai",
+    "Who took the most wickets?",
+    "Show me Virat Kohli batting stats",
+    "What's the average first innings score?",
+    "Show me all centuries scored",
+    "Which venue has the highest scoring matches?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QueryEngine per-call overhead")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    in_cursor = [0.0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["cursor_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        in_cursor[0] += time.perf_counter() - conn.info.pop("cursor_start")
+
+    qe = QueryEngine()
+    for query in TEST_QUERIES:
+        qe.process_query(query)
+
+    per_query = {query: [] for query in TEST_QUERIES}
+    in_cursor[0] = 0.0
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for query in TEST_QUERIES:
+            call_start = time.perf_counter()
+            qe.process_query(query)
+            per_query[query].append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - started
+
+    calls = args.rounds * len(TEST_QUERIES)
+    print(f"{calls} calls over {len(TEST_QUERIES)} queries\n")
+    print(f"{'query':<48}{'p50 us':>10}")
+    for query, samples in per_query.items():
+        print(f"{query[:46]:<48}{percentile(samples, 50) * 1e6:>10.0f}")
+    print(f"\nmean per call:        {elapsed / calls * 1e6:8.0f} us")
+    print(f"  in cursor.execute:  {in_cursor[0] / calls * 1e6:8.0f} us")
+    print(f"  Python overhead:    {(elapsed - in_cursor[0]) / calls * 1e6:8.0f} us")
+
+
+if __name__ == "__main__":
+    main()
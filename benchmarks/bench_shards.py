@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Per-season shards: build times and query latency against one database
+
+Writes a corpus with --seasons seasons (every match of --data-dir, --copies
+times per season, relabelled), ingests it into a single database and into
+a sharded store, and reports:
+
+  * build times: the single database, every shard (one process, then
+    --workers processes) and rebuilding just the newest season
+  * p50 latency of season-filtered and whole-dataset statements on the
+    single database, on the store with every season attached ("federated")
+    and, for season-filtered ones, with just that season's shard ("pruned"),
+    and whether every answer matches the single database's
+
+With more seasons than SQLite can attach (10), the store also builds
+archive.db, which federated connections attach in place of the oldest shards.
+
+Usage:
+    python benchmarks/bench_shards.py --data-dir data_small --seasons 12 --copies 5
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bench_utils import percentile, temp_session_factory, timed
+
+from sqlalchemy import create_engine
+
+from src.data_processing.json_parser import IPLDataProcessor
+from src.data_processing.shard_builder import build_store
+from src.database.shards import ShardStore
+from src.mcp_server.query_compiler import QueryCompiler
+from src.mcp_server.statements import STATEMENTS
+
+FIRST_SEASON = 2001
+
+# Compiled questions, asked about the newest season
+SEASON_QUESTIONS = [
+    "most runs in {season}",
+    "most wickets in {season} in the death overs",
+    "total sixes in {season}",
+]
+WHOLE_DATASET_STATEMENTS = ['season_scoring', 'venue_highest_scores', 'average_first_innings_score']
+
+
+def season_corpus(src_dir, dest_dir, seasons, copies):
+    """Write every match in src_dir `copies` times per season, relabelled with that season"""
+    os.makedirs(dest_dir, exist_ok=True)
+    sources = sorted(f for f in os.listdir(src_dir) if f.endswith('.json'))
+    for filename in sources:
+        with open(os.path.join(src_dir, filename)) as f:
+            match = json.load(f)
+        for offset in range(seasons):
+            year = str(FIRST_SEASON + offset)
+            match['info']['season'] = year
+            match['info']['dates'] = [year + date[4:] for date in match['info']['dates']]
+            for copy in range(copies):
+                target = os.path.join(dest_dir, f"{filename[:-len('.json')]}{offset:02d}{copy:03d}.json")
+                with open(target, 'w') as f:
+                    json.dump(match, f)
+    return len(sources) * seasons * copies
+
+
+def store_engine(store, seasons=None):
+    attachments = store.attachments(seasons)
+    return create_engine("sqlite://", creator=lambda: store.connect(attachments)), attachments
+
+
+def time_statement(conn, statement, params, repeats):
+    rows = conn.execute(statement, params).fetchall()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(statement, params).fetchall()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50), sorted(rows, key=repr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded store build times and query latency")
+    parser.add_argument("--data-dir", default="data_small")
+    parser.add_argument("--seasons", type=int, default=12)
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for the parallel shard build")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        store_dir = os.path.join(tmp, "shards")
+        count = season_corpus(args.data_dir, corpus_dir, args.seasons, args.copies)
+        newest = str(FIRST_SEASON + args.seasons - 1)
+        print(f"Corpus: {count} matches in {args.seasons} seasons\n")
+
+        builds = {}
+        engine, factory = temp_session_factory(os.path.join(tmp, "single.db"))
+        with timed(builds, "single database"):
+            processor = IPLDataProcessor(session=factory())
+            processor.process_all_matches(corpus_dir)
+            processor.calculate_statistics()
+        with timed(builds, "every shard, 1 process"):
+            build_store(store_dir, corpus_dir)
+        with timed(builds, f"every shard, {args.workers} processes"):
+            build_store(store_dir, corpus_dir, rebuild=True, workers=args.workers)
+        with timed(builds, f"season {newest} only"):
+            build_store(store_dir, corpus_dir, seasons=[newest])
+
+        store = ShardStore(store_dir)
+        federated, federated_files = store_engine(store)
+        pruned, pruned_files = store_engine(store, [newest])
+        print(f"\n{'build':<28}{'seconds':>10}")
+        for label, seconds in builds.items():
+            print(f"{label:<28}{seconds:>10.2f}")
+        print(f"\nFederated connections attach {len(federated_files)} files"
+              f"{' (archive.db and the newest shards)' if store.archive_path in federated_files else ''}, "
+              f"pruned ones {len(pruned_files)}\n")
+
+        compiler = QueryCompiler()
+        statements = []
+        for question in SEASON_QUESTIONS:
+            question = question.format(season=newest)
+            spec = compiler.parse(question, [])
+            statements.append((question, *compiler.compile(spec), True))
+        statements.extend((name, STATEMENTS[name], {}, False) for name in WHOLE_DATASET_STATEMENTS)
+
+        print(f"{'statement':<44}{'single ms':>10}{'fed ms':>10}{'pruned ms':>10}{'same':>6}")
+        with engine.connect() as single_conn, federated.connect() as federated_conn, \
+                pruned.connect() as pruned_conn:
+            for label, statement, params, scoped in statements:
+                single_ms, expected = time_statement(single_conn, statement, params, args.repeats)
+                federated_ms, federated_rows = time_statement(federated_conn, statement, params, args.repeats)
+                same = federated_rows == expected
+                pruned_column = f"{'-':>10}"
+                if scoped:
+                    pruned_ms, pruned_rows = time_statement(pruned_conn, statement, params, args.repeats)
+                    same = same and pruned_rows == expected
+                    pruned_column = f"{pruned_ms * 1000:>10.2f}"
+                print(f"{label:<44}{single_ms * 1000:>10.2f}{federated_ms * 1000:>10.2f}"
+                      f"{pruned_column}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
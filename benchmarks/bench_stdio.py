@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the stdio server as an MCP client sees it
+
+Starts `main.py --server` as a subprocess and talks to it with the mcp
+client library over stdin/stdout, so every number includes JSON-RPC framing,
+pydantic validation on both sides, handle_call_tool dispatch, the query and
+formatting. Requests are drawn from a weighted mix of queries (seeded, so
+runs are comparable) and sent first one at a time, then pipelined: several
+requests in flight on the same pipe, as a client with parallel tool calls
+would send them. The server's RSS is sampled from /proc throughout (Linux),
+and its request coalescing counters are read at the end.
+
+Run from a directory containing a loaded ipl_cricket.db:
+    python benchmarks/bench_stdio.py --requests 500 --depth 1 8 32
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from bench_utils import ROOT, percentile
+
+from src.mcp_server.server import STATS_URI
+
+# (query, weight): leaderboards and player lookups dominate real sessions,
+# ball-level aggregates are rarer but the slowest
+WEIGHTED_MIX = [
+    ("Who scored the most runs across all matches?", 10),
+    ("Who took the most wickets?", 8),
+    ("Which team won the most matches?", 6),
+    ("Show me Virat Kohli batting stats", 8),
+    ("Show me Bumrah bowling stats", 6),
+    ("How does Kohli fare against Bumrah?", 5),
+    ("What was the highest total score?", 4),
+    ("Show matches played in Mumbai", 4),
+    ("What are the highest partnerships?", 3),
+    ("What was RCB's score after 10 overs?", 3),
+    ("What's the average first innings score?", 2),
+    ("Which venue has the highest scoring matches?", 2),
+    ("What is the run rate in overs 16-20?", 1),
+    ("Show runs scored by season", 1),
+]
+
+
+def child_pid(command_fragment):
+    """PID of this process's child whose command line contains command_fragment"""
+    for task in os.listdir(f"/proc/{os.getpid()}/task"):
+        with open(f"/proc/{os.getpid()}/task/{task}/children") as f:
+            for pid in f.read().split():
+                with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+                    if command_fragment.encode() in cmdline.read():
+                        return int(pid)
+    return None
+
+
+def rss_mib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def sample_rss(pid, samples, started, interval):
+    while True:
+        samples.append((time.perf_counter() - started, rss_mib(pid)))
+        await asyncio.sleep(interval)
+
+
+async def run_load(session, queries, depth, output_format):
+    """Send queries with `depth` requests in flight; (elapsed, latencies, error texts)"""
+    latencies = []
+    errors = []
+    pending = iter(queries)
+
+    async def client():
+        for query in pending:
+            start = time.perf_counter()
+            result = await session.call_tool("query_ipl_data", {"query": query, "format": output_format})
+            latencies.append(time.perf_counter() - start)
+            text = result.content[0].text if result.content else ""
+            if result.isError or text.startswith("Error executing query") or text.startswith('{"error"'):
+                errors.append(f"{query}: {text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(depth)))
+    return time.perf_counter() - started, latencies, errors
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    queries, weights = zip(*WEIGHTED_MIX)
+    server_args = [str(ROOT / "main.py"), "--server"] + args.server_args
+    params = StdioServerParameters(command=sys.executable, args=server_args, cwd=os.getcwd())
+
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                started = time.perf_counter()
+                await session.initialize()
+                print(f"initialize: {(time.perf_counter() - started) * 1000:.0f} ms "
+                      f"(server startup included)")
+
+                pid = child_pid("main.py")
+                samples = []
+                sampler = None
+                if pid is not None:
+                    sampler = asyncio.create_task(sample_rss(pid, samples, time.perf_counter(), args.rss_interval))
+
+                # Warm every handler once before measuring
+                await run_load(session, queries, 1, args.format)
+
+                print(f"{args.requests} requests per run, format={args.format}\n")
+                print(f"{'depth':<8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'RSS MiB':>9}")
+                for depth in args.depth:
+                    mix = rng.choices(queries, weights=weights, k=args.requests)
+                    elapsed, latencies, errors = await run_load(session, mix, depth, args.format)
+                    rss = f"{rss_mib(pid):>9.1f}" if pid is not None else f"{'n/a':>9}"
+                    print(f"{depth:<8}{args.requests / elapsed:>9.0f}"
+                          f"{percentile(latencies, 50) * 1000:>9.2f}{percentile(latencies, 95) * 1000:>9.2f}"
+                          f"{percentile(latencies, 99) * 1000:>9.2f}{len(errors):>8}{rss}")
+                    if errors:
+                        print(f"  first error: {errors[0]}")
+
+                # Pipelined runs put identical queries in flight together
+                stats = await session.read_resource(STATS_URI)
+                print(f"\nServer stats: {stats.contents[0].text}")
+
+                if sampler is not None:
+                    sampler.cancel()
+                    step = max(1, len(samples) // 10)
+                    timeline = samples[::step]
+                    if timeline[-1] is not samples[-1]:
+                        timeline.append(samples[-1])
+                    print("\nServer RSS over time:")
+                    for seconds, mib in timeline:
+                        print(f"  {seconds:7.1f} s  {mib:7.1f} MiB")
+                    print(f"  peak {max(mib for _, mib in samples):.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end stdio MCP load test")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 8, 32],
+                        help="Requests in flight at once; 1 is strictly sequential")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rss-interval", type=float, default=0.25,
+                        help="Seconds between server RSS samples")
+    parser.add_argument("--server-args", nargs=argparse.REMAINDER, default=[],
+                        help="Extra main.py arguments, e.g. --server-args --in-memory")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+team_stats rebuild: the old per-team ORM loop vs the set-based INSERT ... SELECT
+
+Loads --data-dir into a temporary database, then copies its matches and
+innings rows (raw JSON included) until there are --matches matches, so the
+loop pays for loading full Match rows as it did. Only the team half of
+calculate_statistics is timed; the player half is unchanged.
+
+Usage:
+    python benchmarks/bench_team_stats.py --data-dir data_small --matches 10000
+"""
+
+import argparse
+import os
+import tempfile
+
+from sqlalchemy import text
+
+from bench_utils import temp_session_factory, timed
+
+from src.data_processing.json_parser import IPLDataProcessor
+from src.database.models import Innings, Match, Team, TeamStats
+
+
+def per_team_loop(session):
+    """The team half of calculate_statistics before it became one statement"""
+    session.query(TeamStats).delete()
+    for team in session.query(Team).all():
+        matches = session.query(Match).filter(
+            (Match.team1 == team.name) | (Match.team2 == team.name)
+        ).all()
+
+        wins = session.query(Match).filter(Match.winner == team.name).count()
+        total_matches = len(matches)
+
+        session.add(TeamStats(
+            team_name=team.name,
+            matches_played=total_matches,
+            matches_won=wins,
+            matches_lost=total_matches - wins,
+            win_percentage=round((wins * 100) / max(1, total_matches), 2) if total_matches > 0 else 0
+        ))
+    session.flush()
+
+
+def inflate(session, target):
+    """Copy the loaded matches (and their innings) under new IDs until there are `target`"""
+    base_max, base_count = session.execute(text("SELECT MAX(id), COUNT(*) FROM matches")).one()
+    match_columns = [c.name for c in Match.__table__.columns if c.name not in ('id', 'match_id')]
+    innings_columns = [c.name for c in Innings.__table__.columns if c.name not in ('id', 'match_id')]
+    copy_matches = text(f"""
+        INSERT INTO matches (id, match_id, {', '.join(match_columns)})
+        SELECT id + :offset, match_id || :suffix, {', '.join(match_columns)}
+        FROM matches WHERE id <= :base_max LIMIT :limit
+    """)
+    copy_innings = text(f"""
+        INSERT INTO innings (match_id, {', '.join(innings_columns)})
+        SELECT match_id + :offset, {', '.join(innings_columns)}
+        FROM innings WHERE match_id <= :base_max AND match_id + :offset IN (SELECT id FROM matches)
+    """)
+    copy = 1
+    while base_count * copy < target:
+        params = {'offset': base_max * copy, 'suffix': f'-{copy}', 'base_max': base_max,
+                  'limit': target - base_count * copy}
+        session.execute(copy_matches, params)
+        session.execute(copy_innings, params)
+        copy += 1
+    session.commit()
+    return session.execute(text("SELECT COUNT(*) FROM matches")).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-team loop vs set-based team_stats rebuild")
+    parser.add_argument("--data-dir", default="data_small",
+                        help="Directory or zip archive of Cricsheet JSON files to start from")
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, factory = temp_session_factory(os.path.join(tmp, "bench.db"))
+        IPLDataProcessor(session=factory()).process_all_matches(args.data_dir)
+        session = factory()
+        processor = IPLDataProcessor(session=session)
+        matches = inflate(session, args.matches)
+        print(f"{matches} matches\n")
+
+        best = {}
+        for label, call in [("per-team loop", lambda: per_team_loop(session)),
+                            ("set-based", processor.calculate_team_stats)]:
+            for _ in range(args.repeats):
+                results = {}
+                with timed(results, label):
+                    call()
+                session.rollback()
+                best[label] = min(best.get(label, results[label]), results[label])
+            print(f"{label:<16}{best[label] * 1000:>10.1f} ms")
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Shared helpers for the benchmark scripts in this directory
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Make the repository root importable the same way main.py does
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base
+
+
+def temp_session_factory(db_path):
+    """Create a fresh SQLite database at db_path and return (engine, sessionmaker)"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def replicate_corpus(src_dir, dest_dir, copies):
+    """Write `copies` renamed copies of every match in src_dir to dest_dir"""
+    os.makedirs(dest_dir, exist_ok=True)
+    sources = sorted(f for f in os.listdir(src_dir) if f.endswith('.json'))
+    for filename in sources:
+        with open(os.path.join(src_dir, filename), 'rb') as f:
+            payload = f.read()
+        match_id = filename[:-len('.json')]
+        for copy in range(copies):
+            target = os.path.join(dest_dir, f"{match_id}{copy:04d}.json")
+            with open(target, 'wb') as f:
+                f.write(payload)
+    return len(sources) * copies
+
+
+@contextmanager
+def timed(results, label):
+    """Record the wall-clock seconds spent inside the block under results[label]"""
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
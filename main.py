@@ -8,23 +8,29 @@ an MCP server interface for querying the data using natural language.
 
 import asyncio
 import argparse
+import os
 import sys
 from pathlib import Path
 
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.database.database import create_tables, reset_database, check_database
+from src.database.database import create_tables, reset_database, check_database, use_sharded_database
 from src.data_processing.json_parser import IPLDataProcessor
 from src.mcp_server.server import IPLMCPServer
+from src.diagnostics.profiling import Profiler
+from src.database.columnar import export_columnar
 
 def setup_database():
     """Setup database tables"""
     print("Setting up database...")
     create_tables()
 
-def load_data(data_dir="data", reset=False):
-    """Load IPL data from JSON files into database"""
+def load_data(data_dir="data", reset=False, decode_workers=1, commit_every=100, resume=True,
+              profiler=None):
+    """Load IPL data from a JSON directory or Cricsheet zip archive into database"""
+    profiler = profiler or Profiler()
+    
     if reset:
         print("Resetting database...")
         reset_database()
@@ -36,11 +42,18 @@ def load_data(data_dir="data", reset=False):
     processor = IPLDataProcessor()
     
     try:
-        count = processor.process_all_matches(data_dir)
+        with profiler.section("ingest"):
+            count = processor.process_all_matches(
+                data_dir,
+                decode_workers=decode_workers,
+                commit_every=commit_every,
+                resume=resume
+            )
         print(f"Successfully loaded {count} matches!")
         
         print("Calculating statistics...")
-        processor.calculate_statistics()
+        with profiler.section("statistics"):
+            processor.calculate_statistics()
         print("Statistics calculation complete!")
         
     except Exception as e:
@@ -49,19 +62,129 @@ def load_data(data_dir="data", reset=False):
     
     return True
 
-async def run_server():
+def load_shards(shard_dir, data_dir="data", seasons=None, rebuild=False, workers=1, decode_workers=1,
+                profiler=None):
+    """Build or update per-season shards of the data in shard_dir"""
+    from src.data_processing.shard_builder import build_store
+    
+    profiler = profiler or Profiler()
+    print(f"Loading IPL data into shards in {shard_dir}...")
+    try:
+        with profiler.section("shards"):
+            built = build_store(shard_dir, data_dir, seasons, rebuild, workers, decode_workers)
+    except Exception as e:
+        print(f"Error building shards: {e}")
+        return False
+    
+    if built:
+        print(f"Successfully built {len(built)} shard(s) with {sum(built.values())} matches!")
+    return True
+
+def database_ready(shard_dir=None):
+    """Check the database, or the sharded store when serving one"""
+    if shard_dir:
+        from src.database.shards import ShardStore
+        return ShardStore(shard_dir).exists()
+    return check_database()
+
+def export_data(output_dir, profiler=None):
+    """Export matches, innings and deliveries to season-partitioned Arrow files"""
+    profiler = profiler or Profiler()
+    print(f"Exporting columnar data to {output_dir}...")
+    try:
+        with profiler.section("export"):
+            row_counts = export_columnar(output_dir)
+    except Exception as e:
+        print(f"Error exporting data: {e}")
+        return False
+    
+    for table_name, rows in row_counts.items():
+        print(f"  {table_name}: {rows} rows")
+    return True
+
+def replay_queries(path, rounds=1, profiler=None, columnar_dir=None, analytics_backend="sqlite"):
+    """Run each query in a file (one per line) through the query engine and time it"""
+    import time
+    from src.mcp_server.query_engine import QueryEngine
+    
+    profiler = profiler or Profiler()
+    with open(path) as f:
+        queries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not queries:
+        print(f"No queries found in {path}")
+        return False
+    
+    print(f"Replaying {len(queries)} queries x {rounds} round(s)...")
+    engine = QueryEngine(columnar_dir, analytics_backend)
+    timings = {query: 0.0 for query in queries}
+    with profiler.section("queries"):
+        for _ in range(rounds):
+            for query in queries:
+                start = time.perf_counter()
+                engine.process_query(query)
+                timings[query] += time.perf_counter() - start
+    
+    print("\nSlowest queries (mean per call):")
+    for query, total in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {total / rounds * 1000:8.2f} ms  {query}")
+    return True
+
+async def run_server(columnar_dir=None, in_memory=False, analytics_backend="sqlite", query_log=None, prewarm=20):
     """Run the MCP server"""
-    print("Starting IPL MCP Server...")
-    print("The server is ready to accept connections from Claude Desktop.")
-    print("Press Ctrl+C to stop the server.")
+    if in_memory:
+        load_memory_replica()
+    
+    # stderr: in stdio mode stdout carries the protocol
+    print("Starting IPL MCP Server...", file=sys.stderr)
+    print("The server is ready to accept connections from Claude Desktop.", file=sys.stderr)
+    print("Press Ctrl+C to stop the server.", file=sys.stderr)
     
-    server = IPLMCPServer()
+    server = IPLMCPServer(columnar_dir, analytics_backend, query_log, prewarm)
     try:
         await server.run()
     except KeyboardInterrupt:
-        print("\nServer stopped by user.")
+        print("\nServer stopped by user.", file=sys.stderr)
     except Exception as e:
-        print(f"Server error: {e}")
+        print(f"Server error: {e}", file=sys.stderr)
+
+def load_memory_replica():
+    """Serve from an in-memory copy of the database"""
+    from src.database.database import use_memory_replica
+    
+    replica = use_memory_replica()
+    # stderr: in stdio mode stdout carries the protocol
+    print(f"Loaded in-memory replica: {replica['bytes'] / 2**20:.1f} MiB "
+          f"in {replica['copy_seconds'] * 1000:.0f} ms", file=sys.stderr)
+
+def run_http_server(host="127.0.0.1", port=8000, workers=1, columnar_dir=None, in_memory=False,
+                    analytics_backend="sqlite", shard_dir=None, query_log=None, prewarm=20):
+    """Run the MCP server over streamable HTTP with one or more worker processes"""
+    import uvicorn
+    
+    if columnar_dir:
+        os.environ["IPL_COLUMNAR_DIR"] = columnar_dir
+    if shard_dir:
+        os.environ["IPL_SHARD_DIR"] = shard_dir
+    if in_memory:
+        os.environ["IPL_IN_MEMORY"] = "1"
+    os.environ["IPL_ANALYTICS_BACKEND"] = analytics_backend
+    if query_log:
+        os.environ["IPL_QUERY_LOG"] = query_log
+    os.environ["IPL_PREWARM"] = str(prewarm)
+    
+    print(f"Starting IPL MCP Server on http://{host}:{port}/mcp with {workers} worker(s)...")
+    print("Press Ctrl+C to stop the server.")
+    
+    # Workers are separate processes, so the app is given as an import string
+    # and each worker builds its own server over a read-only database.
+    uvicorn.run(
+        "src.mcp_server.http_app:create_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        log_level="warning"
+    )
 
 def main():
     """Main application entry point"""
@@ -71,32 +194,126 @@ def main():
     parser.add_argument("--reset", action="store_true",
                        help="Reset database before loading data")
     parser.add_argument("--data-dir", default="data",
-                       help="Directory containing IPL JSON data files")
+                       help="Directory or Cricsheet zip archive (e.g. ipl_json.zip) containing IPL JSON data files")
+    parser.add_argument("--decode-workers", type=int, default=1,
+                       help="Number of match files to read and decode in parallel during setup")
+    parser.add_argument("--commit-every", type=int, default=100,
+                       help="Commit and checkpoint ingestion every N matches")
+    parser.add_argument("--no-resume", action="store_true",
+                       help="Ignore any saved ingest checkpoint and rescan from the start")
     parser.add_argument("--server", action="store_true",
                        help="Start MCP server (default if no other options)")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio",
+                       help="Server transport: stdio for a single desktop client, http to share one server")
+    parser.add_argument("--host", default="127.0.0.1",
+                       help="Address to bind in http transport mode")
+    parser.add_argument("--port", type=int, default=8000,
+                       help="Port to bind in http transport mode")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Worker processes in http transport mode")
+    parser.add_argument("--in-memory", action="store_true",
+                       help="Copy the database into memory at server startup and serve from the copy")
+    parser.add_argument("--query-log", metavar="FILE",
+                       help="File where the server keeps count of the queries it is asked, across restarts "
+                            "(by default the counts are kept in memory)")
+    parser.add_argument("--prewarm", type=int, default=20, metavar="N",
+                       help="Replay the N most asked queries in the background after startup and "
+                            "after new data is loaded (0 to disable)")
+    parser.add_argument("--export-columnar", metavar="DIR",
+                       help="Export matches, innings and deliveries as season-partitioned Arrow files (after setup, if given)")
+    parser.add_argument("--columnar-dir", metavar="DIR",
+                       help="Answer scan-heavy aggregates from a columnar export instead of SQLite (needs pyarrow)")
+    parser.add_argument("--analytics-backend", choices=["sqlite", "duckdb"], default="sqlite",
+                       help="Where scan-heavy aggregates run: SQLite, or an in-memory DuckDB mirror of its tables "
+                            "(needs duckdb and pyarrow)")
+    parser.add_argument("--shard-dir", metavar="DIR",
+                       help="Keep the data as one SQLite file per season in DIR: setup builds the shards, "
+                            "export, replay and the server read them")
+    parser.add_argument("--seasons",
+                       help="With --setup --shard-dir, rebuild just these seasons' shards (comma-separated, e.g. 2010,2011)")
+    parser.add_argument("--shard-workers", type=int, default=1,
+                       help="Number of season shards built in parallel processes during setup")
+    parser.add_argument("--replay", metavar="FILE",
+                       help="Replay queries from FILE (one per line) through the query engine instead of serving")
+    parser.add_argument("--replay-rounds", type=int, default=1,
+                       help="Number of times to run the replayed queries")
+    parser.add_argument("--profile", action="store_true",
+                       help="Profile setup (ingest, statistics) and query replay with cProfile")
+    parser.add_argument("--profile-memory", action="store_true",
+                       help="Also record tracemalloc snapshots while profiling (slower)")
+    parser.add_argument("--profile-dir", default="profiles",
+                       help="Directory for .pstats files and hotspot summaries")
+    parser.add_argument("--profile-top", type=int, default=20,
+                       help="Number of hotspots listed in profile summaries")
     
     args = parser.parse_args()
     
     # If no specific action is requested, default to server mode
-    if not args.setup and not args.reset:
+    if not args.setup and not args.reset and not args.replay and not args.export_columnar:
         args.server = True
     
+    profiler = Profiler(
+        enabled=args.profile or args.profile_memory,
+        output_dir=args.profile_dir,
+        memory=args.profile_memory,
+        top=args.profile_top
+    )
+    
+    if args.shard_dir and args.in_memory:
+        print("--in-memory copies ipl_cricket.db and can't be combined with --shard-dir")
+        sys.exit(1)
+    
     try:
-        if args.setup or args.reset:
+        if args.shard_dir and (args.setup or args.reset):
+            seasons = [season.strip() for season in args.seasons.split(",")] if args.seasons else None
+            if not load_shards(args.shard_dir, args.data_dir, seasons, args.reset, args.shard_workers,
+                               args.decode_workers, profiler):
+                sys.exit(1)
+        elif args.setup or args.reset:
             # Setup/reset database and load data
-            success = load_data(args.data_dir, args.reset)
+            success = load_data(
+                args.data_dir,
+                args.reset,
+                args.decode_workers,
+                args.commit_every,
+                not args.no_resume,
+                profiler
+            )
             if not success:
                 sys.exit(1)
         
+        if args.shard_dir and (args.export_columnar or args.replay or args.server):
+            if not database_ready(args.shard_dir):
+                print(f"No shards found in {args.shard_dir}. Please run with --setup --shard-dir first.")
+                sys.exit(1)
+            use_sharded_database(args.shard_dir)
+        
+        if args.export_columnar:
+            if not export_data(args.export_columnar, profiler):
+                sys.exit(1)
+        
+        if args.replay:
+            if not database_ready(args.shard_dir):
+                print("Database not found or empty. Please run with --setup first.")
+                sys.exit(1)
+            if not replay_queries(args.replay, args.replay_rounds, profiler, args.columnar_dir,
+                                  args.analytics_backend):
+                sys.exit(1)
+        
         if args.server:
             # Check if database is ready
-            if not check_database():
+            if not database_ready(args.shard_dir):
                 print("Database not found or empty. Please run with --setup first.")
                 print("Example: python main.py --setup")
                 sys.exit(1)
             
             # Run the MCP server
-            asyncio.run(run_server())
+            if args.transport == "http":
+                run_http_server(args.host, args.port, args.workers, args.columnar_dir, args.in_memory,
+                                args.analytics_backend, args.shard_dir, args.query_log or None, args.prewarm)
+            else:
+                asyncio.run(run_server(args.columnar_dir, args.in_memory, args.analytics_backend,
+                                       args.query_log or None, args.prewarm))
     
     except KeyboardInterrupt:
         print("\nApplication stopped by user.")
@@ -0,0 +1,169 @@
+from dataclasses import Field, field
+from typing import Dict, List, Optional, Union
+
+import msgspec
+
+# Typed records for the parts of a Cricsheet match document that ingestion
+# stores. Fields default to what the loader assumed for a missing key; keys
+# not listed here (meta, players, powerplays, review, ...) are never built.
+
+
+def record(cls):
+    """Class decorator: the class's fields, defaults and methods as a msgspec Struct
+
+    Structs are what msgspec decodes into fastest; they are created with
+    gc=False since a decoded match is a tree, with no reference cycles for
+    the collector to find.
+    """
+    members = []
+    for name, hint in cls.__annotations__.items():
+        default = cls.__dict__.get(name, msgspec.NODEFAULT)
+        if isinstance(default, Field):
+            default = msgspec.field(default_factory=default.default_factory)
+        members.append((name, hint, default))
+    methods = {k: v for k, v in cls.__dict__.items() if callable(v) and not k.startswith('__')}
+    return msgspec.defstruct(cls.__name__, members, namespace=methods, module=cls.__module__, gc=False)
+
+
+@record
+class RunsRecord:
+    batter: int = 0
+    extras: int = 0
+    total: int = 0
+    non_boundary: bool = False  # four runs that weren't a boundary
+
+
+@record
+class ExtrasRecord:
+    wides: int = 0
+    noballs: int = 0
+    byes: int = 0
+    legbyes: int = 0
+    penalty: int = 0
+
+
+@record
+class FielderRecord:
+    name: Optional[str] = None
+    substitute: bool = False
+
+    def to_json(self) -> Dict:
+        """The fielder as Cricsheet writes it (deliveries.wicket_fielders keeps that form)"""
+        return {'name': self.name, 'substitute': True} if self.substitute else {'name': self.name}
+
+
+@record
+class WicketRecord:
+    kind: Optional[str] = None
+    player_out: Optional[str] = None
+    # Plain names in files from before Cricsheet's fielder objects
+    fielders: List[Union[str, FielderRecord]] = field(default_factory=list)
+
+
+@record
+class DeliveryRecord:
+    batter: Optional[str] = None
+    bowler: Optional[str] = None
+    non_striker: Optional[str] = None
+    runs: RunsRecord = field(default_factory=RunsRecord)
+    extras: Optional[ExtrasRecord] = None
+    wickets: List[WicketRecord] = field(default_factory=list)
+
+
+@record
+class OverRecord:
+    over: int = 0
+    deliveries: List[DeliveryRecord] = field(default_factory=list)
+
+
+@record
+class TargetRecord:
+    runs: Optional[int] = None
+
+
+@record
+class InningsRecord:
+    team: Optional[str] = None
+    overs: List[OverRecord] = field(default_factory=list)
+    super_over: bool = False
+    target: Optional[TargetRecord] = None
+
+
+@record
+class MarginRecord:
+    runs: Optional[int] = None
+    wickets: Optional[int] = None
+
+
+@record
+class OutcomeRecord:
+    winner: Optional[str] = None
+    by: MarginRecord = field(default_factory=MarginRecord)
+    result: str = 'normal'
+    method: Optional[str] = None
+
+
+@record
+class TossRecord:
+    winner: Optional[str] = None
+    decision: Optional[str] = None
+
+
+@record
+class OfficialsRecord:
+    umpires: List[str] = field(default_factory=list)
+    match_referees: List[str] = field(default_factory=list)
+    tv_umpires: List[str] = field(default_factory=list)
+    reserve_umpires: List[str] = field(default_factory=list)
+
+
+@record
+class EventRecord:
+    name: str = 'Indian Premier League'
+    match_number: Optional[int] = None
+
+
+@record
+class RegistryRecord:
+    people: Dict[str, str] = field(default_factory=dict)
+
+
+@record
+class InfoRecord:
+    city: Optional[str] = None
+    venue: Optional[str] = None
+    dates: List[str] = field(default_factory=list)
+    season: Union[int, str, None] = None
+    match_type: str = 'T20'
+    gender: str = 'male'
+    overs: int = 20
+    balls_per_over: int = 6
+    teams: List[str] = field(default_factory=list)
+    outcome: OutcomeRecord = field(default_factory=OutcomeRecord)
+    toss: TossRecord = field(default_factory=TossRecord)
+    officials: OfficialsRecord = field(default_factory=OfficialsRecord)
+    player_of_match: List[str] = field(default_factory=list)
+    event: EventRecord = field(default_factory=EventRecord)
+    registry: RegistryRecord = field(default_factory=RegistryRecord)
+
+
+@record
+class MatchRecord:
+    info: InfoRecord = field(default_factory=InfoRecord)
+    innings: List[InningsRecord] = field(default_factory=list)
+    # The JSON the record was decoded from, stored as matches.raw_data; set by decode_match
+    document: Optional[bytes] = None
+
+
+_decoder = msgspec.json.Decoder(MatchRecord)
+
+
+def decode_match(raw: bytes) -> MatchRecord:
+    """Decode one Cricsheet match document into a MatchRecord
+
+    msgspec decodes the JSON straight into the records, skipping every key
+    they don't declare.
+    """
+    match = _decoder.decode(raw)
+    match.document = raw
+    return match
@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+from .cricsheet import DeliveryRecord
+from .matchups import BOWLER_WICKET_KINDS
+
+# Which fielding total a dismissal kind adds to
+FIELDING_KINDS = {
+    'caught': 'catches',
+    'caught and bowled': 'catches',
+    'stumped': 'stumpings',
+    'run out': 'run_outs',
+}
+
+
+class DismissalTracker:
+    """Collects every dismissal of one match, the fielders involved and their fielding totals"""
+
+    def __init__(self, match_id: int, registry: Dict[str, str]):
+        self.match_id = match_id
+        self.registry = registry
+        self.dismissals: List[Dict] = []
+        self.fielders: List[List[Dict]] = []  # Parallel to dismissals
+        self.fielding: Dict[str, Dict[str, int]] = {}
+
+    def add_ball(self, delivery: DeliveryRecord, innings: int, over: int, ball: int, super_over: bool = False):
+        bowler = delivery.bowler
+        for wicket in delivery.wickets:
+            kind = wicket.kind
+            self.dismissals.append(dict(
+                match_id=self.match_id,
+                innings=innings,
+                over=over,
+                ball=ball,
+                bowler=bowler,
+                batter=delivery.batter,
+                player_out=wicket.player_out,
+                kind=kind,
+                bowler_credited=kind in BOWLER_WICKET_KINDS,
+                is_super_over=super_over
+            ))
+
+            rows = []
+            for fielder in wicket.fielders:
+                # Older files list fielders as plain names
+                name = fielder if isinstance(fielder, str) else fielder.name
+                if name:
+                    substitute = not isinstance(fielder, str) and fielder.substitute
+                    rows.append(dict(fielder=name, fielder_id=self.registry.get(name), substitute=substitute))
+            if kind == 'caught and bowled' and not rows and bowler:
+                # The bowler took the catch
+                rows.append(dict(fielder=bowler, fielder_id=self.registry.get(bowler), substitute=False))
+            self.fielders.append(rows)
+
+            column = FIELDING_KINDS.get(kind)
+            if column and not super_over:
+                for row in rows:
+                    totals = self.fielding.get(row['fielder'])
+                    if totals is None:
+                        totals = self.fielding[row['fielder']] = {'catches': 0, 'stumpings': 0, 'run_outs': 0}
+                    totals[column] += 1
+
+    def fielding_rows(self) -> List[Dict]:
+        return [dict(fielder=fielder, **totals) for fielder, totals in self.fielding.items()]
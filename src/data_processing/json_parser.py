@@ -1,154 +1,329 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Text, text, insert, update, delete, select, tuple_, type_coerce
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from ..database.models import Match, Innings, Delivery, Player, Team, PlayerStats, TeamStats
+from ..database.models import (
+    Match, Innings, Delivery, Player, Team, PlayerStats, TeamStats, IngestCheckpoint, Partnership,
+    OverSummary, Matchup, DataGeneration, LeaderboardTotal, LeaderboardEntry, Dismissal, DismissalFielder,
+    Fielding, Base
+)
 from ..database.database import get_db_session
+from .cricsheet import DeliveryRecord, MatchRecord, decode_match
+from .sources import open_match_source
+from .progress import IngestProgress
+from .partnerships import PartnershipTracker
+from .matchups import MatchupTracker
+from .dismissals import DismissalTracker
+from .leaderboards import LeaderboardTracker, Leaderboards
+
+# Every team_stats row in one grouped pass. Each match contributes one row per
+# side, joined to that side's innings and its opponent's (innings 1 and 2 only,
+# so super overs are left out). Losses are decided matches the side did not
+# win, so ties and no-results count as neither; win percentage is taken over
+# matches with a result. The lowest total ignores no-result matches, where an
+# innings can be cut short after a few balls.
+TEAM_STATS_SQL = text("""
+    WITH sides AS (
+        SELECT id, team1 AS team, winner, result FROM matches WHERE team1 IS NOT NULL
+        UNION ALL
+        SELECT id, team2 AS team, winner, result FROM matches WHERE team2 IS NOT NULL
+    ),
+    totals AS (
+        SELECT s.team,
+               COUNT(*) AS played,
+               SUM(s.winner = s.team) AS won,
+               SUM(s.winner IS NOT NULL AND s.winner != s.team) AS lost,
+               SUM(s.result = 'no result') AS no_result,
+               SUM(bat.total_runs) AS scored,
+               SUM(bowl.total_runs) AS conceded,
+               MAX(bat.total_runs) AS highest,
+               MIN(CASE WHEN s.result != 'no result' THEN bat.total_runs END) AS lowest
+        FROM sides s
+        LEFT JOIN innings bat
+            ON bat.match_id = s.id AND bat.innings_number <= 2 AND bat.team = s.team
+        LEFT JOIN innings bowl
+            ON bowl.match_id = s.id AND bowl.innings_number <= 2 AND bowl.team != s.team
+        GROUP BY s.team
+    )
+    INSERT INTO team_stats (
+        team_name, matches_played, matches_won, matches_lost, matches_no_result,
+        total_runs_scored, total_runs_conceded, highest_score, lowest_score, win_percentage
+    )
+    SELECT team, played, won, lost, no_result,
+           COALESCE(scored, 0), COALESCE(conceded, 0), COALESCE(highest, 0), COALESCE(lowest, 0),
+           CASE WHEN played > no_result THEN ROUND(won * 100.0 / (played - no_result), 2) ELSE 0 END
+    FROM totals
+""")
 
 class IPLDataProcessor:
-    def __init__(self):
-        self.session = get_db_session()
+    def __init__(self, session: Optional[Session] = None):
+        self.session = session if session is not None else get_db_session()
+        
+        # In-memory registry caches, loaded once per ingest run
+        self.known_match_ids = None
+        self.known_teams = None
+        self.known_players = None
+        self.leaderboards = None
+        
+        # Balls written by process_innings_and_deliveries, for throughput reporting
+        self.deliveries_processed = 0
     
-    def process_all_matches(self, data_dir: str = "data") -> int:
-        """Process all JSON files in the data directory"""
-        processed_count = 0
-        json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    def load_registry_caches(self):
+        """Preload existing match IDs, team names and player IDs to avoid per-row lookups"""
+        self.load_registries()
+        self.load_leaderboards()
+    
+    def load_registries(self):
+        """Read the match IDs, team names and player IDs in the database (including uncommitted rows)"""
+        self.known_match_ids = {row[0] for row in self.session.query(Match.match_id)}
+        self.known_teams = {row[0] for row in self.session.query(Team.name)}
+        self.known_players = {
+            cricsheet_id: name
+            for cricsheet_id, name in self.session.query(Player.cricsheet_id, Player.name)
+        }
+    
+    def process_all_matches(self, data_dir: str = "data", decode_workers: int = 1,
+                            commit_every: int = 100, resume: bool = True,
+                            match_ids: Optional[Set[str]] = None) -> int:
+        """Process all JSON matches in a data directory or Cricsheet zip archive
         
-        print(f"Found {len(json_files)} JSON files to process...")
+        Work is committed every `commit_every` matches together with a checkpoint,
+        and the session is cleared so memory stays bounded. A rerun after a crash
+        resumes after the last committed checkpoint. `match_ids` limits the run
+        to those matches (one season's, when building a shard).
+        """
+        processed_count = 0
+        # Databases built by an older version may lack newer tables
+        Base.metadata.create_all(bind=self.session.get_bind())
+        self.load_registry_caches()
+        self.backfill_dismissals()
+        self.backfill_leaderboards()
         
-        for idx, filename in enumerate(json_files, 1):
-            if idx % 100 == 0:
-                print(f"Processed {idx}/{len(json_files)} matches...")
+        with open_match_source(data_dir) as source:
+            print(f"Found {len(source)} JSON files to process...")
             
-            try:
-                file_path = os.path.join(data_dir, filename)
-                match_data = self.load_match_json(file_path)
-                if match_data:
-                    self.process_match(match_data, filename.replace('.json', ''))
-                    processed_count += 1
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+            checkpoint = self.load_checkpoint(source) if resume else None
+            start = checkpoint.position if checkpoint else 0
+            committed_before = checkpoint.matches_processed if checkpoint else 0
+            if start:
+                print(f"Resuming after {checkpoint.last_match_id} ({start}/{len(source)} already committed)")
+            
+            # Matches already in the database are skipped before they are decoded
+            positions = {}
+            pending = []
+            for position, entry in enumerate(source.entries[start:], start + 1):
+                if entry[0] not in self.known_match_ids and (match_ids is None or entry[0] in match_ids):
+                    positions[entry[0]] = position
+                    pending.append(entry)
+            
+            progress = IngestProgress(len(pending))
+            position = start
+            matches = source.iter_matches(workers=decode_workers, entries=pending)
+            for match_id, match in matches:
+                delivered_before = self.deliveries_processed
+                savepoint = self.begin_match()
+                try:
+                    if match:
+                        self.process_match(match, match_id)
+                        processed_count += 1
+                    savepoint.commit()
+                except SQLAlchemyError:
+                    # The session is unusable after a failed flush. Everything up to
+                    # the last checkpoint is committed, so a rerun resumes from there.
+                    self.session.rollback()
+                    raise
+                except Exception as e:
+                    # None of the match's rows stay behind, and the caches forget
+                    # it, so the next run ingests it again
+                    savepoint.rollback()
+                    self.load_registries()
+                    self.deliveries_processed = delivered_before
+                    print(f"Error processing {match_id}.json: {e}")
+                
+                position = positions[match_id]
+                progress.update(deliveries=self.deliveries_processed - delivered_before)
+                
+                if commit_every and progress.matches % commit_every == 0:
+                    self.save_checkpoint(source, position, match_id, committed_before + processed_count)
+                    progress.report()
+            
+            # The whole source is in; a later run starts from the top again
+            self.clear_checkpoint(source)
+            self.flush_leaderboards()
+            self.publish_generation()
+            self.session.commit()
+            if progress.matches:
+                progress.report()
         
-        self.session.commit()
         self.session.close()
         print(f"Successfully processed {processed_count} matches!")
         return processed_count
     
-    def load_match_json(self, file_path: str) -> Optional[Dict]:
-        """Load and return match data from JSON file"""
+    def begin_match(self):
+        """Savepoint around one match's rows
+        
+        pysqlite only opens a transaction before DML, and a SAVEPOINT outside
+        one would commit on release, so the transaction is opened first.
+        """
+        connection = self.session.connection()
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+        return self.session.begin_nested()
+    
+    def load_checkpoint(self, source) -> Optional[IngestCheckpoint]:
+        """Return the saved checkpoint for a source if it still lines up with its entries"""
+        checkpoint = self.session.query(IngestCheckpoint).filter(
+            IngestCheckpoint.source == os.path.abspath(source.path)
+        ).first()
+        if not checkpoint or not 0 < checkpoint.position <= len(source):
+            return None
+        
+        # Files were added or removed since the checkpoint; fall back to a full scan
+        if source.entries[checkpoint.position - 1][0] != checkpoint.last_match_id:
+            return None
+        return checkpoint
+    
+    def save_checkpoint(self, source, position: int, last_match_id: str, processed: int):
+        """Commit pending work together with the checkpoint, then clear the session"""
+        path = os.path.abspath(source.path)
+        checkpoint = self.session.query(IngestCheckpoint).filter(
+            IngestCheckpoint.source == path
+        ).first()
+        if not checkpoint:
+            checkpoint = IngestCheckpoint(source=path, matches_processed=0)
+            self.session.add(checkpoint)
+        
+        checkpoint.position = position
+        checkpoint.last_match_id = last_match_id
+        checkpoint.matches_processed = processed
+        checkpoint.updated_at = datetime.now()
+        
+        self.flush_leaderboards()
+        self.publish_generation()
+        self.session.commit()
+        self.session.expunge_all()
+    
+    def publish_generation(self):
+        """Bump the data generation as part of the transaction about to be committed
+        
+        Commits only ever contain whole matches, so every generation is a
+        consistent state. Running servers poll it to know when to refresh.
+        """
+        bumped = self.session.execute(
+            update(DataGeneration).where(DataGeneration.id == 1).values(
+                generation=DataGeneration.generation + 1, published_at=datetime.now()
+            )
+        )
+        if bumped.rowcount == 0:
+            self.session.add(DataGeneration(id=1, generation=1, published_at=datetime.now()))
+    
+    def clear_checkpoint(self, source):
+        """Remove the checkpoint once a source has been ingested completely"""
+        self.session.query(IngestCheckpoint).filter(
+            IngestCheckpoint.source == os.path.abspath(source.path)
+        ).delete()
+    
+    def load_match_json(self, file_path: str) -> Optional[MatchRecord]:
+        """Load and decode a match from a JSON file"""
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return decode_match(f.read())
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             return None
     
-    def process_match(self, match_data: Dict, match_id: str):
+    def process_match(self, match: MatchRecord, match_id: str):
         """Process a single match and insert into database"""
-        info = match_data.get('info', {})
+        if self.known_match_ids is None:
+            self.load_registry_caches()
+        
+        # Skip if already processed
+        if match_id in self.known_match_ids:
+            return
+        
+        info = match.info
         
         # Parse date
-        dates = info.get('dates', [])
         match_date = None
-        if dates:
+        if info.dates:
             try:
-                match_date = datetime.strptime(dates[0], '%Y-%m-%d').date()
-            except:
+                match_date = datetime.strptime(info.dates[0], '%Y-%m-%d').date()
+            except ValueError:
                 pass
         
         # Get teams
-        teams = info.get('teams', [])
+        teams = info.teams
         team1 = teams[0] if len(teams) > 0 else None
         team2 = teams[1] if len(teams) > 1 else None
         
-        # Process outcome
-        outcome = info.get('outcome', {})
-        winner = outcome.get('winner')
-        win_by = outcome.get('by', {})
-        win_by_runs = win_by.get('runs')
-        win_by_wickets = win_by.get('wickets')
-        result = outcome.get('result', 'normal')
-        
-        # Process toss
-        toss = info.get('toss', {})
-        toss_winner = toss.get('winner')
-        toss_decision = toss.get('decision')
-        
-        # Process officials
-        officials = info.get('officials', {})
-        umpires = officials.get('umpires', [])
-        match_referee = officials.get('match_referees', [None])[0] if officials.get('match_referees') else None
-        tv_umpire = officials.get('tv_umpires', [None])[0] if officials.get('tv_umpires') else None
-        reserve_umpire = officials.get('reserve_umpires', [None])[0] if officials.get('reserve_umpires') else None
-        
-        # Player of the match
-        player_of_match = None
-        pom = info.get('player_of_match', [])
-        if pom:
-            player_of_match = pom[0]
-        
-        # Event info
-        event = info.get('event', {})
-        event_name = event.get('name', 'Indian Premier League')
-        match_number = event.get('match_number')
-        
-        # Create match record
-        match = Match(
+        outcome = info.outcome
+        officials = info.officials
+        
+        # The document goes into raw_data as read: bound as text, it skips the
+        # JSON type's re-serialization and reads back as the same dict
+        result = self.session.execute(insert(Match.__table__).values(
             match_id=match_id,
-            city=info.get('city'),
-            venue=info.get('venue'),
+            city=info.city,
+            venue=info.venue,
             date=match_date,
-            season=info.get('season'),
-            match_type=info.get('match_type', 'T20'),
-            event_name=event_name,
-            match_number=match_number,
-            gender=info.get('gender', 'male'),
-            overs=info.get('overs', 20),
-            balls_per_over=info.get('balls_per_over', 6),
-            winner=winner,
-            result=result,
-            win_by_runs=win_by_runs,
-            win_by_wickets=win_by_wickets,
-            win_method=outcome.get('method'),
-            toss_winner=toss_winner,
-            toss_decision=toss_decision,
-            player_of_match=player_of_match,
-            umpires=umpires,
-            match_referee=match_referee,
-            tv_umpire=tv_umpire,
-            reserve_umpire=reserve_umpire,
+            season=info.season,
+            match_type=info.match_type,
+            event_name=info.event.name,
+            match_number=info.event.match_number,
+            gender=info.gender,
+            overs=info.overs,
+            balls_per_over=info.balls_per_over,
+            winner=outcome.winner,
+            result=outcome.result,
+            win_by_runs=outcome.by.runs,
+            win_by_wickets=outcome.by.wickets,
+            win_method=outcome.method,
+            toss_winner=info.toss.winner,
+            toss_decision=info.toss.decision,
+            player_of_match=info.player_of_match[0] if info.player_of_match else None,
+            umpires=officials.umpires,
+            match_referee=officials.match_referees[0] if officials.match_referees else None,
+            tv_umpire=officials.tv_umpires[0] if officials.tv_umpires else None,
+            reserve_umpire=officials.reserve_umpires[0] if officials.reserve_umpires else None,
             team1=team1,
             team2=team2,
-            raw_data=match_data
-        )
-        
-        # Check if match already exists
-        existing_match = self.session.query(Match).filter(Match.match_id == match_id).first()
-        if existing_match:
-            return  # Skip if already processed
-        
-        self.session.add(match)
-        self.session.flush()  # Get the match.id
+            raw_data=type_coerce(match.document.decode('utf-8'), Text) if match.document else None
+        ))
+        match_db_id = result.inserted_primary_key[0]
+        self.known_match_ids.add(match_id)
         
         # Process innings and deliveries
-        self.process_innings_and_deliveries(match_data, match.id)
+        tracker = LeaderboardTracker(info.season, info.venue)
+        self.process_innings_and_deliveries(match, match_db_id, tracker)
+        tracker.add_result([team1, team2], outcome.winner)
         
         # Add teams if not exist
         self.add_teams([team1, team2])
         
         # Process players from registry
-        self.process_players(info.get('registry', {}).get('people', {}))
+        self.process_players(info.registry.people)
+        
+        # Last, as the in-memory totals aren't rolled back with a failed match
+        self.leaderboards.add_match(tracker)
     
-    def process_innings_and_deliveries(self, match_data: Dict, match_db_id: int):
+    def process_innings_and_deliveries(self, match: MatchRecord, match_db_id: int,
+                                       tracker: Optional[LeaderboardTracker] = None):
         """Process innings and ball-by-ball deliveries"""
-        innings_list = match_data.get('innings', [])
+        match_teams = match.info.teams
+        delivery_rows = []
+        partnership_rows = []
+        over_rows = []
+        matchups = MatchupTracker()
+        dismissals = DismissalTracker(match_db_id, match.info.registry.people)
         
-        for idx, inning in enumerate(innings_list, 1):
-            team = inning.get('team')
-            overs_data = inning.get('overs', [])
+        for idx, inning in enumerate(match.innings, 1):
+            team = inning.team
+            overs_data = inning.overs
             
             # Calculate innings totals
             total_runs = 0
@@ -156,14 +331,10 @@ class IPLDataProcessor:
             balls_bowled = 0
             
             for over in overs_data:
-                deliveries = over.get('deliveries', [])
-                for delivery in deliveries:
-                    runs = delivery.get('runs', {})
-                    total_runs += runs.get('total', 0)
+                for delivery in over.deliveries:
+                    total_runs += delivery.runs.total
                     balls_bowled += 1
-                    
-                    if delivery.get('wickets'):
-                        total_wickets += len(delivery['wickets'])
+                    total_wickets += len(delivery.wickets)
             
             total_overs = balls_bowled / 6.0
             run_rate = total_runs / total_overs if total_overs > 0 else 0
@@ -177,32 +348,223 @@ class IPLDataProcessor:
                 total_wickets=total_wickets,
                 total_overs=round(total_overs, 1),
                 run_rate=round(run_rate, 2),
-                target=inning.get('target', {}).get('runs') if idx == 2 else None
+                target=inning.target.runs if idx == 2 and inning.target else None
             )
             self.session.add(innings_record)
             
-            # Process deliveries
+            # Process deliveries, tracking partnerships and matchups in the same pass.
+            # Super overs are kept out of both, as in official records.
+            regular_innings = not inning.super_over
+            bowling_team = next((t for t in match_teams if t != team), None)
+            partnerships = PartnershipTracker(match_db_id, idx, team) if regular_innings else None
+            cumulative_runs = 0
+            cumulative_wickets = 0
             for over_num, over in enumerate(overs_data, 1):
-                deliveries = over.get('deliveries', [])
-                for ball_num, delivery in enumerate(deliveries, 1):
-                    self.process_delivery(delivery, match_db_id, idx, over_num, ball_num)
+                over_runs = over_wickets = over_extras = legal_balls = 0
+                for ball_num, delivery in enumerate(over.deliveries, 1):
+                    row = self.process_delivery(delivery, match_db_id, idx, over_num, ball_num)
+                    delivery_rows.append(row)
+                    if row['wicket_taken']:
+                        dismissals.add_ball(delivery, idx, over_num, ball_num, not regular_innings)
+                    if regular_innings:
+                        partnerships.add_ball(delivery)
+                        matchups.add_ball(delivery)
+                        if tracker is not None:
+                            tracker.add_ball(delivery, team, bowling_team)
+                    
+                    over_runs += row['runs_total']
+                    over_extras += row['runs_extras']
+                    over_wickets += len(delivery.wickets)
+                    if row['extras_type'] not in ('wide', 'noball'):
+                        legal_balls += 1
+                
+                # Per-over totals plus prefix sums for O(1) score-at-over lookups
+                cumulative_runs += over_runs
+                cumulative_wickets += over_wickets
+                over_rows.append(dict(
+                    match_id=match_db_id,
+                    innings=idx,
+                    team=team,
+                    over_number=over_num,
+                    runs=over_runs,
+                    wickets=over_wickets,
+                    extras=over_extras,
+                    legal_balls=legal_balls,
+                    cumulative_runs=cumulative_runs,
+                    cumulative_wickets=cumulative_wickets
+                ))
+            
+            if regular_innings:
+                partnership_rows.extend(partnerships.finish())
+        
+        # Insert every ball of the match in a single executemany
+        if delivery_rows:
+            self.session.execute(insert(Delivery.__table__), delivery_rows)
+            self.deliveries_processed += len(delivery_rows)
+        
+        if partnership_rows:
+            self.session.execute(insert(Partnership.__table__), partnership_rows)
+        
+        if over_rows:
+            self.session.execute(insert(OverSummary.__table__), over_rows)
+        
+        matchup_rows = matchups.rows()
+        if matchup_rows:
+            self.upsert_matchups(matchup_rows)
+        
+        self.insert_dismissals(dismissals)
+    
+    def upsert_matchups(self, rows: List[Dict]):
+        """Add one match's batter-vs-bowler totals onto the running matchup table"""
+        table = Matchup.__table__
+        stmt = sqlite_insert(table)
+        counters = ['balls', 'runs', 'dismissals', 'dots', 'fours', 'sixes']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['batter', 'bowler'],
+            set_={name: table.c[name] + stmt.excluded[name] for name in counters}
+        )
+        self.session.execute(stmt, rows)
+    
+    def insert_dismissals(self, dismissals: DismissalTracker):
+        """Insert a match's dismissals and fielders, and add its fielding to the career totals"""
+        if not dismissals.dismissals:
+            return
+        
+        table = Dismissal.__table__
+        dismissal_ids = self.session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), dismissals.dismissals
+        ).scalars().all()
+        fielder_rows = [dict(dismissal_id=dismissal_id, **row)
+                        for dismissal_id, rows in zip(dismissal_ids, dismissals.fielders) for row in rows]
+        if fielder_rows:
+            self.session.execute(insert(DismissalFielder.__table__), fielder_rows)
+        
+        fielding_rows = dismissals.fielding_rows()
+        if fielding_rows:
+            fielding = Fielding.__table__
+            stmt = sqlite_insert(fielding)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['fielder'],
+                set_={name: fielding.c[name] + stmt.excluded[name] for name in ['catches', 'stumpings', 'run_outs']}
+            )
+            self.session.execute(stmt, fielding_rows)
+    
+    def load_leaderboards(self):
+        """Read every leaderboard total and top-k board, to be updated in memory per match"""
+        totals = LeaderboardTotal.__table__
+        entries = LeaderboardEntry.__table__
+        running = {
+            (row[0], row[1], row[2], row[3]): list(row[4:])
+            for row in self.session.execute(select(
+                totals.c.metric, totals.c.scope_type, totals.c.scope, totals.c.name,
+                totals.c.value, totals.c.matches, totals.c.balls, totals.c.runs
+            ))
+        }
+        boards = {}
+        for row in self.session.execute(select(
+                entries.c.metric, entries.c.scope_type, entries.c.scope, entries.c.name,
+                entries.c.value, entries.c.matches, entries.c.balls, entries.c.runs
+        ).order_by(entries.c.metric, entries.c.scope_type, entries.c.scope, entries.c.rank)):
+            boards.setdefault((row[0], row[1], row[2]), []).append(tuple(row[3:]))
+        self.leaderboards = Leaderboards(running, boards)
+    
+    def flush_leaderboards(self):
+        """Write the totals and boards changed since the last commit into the pending transaction"""
+        leaderboards = self.leaderboards
+        if leaderboards is None or not (leaderboards.dirty_totals or leaderboards.dirty_boards):
+            return
+        
+        if leaderboards.dirty_totals:
+            totals = LeaderboardTotal.__table__
+            stmt = sqlite_insert(totals)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['metric', 'scope_type', 'scope', 'name'],
+                set_={name: stmt.excluded[name] for name in ['value', 'matches', 'balls', 'runs']}
+            )
+            rows = []
+            for key in leaderboards.dirty_totals:
+                value, matches, balls, runs = leaderboards.totals[key]
+                rows.append(dict(metric=key[0], scope_type=key[1], scope=key[2], name=key[3],
+                                 value=value, matches=matches, balls=balls, runs=runs))
+            self.session.execute(stmt, rows)
+        
+        if leaderboards.dirty_boards:
+            # Each changed board is rewritten whole; it is at most LEADERBOARD_SIZE rows
+            entries = LeaderboardEntry.__table__
+            boards = list(leaderboards.dirty_boards)
+            self.session.execute(delete(entries).where(
+                tuple_(entries.c.metric, entries.c.scope_type, entries.c.scope).in_(boards)
+            ))
+            self.session.execute(insert(entries), [
+                dict(metric=metric, scope_type=scope_type, scope=scope, rank=rank,
+                     name=name, value=value, matches=matches, balls=balls, runs=runs)
+                for metric, scope_type, scope in boards
+                for rank, (name, value, matches, balls, runs)
+                in enumerate(leaderboards.boards[(metric, scope_type, scope)], 1)
+            ])
+        
+        leaderboards.dirty_totals.clear()
+        leaderboards.dirty_boards.clear()
     
-    def process_delivery(self, delivery: Dict, match_id: int, innings: int, over: int, ball: int):
-        """Process a single delivery"""
-        runs = delivery.get('runs', {})
-        extras = delivery.get('extras', {})
-        wickets = delivery.get('wickets', [])
+    def stored_matches(self):
+        """(database id, decoded match) of every stored match, read one at a time"""
+        match_ids = [row[0] for row in self.session.query(Match.id).order_by(Match.id)]
+        # The stored JSON text, decoded by decode_match rather than the JSON type
+        document = type_coerce(Match.raw_data, Text)
+        for match_db_id in match_ids:
+            raw = self.session.query(document).filter(Match.id == match_db_id).scalar()
+            if raw:
+                yield match_db_id, decode_match(raw.encode('utf-8'))
+    
+    def backfill_dismissals(self):
+        """Build dismissals and fielding from stored match JSON when the database predates them"""
+        if not self.known_match_ids or self.session.query(Dismissal.id).first() is not None:
+            return
+        
+        print(f"Building dismissals for {len(self.known_match_ids)} existing matches...")
+        for match_db_id, match in self.stored_matches():
+            dismissals = DismissalTracker(match_db_id, match.info.registry.people)
+            for idx, inning in enumerate(match.innings, 1):
+                for over_num, over in enumerate(inning.overs, 1):
+                    for ball_num, delivery in enumerate(over.deliveries, 1):
+                        if delivery.wickets:
+                            dismissals.add_ball(delivery, idx, over_num, ball_num, inning.super_over)
+            self.insert_dismissals(dismissals)
+        
+        self.publish_generation()
+        self.session.commit()
+    
+    def backfill_leaderboards(self):
+        """Build the leaderboards from stored match JSON when the database predates them"""
+        if not self.known_match_ids or self.session.query(LeaderboardTotal.id).first() is not None:
+            return
+        
+        print(f"Building leaderboards for {len(self.known_match_ids)} existing matches...")
+        for match_db_id, match in self.stored_matches():
+            tracker = LeaderboardTracker(match.info.season, match.info.venue)
+            tracker.add_match(match)
+            self.leaderboards.add_match(tracker)
+        
+        self.flush_leaderboards()
+        self.publish_generation()
+        self.session.commit()
+    
+    def process_delivery(self, delivery: DeliveryRecord, match_id: int, innings: int, over: int, ball: int) -> Dict:
+        """Build the deliveries row for a single ball"""
+        runs = delivery.runs
+        extras = delivery.extras
+        wickets = delivery.wickets
         
         # Determine extras type
         extras_type = None
         if extras:
-            if 'wides' in extras:
+            if extras.wides:
                 extras_type = 'wide'
-            elif 'noballs' in extras:
+            elif extras.noballs:
                 extras_type = 'noball'
-            elif 'byes' in extras:
+            elif extras.byes:
                 extras_type = 'bye'
-            elif 'legbyes' in extras:
+            elif extras.legbyes:
                 extras_type = 'legbye'
         
         # Wicket information
@@ -212,50 +574,64 @@ class IPLDataProcessor:
         wicket_fielders = None
         
         if wickets:
-            wicket = wickets[0]  # Take first wicket
-            wicket_type = wicket.get('kind')
-            wicket_player_out = wicket.get('player_out')
-            wicket_fielders = wicket.get('fielders', [])
+            # First wicket only; every wicket of the ball is in dismissals
+            wicket = wickets[0]
+            wicket_type = wicket.kind
+            wicket_player_out = wicket.player_out
+            wicket_fielders = [f if isinstance(f, str) else f.to_json() for f in wicket.fielders]
         
-        delivery_record = Delivery(
+        return dict(
             match_id=match_id,
             innings=innings,
             over=over,
             ball=ball,
-            batter=delivery.get('batter'),
-            non_striker=delivery.get('non_striker'),
-            bowler=delivery.get('bowler'),
-            runs_batter=runs.get('batter', 0),
-            runs_extras=runs.get('extras', 0),
-            runs_total=runs.get('total', 0),
+            batter=delivery.batter,
+            non_striker=delivery.non_striker,
+            bowler=delivery.bowler,
+            runs_batter=runs.batter,
+            runs_extras=runs.extras,
+            runs_total=runs.total,
             extras_type=extras_type,
             wicket_taken=wicket_taken,
             wicket_type=wicket_type,
             wicket_player_out=wicket_player_out,
-            wicket_fielders=wicket_fielders
+            wicket_fielders=wicket_fielders,
+            is_super_over=False
         )
-        
-        self.session.add(delivery_record)
     
     def add_teams(self, team_names: List[str]):
         """Add teams if they don't exist"""
+        if self.known_teams is None:
+            self.load_registry_caches()
+        
+        new_teams = []
         for team_name in team_names:
-            if team_name:
-                existing_team = self.session.query(Team).filter(Team.name == team_name).first()
-                if not existing_team:
-                    team = Team(name=team_name)
-                    self.session.add(team)
+            if team_name and team_name not in self.known_teams:
+                self.known_teams.add(team_name)
+                new_teams.append({'name': team_name})
+        
+        if new_teams:
+            self.session.execute(
+                sqlite_insert(Team.__table__).on_conflict_do_nothing(index_elements=['name']),
+                new_teams
+            )
     
     def process_players(self, registry: Dict[str, str]):
         """Process players from registry"""
+        if self.known_players is None:
+            self.load_registry_caches()
+        
+        new_players = []
         for player_name, cricsheet_id in registry.items():
-            existing_player = self.session.query(Player).filter(Player.cricsheet_id == cricsheet_id).first()
-            if not existing_player:
-                player = Player(
-                    name=player_name,
-                    cricsheet_id=cricsheet_id
-                )
-                self.session.add(player)
+            if cricsheet_id not in self.known_players:
+                self.known_players[cricsheet_id] = player_name
+                new_players.append({'name': player_name, 'cricsheet_id': cricsheet_id})
+        
+        if new_players:
+            self.session.execute(
+                sqlite_insert(Player.__table__).on_conflict_do_nothing(index_elements=['cricsheet_id']),
+                new_players
+            )
     
     def calculate_statistics(self):
         """Calculate and store player and team statistics"""
@@ -265,26 +641,8 @@ class IPLDataProcessor:
         try:
             # Clear existing stats
             self.session.query(PlayerStats).delete()
-            self.session.query(TeamStats).delete()
             
-            # Create basic team stats
-            teams = self.session.query(Team).all()
-            for team in teams:
-                matches = self.session.query(Match).filter(
-                    (Match.team1 == team.name) | (Match.team2 == team.name)
-                ).all()
-                
-                wins = self.session.query(Match).filter(Match.winner == team.name).count()
-                total_matches = len(matches)
-                
-                team_stats = TeamStats(
-                    team_name=team.name,
-                    matches_played=total_matches,
-                    matches_won=wins,
-                    matches_lost=total_matches - wins,
-                    win_percentage=round((wins * 100) / max(1, total_matches), 2) if total_matches > 0 else 0
-                )
-                self.session.add(team_stats)
+            self.calculate_team_stats()
             
             # Create basic player stats using ORM queries
             all_deliveries = self.session.query(Delivery).all()
@@ -365,6 +723,7 @@ class IPLDataProcessor:
                 )
                 self.session.add(player_stats)
             
+            self.publish_generation()
             self.session.commit()
             print("Statistics calculated successfully!")
             
@@ -378,5 +737,6 @@ class IPLDataProcessor:
         pass
     
     def calculate_team_stats(self):
-        """Legacy method - now handled in calculate_statistics"""
-        pass 
\ No newline at end of file
+        """Rebuild team_stats from matches and innings with one INSERT ... SELECT"""
+        self.session.query(TeamStats).delete()
+        self.session.execute(TEAM_STATS_SQL) 
\ No newline at end of file
@@ -0,0 +1,166 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cricsheet import DeliveryRecord, MatchRecord
+from .matchups import BOWLER_WICKET_KINDS
+
+# Rows kept per board
+LEADERBOARD_SIZE = 20
+
+# Scopes each metric is ranked in. 'all' has a single board with scope ''.
+METRIC_SCOPES = {
+    'runs': ('all', 'season', 'venue', 'team'),
+    'wickets': ('all', 'season', 'venue', 'team'),
+    'wins': ('all', 'season', 'venue'),
+}
+
+# (metric, scope_type, scope)
+Board = Tuple[str, str, str]
+
+# (metric, scope_type, scope, name)
+TotalKey = Tuple[str, str, str, str]
+
+# (name, value, matches, balls, runs), best first
+Entry = Tuple[str, int, int, int, int]
+
+
+def venue_scope(venue: Optional[str]) -> str:
+    """Board scope of a venue: 'Wankhede Stadium, Mumbai' and 'Wankhede Stadium' share one"""
+    core = (venue or '').split(',')[0]
+    return ' '.join(re.sub(r'[^\w\s]', ' ', core).lower().split())
+
+
+def season_scope(season) -> str:
+    return str(season) if season else ''
+
+
+def season_names(season: str) -> List[str]:
+    """Season names a year may be stored under: Cricsheet calls the 2008 season '2007/08'"""
+    names = [season]
+    if re.fullmatch(r'\d{4}', season):
+        names.append(f"{int(season) - 1}/{season[2:]}")
+    return names
+
+
+class LeaderboardTracker:
+    """Accumulates one match's contributions to every leaderboard it touches
+
+    A player's runs count balls faced (no wides) and runs off the bat; wickets
+    count dismissals credited to the bowler, with balls (no wides or no-balls)
+    and runs conceded (no byes or leg byes). Teams get a match played each and
+    the winner a win. Super overs are left out.
+    """
+
+    def __init__(self, season, venue: Optional[str]):
+        self.season = season_scope(season)
+        self.venue = venue_scope(venue)
+        # (metric, name, team) -> [value, balls, runs]; expanded to scopes in contributions()
+        self.totals: Dict[Tuple[str, str, Optional[str]], List[int]] = {}
+
+    def _add(self, metric: str, name: str, team: Optional[str], value: int, balls: int, runs: int):
+        totals = self.totals.get((metric, name, team))
+        if totals is None:
+            totals = self.totals[(metric, name, team)] = [0, 0, 0]
+        totals[0] += value
+        totals[1] += balls
+        totals[2] += runs
+
+    def add_ball(self, delivery: DeliveryRecord, batting_team: Optional[str], bowling_team: Optional[str]):
+        runs = delivery.runs
+        extras = delivery.extras
+
+        batter = delivery.batter
+        if batter:
+            self._add('runs', batter, batting_team, runs.batter, 0 if extras and extras.wides else 1, runs.batter)
+
+        bowler = delivery.bowler
+        if bowler:
+            wickets = 0
+            for wicket in delivery.wickets:
+                if wicket.kind in BOWLER_WICKET_KINDS:
+                    wickets += 1
+            legal = 0 if extras and (extras.wides or extras.noballs) else 1
+            conceded = runs.total
+            if extras:
+                conceded -= extras.byes + extras.legbyes
+            self._add('wickets', bowler, bowling_team, wickets, legal, conceded)
+
+    def add_result(self, teams: Iterable[Optional[str]], winner: Optional[str]):
+        for team in teams:
+            if team:
+                self._add('wins', team, None, 1 if team == winner else 0, 0, 0)
+
+    def add_match(self, match: MatchRecord):
+        """Every contribution of a match, straight from its decoded Cricsheet JSON"""
+        teams = match.info.teams
+        for inning in match.innings:
+            if inning.super_over:
+                continue
+            batting_team = inning.team
+            bowling_team = next((t for t in teams if t != batting_team), None)
+            for over in inning.overs:
+                for delivery in over.deliveries:
+                    self.add_ball(delivery, batting_team, bowling_team)
+        self.add_result(teams, match.info.outcome.winner)
+
+    def contributions(self) -> Iterator[Tuple[TotalKey, List[int]]]:
+        """(board key + name, [value, balls, runs]) for every board this match counts towards"""
+        scopes = {'all': '', 'season': self.season, 'venue': self.venue}
+        for (metric, name, team), totals in self.totals.items():
+            for scope_type in METRIC_SCOPES[metric]:
+                scope = team if scope_type == 'team' else scopes[scope_type]
+                if scope or scope_type == 'all':
+                    yield (metric, scope_type, scope, name), totals
+
+
+def merge_board(metric: str, current: List[Entry], changed: Iterable[Entry],
+                size: int = LEADERBOARD_SIZE) -> List[Entry]:
+    """Next top-k of a board from its current top-k and the new totals of the names that changed
+
+    Totals only grow, so a name outside the top-k can only enter it by
+    changing, which makes this exact without looking at any other totals.
+    Ties are ranked by name, like the statements computing the same board
+    from deliveries (QueryCompiler), so a board doesn't depend on the order
+    matches were loaded or shards merged in.
+    """
+    merged = {entry[0]: entry for entry in current}
+    for entry in changed:
+        # A bowler without a wicket has totals but no place on the board
+        if entry[1] > 0 or metric == 'wins':
+            merged[entry[0]] = entry
+    return sorted(merged.values(), key=lambda entry: (-entry[1], entry[0]))[:size]
+
+
+class Leaderboards:
+    """Running totals and top-k boards of every leaderboard, updated one match at a time
+
+    Loaded once per ingest run. add_match only touches memory; the totals and
+    boards it changed are written back with each commit (see
+    IPLDataProcessor.flush_leaderboards).
+    """
+
+    def __init__(self, totals: Dict[TotalKey, List[int]], boards: Dict[Board, List[Entry]]):
+        self.totals = totals  # key -> [value, matches, balls, runs]
+        self.boards = boards
+        self.dirty_totals = set()
+        self.dirty_boards = set()
+
+    def add_match(self, tracker: LeaderboardTracker):
+        changed: Dict[Board, List[Entry]] = {}
+        for key, (value, balls, runs) in tracker.contributions():
+            totals = self.totals.get(key)
+            if totals is None:
+                totals = self.totals[key] = [0, 0, 0, 0]
+            totals[0] += value
+            totals[1] += 1
+            totals[2] += balls
+            totals[3] += runs
+            self.dirty_totals.add(key)
+            changed.setdefault(key[:3], []).append((key[3], *totals))
+
+        for board, entries in changed.items():
+            current = self.boards.get(board, [])
+            merged = merge_board(board[0], current, entries)
+            if merged != current:
+                self.boards[board] = merged
+                self.dirty_boards.add(board)
@@ -0,0 +1,47 @@
+from typing import Dict, List, Tuple
+
+from .cricsheet import DeliveryRecord
+
+# Dismissals credited to the bowler
+BOWLER_WICKET_KINDS = {'bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'hit wicket'}
+
+
+class MatchupTracker:
+    """Accumulates batter-vs-bowler totals for one match, ready to upsert"""
+
+    def __init__(self):
+        self.totals: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def add_ball(self, delivery: DeliveryRecord):
+        batter = delivery.batter
+        bowler = delivery.bowler
+        if not batter or not bowler:
+            return
+
+        totals = self.totals.get((batter, bowler))
+        if totals is None:
+            totals = self.totals[(batter, bowler)] = {
+                'balls': 0, 'runs': 0, 'dismissals': 0, 'dots': 0, 'fours': 0, 'sixes': 0
+            }
+
+        runs = delivery.runs.batter
+        totals['runs'] += runs
+
+        # Wides are not balls faced by the batter
+        if not (delivery.extras and delivery.extras.wides):
+            totals['balls'] += 1
+            if runs == 0:
+                totals['dots'] += 1
+
+        if runs == 4 and not delivery.runs.non_boundary:
+            totals['fours'] += 1
+        elif runs == 6:
+            totals['sixes'] += 1
+
+        for wicket in delivery.wickets:
+            if wicket.player_out == batter and wicket.kind in BOWLER_WICKET_KINDS:
+                totals['dismissals'] += 1
+
+    def rows(self) -> List[Dict]:
+        return [dict(batter=batter, bowler=bowler, **totals)
+                for (batter, bowler), totals in self.totals.items()]
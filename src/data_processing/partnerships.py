@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+
+from .cricsheet import DeliveryRecord
+
+# Dismissal kinds that end a partnership without a wicket falling
+NOT_OUT_DISMISSALS = {'retired hurt', 'retired not out'}
+
+
+class PartnershipTracker:
+    """Builds partnership rows for one innings from its deliveries, in order"""
+
+    def __init__(self, match_id: int, innings: int, team: Optional[str]):
+        self.match_id = match_id
+        self.innings = innings
+        self.team = team
+        self.wicket = 1
+        self.current = None
+        self.rows: List[Dict] = []
+
+    def add_ball(self, delivery: DeliveryRecord):
+        batter = delivery.batter
+        non_striker = delivery.non_striker
+        pair = tuple(sorted((batter or '', non_striker or '')))
+
+        # A new pair without a recorded dismissal (e.g. an unrecorded retirement)
+        if self.current and self.current['pair'] != pair:
+            self._close(unbeaten=False)
+        if not self.current:
+            self.current = {'pair': pair, 'runs': 0, 'balls': 0, 'batter_runs': {pair[0]: 0, pair[1]: 0}}
+
+        runs = delivery.runs
+        self.current['runs'] += runs.total
+        if batter in self.current['batter_runs']:
+            self.current['batter_runs'][batter] += runs.batter
+        if not (delivery.extras and delivery.extras.wides):
+            self.current['balls'] += 1
+
+        wickets = delivery.wickets
+        if wickets:
+            self._close(unbeaten=False)
+            self.wicket += sum(1 for w in wickets if w.kind not in NOT_OUT_DISMISSALS)
+
+    def finish(self) -> List[Dict]:
+        """Close the stand in progress at the end of the innings and return all rows"""
+        if self.current:
+            self._close(unbeaten=True)
+        return self.rows
+
+    def _close(self, unbeaten: bool):
+        current = self.current
+        first, second = current['pair']
+        self.rows.append(dict(
+            match_id=self.match_id,
+            innings=self.innings,
+            team=self.team,
+            wicket=min(self.wicket, 10),
+            batter1=first,
+            batter2=second,
+            batter1_runs=current['batter_runs'][first],
+            batter2_runs=current['batter_runs'][second],
+            runs=current['runs'],
+            balls=current['balls'],
+            unbeaten=unbeaten
+        ))
+        self.current = None
@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+
+
+class IngestProgress:
+    """Throughput and ETA reporting for long ingest runs"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.matches = 0
+        self.deliveries = 0
+        self.started = time.perf_counter()
+
+    def update(self, matches: int = 1, deliveries: int = 0):
+        self.matches += matches
+        self.deliveries += deliveries
+
+    def summary(self) -> str:
+        """One-line progress report: done/total, matches/sec, deliveries/sec and ETA"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        match_rate = self.matches / elapsed
+        delivery_rate = self.deliveries / elapsed
+        remaining = max(self.total - self.matches, 0)
+        eta = timedelta(seconds=round(remaining / match_rate)) if match_rate > 0 else "unknown"
+        return (f"Processed {self.matches}/{self.total} matches | "
+                f"{match_rate:.1f} matches/s | {delivery_rate:,.0f} deliveries/s | "
+                f"ETA {eta}")
+
+    def report(self):
+        print(self.summary())
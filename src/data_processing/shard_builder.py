@@ -0,0 +1,277 @@
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..database.models import (
+    Base, Fielding, LeaderboardEntry, LeaderboardTotal, Matchup, Player, Shard, Team
+)
+from ..database.shards import (
+    SHARD_ID_SPAN, SHARD_TABLES, ShardStore, attach_limit, database_uri, shard_file
+)
+from .json_parser import IPLDataProcessor
+from .leaderboards import merge_board, season_names, season_scope
+from .sources import open_match_source
+
+# Moves a shard's ids from 1.. into its own range (see SHARD_ID_SPAN): every
+# primary key, and every column referring to one
+REBASE_STATEMENTS = [
+    text("UPDATE matches SET id = id + :base"),
+    text("UPDATE innings SET id = id + :base, match_id = match_id + :base"),
+    text("UPDATE deliveries SET id = id + :base, match_id = match_id + :base"),
+    text("UPDATE partnerships SET id = id + :base, match_id = match_id + :base"),
+    text("UPDATE over_summary SET id = id + :base, match_id = match_id + :base"),
+    text("UPDATE dismissals SET id = id + :base, match_id = match_id + :base"),
+    text("UPDATE dismissal_fielders SET id = id + :base, dismissal_id = dismissal_id + :base"),
+]
+
+# Catalog tables added up over the shards: table -> (key columns, summed columns)
+SUMMED_TABLES = {
+    Matchup.__table__: (('batter', 'bowler'), ('balls', 'runs', 'dismissals', 'dots', 'fours', 'sixes')),
+    Fielding.__table__: (('fielder',), ('catches', 'stumpings', 'run_outs')),
+    LeaderboardTotal.__table__: (('metric', 'scope_type', 'scope', 'name'), ('value', 'matches', 'balls', 'runs')),
+}
+# Catalog tables unioned over the shards, the oldest season's row winning
+UNIONED_TABLES = {
+    Team.__table__: (('name',), ('short_name',)),
+    Player.__table__: (('cricsheet_id',), ('name',)),
+}
+# Everything else in the catalog (player and team stats) is recomputed over the federated shards
+
+CATALOG_TABLES = [table for table in Base.metadata.sorted_tables
+                  if table.name not in SHARD_TABLES and table.name != 'ingest_checkpoints']
+
+
+def route_matches(data_dir: str, decode_workers: int = 1) -> Dict[str, List[str]]:
+    """Match IDs of a source by season, in source order"""
+    seasons: Dict[str, List[str]] = {}
+    with open_match_source(data_dir) as source:
+        for match_id, match in source.iter_matches(workers=decode_workers):
+            if match:
+                seasons.setdefault(season_scope(match.info.season), []).append(match_id)
+    return seasons
+
+
+def build_shard(directory: str, season: str, shard_id: int, data_dir: str, match_ids: Sequence[str],
+                decode_workers: int = 1) -> Dict:
+    """Build one season's shard from scratch next to the current one, then swap it in
+
+    Runs the regular ingest into a fresh file, so a shard has every table;
+    its teams, players, matchups, fielding and leaderboards only cover the
+    season and are added up in the catalog. Safe to run in a worker process.
+    """
+    path = os.path.join(directory, shard_file(season))
+    building = path + '.building'
+    if os.path.exists(building):
+        os.remove(building)
+
+    engine = create_engine(f"sqlite:///{building}", echo=False)
+    Base.metadata.create_all(bind=engine)
+    processor = IPLDataProcessor(sessionmaker(autocommit=False, autoflush=False, bind=engine)())
+    processor.process_all_matches(data_dir, decode_workers=decode_workers, commit_every=0, resume=False,
+                                  match_ids=set(match_ids))
+
+    with engine.begin() as conn:
+        for statement in REBASE_STATEMENTS:
+            conn.execute(statement, {'base': shard_id * SHARD_ID_SPAN})
+        matches = conn.execute(text("SELECT COUNT(*) FROM matches")).scalar()
+        deliveries = conn.execute(text("SELECT COUNT(*) FROM deliveries")).scalar()
+    engine.dispose()
+
+    # Servers reading the previous file keep it open until they re-attach
+    os.replace(building, path)
+    return {'season': season, 'matches': matches, 'deliveries': deliveries, 'built_at': datetime.now()}
+
+
+def build_archive(path: str, shards: Sequence[str]):
+    """Copy the shard tables of several shards into one file, swapped in when complete"""
+    building = path + '.building'
+    if os.path.exists(building):
+        os.remove(building)
+
+    engine = create_engine(f"sqlite:///{building}", echo=False)
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables[name] for name in SHARD_TABLES])
+    engine.dispose()
+
+    conn = sqlite3.connect(building)
+    try:
+        # One shard attached at a time, so there can be any number of them
+        for shard in shards:
+            conn.execute("ATTACH DATABASE ? AS shard", (database_uri(shard),))
+            with conn:
+                for table in SHARD_TABLES:
+                    conn.execute(f"INSERT INTO main.{table} SELECT * FROM shard.{table}")
+            conn.execute("DETACH DATABASE shard")
+    finally:
+        conn.close()
+    os.replace(building, path)
+
+
+def merge_shards(paths: Sequence[str]) -> Dict:
+    """Rows of the added-up and unioned catalog tables, read one shard at a time"""
+    merged = {table: {} for table in (*SUMMED_TABLES, *UNIONED_TABLES)}
+    for path in paths:
+        conn = sqlite3.connect(database_uri(path), uri=True)
+        try:
+            for table, (keys, values) in SUMMED_TABLES.items():
+                rows = merged[table]
+                for row in conn.execute(f"SELECT {', '.join(keys + values)} FROM {table.name} ORDER BY id"):
+                    totals = rows.get(row[:len(keys)])
+                    if totals is None:
+                        rows[row[:len(keys)]] = [value or 0 for value in row[len(keys):]]
+                    else:
+                        for i, value in enumerate(row[len(keys):]):
+                            totals[i] += value or 0
+            for table, (keys, values) in UNIONED_TABLES.items():
+                rows = merged[table]
+                for row in conn.execute(f"SELECT {', '.join(keys + values)} FROM {table.name} ORDER BY id"):
+                    rows.setdefault(row[:len(keys)], row[len(keys):])
+        finally:
+            conn.close()
+
+    return {table: [dict(zip(keys + values, (*key, *row))) for key, row in merged[table].items()]
+            for table, (keys, values) in {**SUMMED_TABLES, **UNIONED_TABLES}.items()}
+
+
+def leaderboard_rows(totals: List[Dict]) -> List[Dict]:
+    """Every top-k board, ranked from the added-up totals"""
+    boards = {}
+    for row in totals:
+        boards.setdefault((row['metric'], row['scope_type'], row['scope']), []).append(
+            (row['name'], row['value'], row['matches'], row['balls'], row['runs']))
+    return [dict(metric=metric, scope_type=scope_type, scope=scope, rank=rank,
+                 name=name, value=value, matches=matches, balls=balls, runs=runs)
+            for (metric, scope_type, scope), candidates in boards.items()
+            for rank, (name, value, matches, balls, runs) in enumerate(merge_board(metric, [], candidates), 1)]
+
+
+def _catalog_session(store: ShardStore, attachments: Sequence[str]) -> Session:
+    """Writable catalog session with the shard tables federated, as served but not read-only"""
+    engine = create_engine("sqlite://", creator=lambda: store.connect(attachments, readonly=False), echo=False)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def refresh_catalog(store: ShardStore, built: List[Dict], shard_ids: Dict[str, int],
+                    dropped: Sequence[str] = ()):
+    """Record rebuilt shards in the catalog and rebuild every table spanning seasons
+
+    Everything the catalog changes goes into one transaction, which also
+    publishes a new data generation, so a running server switches to the
+    rebuilt shards and the matching totals together.
+    """
+    engine = create_engine(f"sqlite:///{store.catalog_path}", echo=False)
+    with engine.connect() as conn:
+        current = {row.season: row for row in conn.execute(select(Shard.__table__))}
+    engine.dispose()
+
+    now = {row['season']: row for row in built}
+    seasons = sorted(set(current) - set(dropped) | set(now))
+    built_at = {season: now[season]['built_at'] if season in now else current[season].built_at
+                for season in seasons}
+    paths = {season: os.path.join(store.directory, shard_file(season)) for season in seasons}
+
+    # Oldest seasons go to the archive when there are more than can be attached
+    limit = attach_limit()
+    archived = seasons[:len(seasons) - (limit - 1)] if len(seasons) > limit else []
+    if archived:
+        if not os.path.exists(store.archive_path) or any(
+                season not in current or current[season].archived_at != built_at[season] for season in archived):
+            print(f"Archiving {len(archived)} seasons ({archived[0]} to {archived[-1]})...")
+            build_archive(store.archive_path, [paths[season] for season in archived])
+        attachments = [store.archive_path] + [paths[season] for season in seasons if season not in archived]
+    else:
+        attachments = [paths[season] for season in seasons]
+
+    print(f"Merging {len(seasons)} shards into the catalog...")
+    merged = merge_shards([paths[season] for season in seasons])
+    session = _catalog_session(store, attachments)
+    try:
+        shards = Shard.__table__
+        session.execute(delete(shards).where(shards.c.season.not_in(seasons)))
+        for season in seasons:
+            row = dict(season=season, path=shard_file(season), built_at=built_at[season],
+                       archived_at=built_at[season] if season in archived else None)
+            if season in now:
+                row.update(matches=now[season]['matches'], deliveries=now[season]['deliveries'])
+            if season in current:
+                session.execute(shards.update().where(shards.c.season == season).values(**row))
+            else:
+                session.execute(insert(shards).values(id=shard_ids[season], **row))
+
+        for table, rows in merged.items():
+            session.execute(delete(table))
+            if rows:
+                session.execute(insert(table), rows)
+        session.execute(delete(LeaderboardEntry.__table__))
+        boards = leaderboard_rows(merged[LeaderboardTotal.__table__])
+        if boards:
+            session.execute(insert(LeaderboardEntry.__table__), boards)
+
+        # Player and team stats over the federated shards; commits everything
+        IPLDataProcessor(session).calculate_statistics()
+    finally:
+        session.close()
+        session.get_bind().dispose()
+
+    if not archived and os.path.exists(store.archive_path):
+        os.remove(store.archive_path)
+    for season in dropped:
+        path = os.path.join(store.directory, shard_file(season))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def build_store(directory: str, data_dir: str, seasons: Optional[Sequence[str]] = None,
+                rebuild: bool = False, workers: int = 1, decode_workers: int = 1) -> Dict[str, int]:
+    """Bring a sharded store up to date with a source; returns matches per rebuilt season
+
+    By default only seasons without a shard, or whose match count in the
+    source changed, are rebuilt. `seasons` rebuilds those (a year also
+    matches Cricsheet's '2007/08' naming), `rebuild` every season in the
+    source, dropping shards of seasons it doesn't have. Shards are built
+    in up to `workers` processes at once.
+    """
+    os.makedirs(directory, exist_ok=True)
+    store = ShardStore(directory)
+    engine = create_engine(f"sqlite:///{store.catalog_path}", echo=False)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        Base.metadata.create_all(bind=conn, tables=CATALOG_TABLES)
+        current = {row.season: row for row in conn.execute(select(Shard.__table__))}
+    engine.dispose()
+
+    routed = route_matches(data_dir, decode_workers)
+    if seasons:
+        wanted = {name for season in seasons for name in season_names(season)}
+        targets = sorted(season for season in routed if season in wanted)
+    elif rebuild:
+        targets = sorted(routed)
+    else:
+        targets = sorted(season for season in routed
+                         if season not in current or current[season].matches != len(routed[season]))
+    dropped = [season for season in current if season not in routed] if rebuild else []
+    if not targets and not dropped:
+        print("Every season's shard is up to date.")
+        return {}
+
+    # New seasons get the next free id ranges; rebuilt ones keep theirs
+    shard_ids = {season: row.id for season, row in current.items()}
+    for season in targets:
+        if season not in shard_ids:
+            shard_ids[season] = max(shard_ids.values(), default=0) + 1
+
+    print(f"Building {len(targets)} shard(s): {', '.join(f'{s} ({len(routed[s])} matches)' for s in targets)}")
+    jobs = [(directory, season, shard_ids[season], data_dir, routed[season], decode_workers)
+            for season in targets]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(build_shard, *zip(*jobs)))
+    else:
+        built = [build_shard(*job) for job in jobs]
+
+    refresh_catalog(store, built, shard_ids, dropped)
+    return {row['season']: row['matches'] for row in built}
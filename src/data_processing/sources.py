@@ -0,0 +1,113 @@
+import abc
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from .cricsheet import MatchRecord, decode_match
+
+
+def open_match_source(path: str) -> "MatchSource":
+    """Open a directory of Cricsheet JSON files or a Cricsheet zip archive"""
+    if os.path.isfile(path) and zipfile.is_zipfile(path):
+        return ZipArchiveSource(path)
+    if os.path.isdir(path):
+        return DirectorySource(path)
+    raise FileNotFoundError(f"No JSON directory or zip archive found at {path}")
+
+
+class MatchSource(abc.ABC):
+    """Ordered collection of match documents keyed by Cricsheet match ID
+
+    Subclasses say how to read a document (read_bytes); one without it
+    can't be created.
+    """
+
+    def __init__(self, path: str, entries: List[Tuple[str, str]]):
+        self.path = path
+        # (match_id, location) pairs, sorted so every run sees the same order
+        self.entries = sorted(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @abc.abstractmethod
+    def read_bytes(self, location: str) -> bytes:
+        """The raw JSON of the document at a location from entries"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self, entry: Tuple[str, str]) -> Tuple[str, Optional[MatchRecord]]:
+        match_id, location = entry
+        try:
+            return match_id, decode_match(self.read_bytes(location))
+        except Exception as e:
+            print(f"Error loading {location}: {e}")
+            return match_id, None
+
+    def iter_matches(self, workers: int = 1, entries: Optional[List[Tuple[str, str]]] = None
+                     ) -> Iterator[Tuple[str, Optional[MatchRecord]]]:
+        """Yield (match_id, match) in order, decoding up to `workers` members concurrently"""
+        entries = self.entries if entries is None else entries
+        if workers <= 1:
+            for entry in entries:
+                yield self._load(entry)
+            return
+
+        # Keep a bounded window of decodes in flight so memory stays flat
+        # no matter how large the archive is.
+        window = workers * 4
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            remaining = iter(entries)
+            for entry in remaining:
+                pending.append(pool.submit(self._load, entry))
+                if len(pending) >= window:
+                    break
+            while pending:
+                yield pending.popleft().result()
+                entry = next(remaining, None)
+                if entry is not None:
+                    pending.append(pool.submit(self._load, entry))
+
+
+class DirectorySource(MatchSource):
+    """Extracted Cricsheet download: one <match_id>.json file per match"""
+
+    def __init__(self, path: str):
+        entries = [(f[:-len('.json')], os.path.join(path, f))
+                   for f in os.listdir(path) if f.endswith('.json')]
+        super().__init__(path, entries)
+
+    def read_bytes(self, location: str) -> bytes:
+        with open(location, 'rb') as f:
+            return f.read()
+
+
+class ZipArchiveSource(MatchSource):
+    """Cricsheet zip archive (e.g. ipl_json.zip), read member by member in memory"""
+
+    def __init__(self, path: str):
+        self.archive = zipfile.ZipFile(path)
+        entries = []
+        for info in self.archive.infolist():
+            basename = os.path.basename(info.filename)
+            if not info.is_dir() and basename.endswith('.json'):
+                entries.append((basename[:-len('.json')], info.filename))
+        super().__init__(path, entries)
+
+    def read_bytes(self, location: str) -> bytes:
+        # ZipFile serializes the raw reads on a shared lock; inflating happens
+        # outside it, so members can be decompressed from several threads.
+        return self.archive.read(location)
+
+    def close(self):
+        self.archive.close()
@@ -0,0 +1,171 @@
+import os
+import shutil
+from typing import Dict, List, Optional
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, select
+
+from . import database
+from .models import Delivery, Innings, Match
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:  # optional: uv sync --extra analytics
+    pa = None
+
+# Tables exported for analytics. Rows of every table are partitioned by the
+# season of their match, so a season filter only maps the files it needs.
+EXPORTED_MODELS = [Match, Innings, Delivery]
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("The columnar export needs pyarrow: install it with `uv sync --extra analytics`")
+
+
+def season_partition(season: Optional[str]) -> str:
+    """Directory name for a season, e.g. '2007/08' -> 'season=2007-08'"""
+    return f"season={(season or 'unknown').replace('/', '-')}"
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _export_columns(model) -> List:
+    # JSON blobs (raw match data, fielder lists) stay in SQLite
+    return [c for c in model.__table__.columns if not isinstance(c.type, JSON)]
+
+
+def export_columnar(output_dir: str, bind=None) -> Dict[str, int]:
+    """Write matches, innings and deliveries as season-partitioned Arrow IPC files
+
+    Layout: <output_dir>/<table>/season=<season>/part-0.arrow. Files are
+    uncompressed Arrow IPC so readers can memory-map them without decoding.
+    The export is built next to output_dir and swapped in at the end, so a
+    reader never sees a half-written export.
+    """
+    require_pyarrow()
+    bind = bind or database.engine  # looked up here, as use_*_database rebinds it
+    staging_dir = output_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    matches = Match.__table__
+    row_counts = {}
+    with bind.connect() as conn:
+        seasons = conn.execute(select(matches.c.season).distinct().order_by(matches.c.season)).scalars().all()
+        for model in EXPORTED_MODELS:
+            table = model.__table__
+            columns = _export_columns(model)
+            # Core select (not raw SQL) so dates and booleans come back typed
+            if model is Match:
+                query = select(*columns)
+            else:
+                columns.append(matches.c.season)
+                query = select(*columns).join_from(table, matches, table.c.match_id == matches.c.id)
+            schema = pa.schema([(c.name, _arrow_type(c)) for c in columns])
+
+            row_counts[table.name] = 0
+            for season in seasons:
+                season_query = query.where(matches.c.season.is_(season) if season is None
+                                           else matches.c.season == season).order_by(table.c.id)
+                rows = conn.execute(season_query).fetchall()
+                if not rows:
+                    continue
+                arrays = [pa.array(values, type=field.type)
+                          for values, field in zip(zip(*rows), schema)]
+
+                partition_dir = os.path.join(staging_dir, table.name, season_partition(season))
+                os.makedirs(partition_dir, exist_ok=True)
+                with pa.OSFile(os.path.join(partition_dir, "part-0.arrow"), 'wb') as sink:
+                    with pa.ipc.new_file(sink, schema) as writer:
+                        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                row_counts[table.name] += len(rows)
+
+    previous_dir = output_dir.rstrip(os.sep) + ".old"
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.rename(output_dir, previous_dir)
+    os.rename(staging_dir, output_dir)
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    return row_counts
+
+
+class ColumnarStore:
+    """Read-only, memory-mapped view of a columnar export
+
+    Partitions are mapped on first use and kept open; the Arrow tables point
+    straight into the mapped files (zero-copy), so the OS page cache is the
+    only copy of the data and it is shared by every process reading it.
+    """
+
+    def __init__(self, path: str):
+        require_pyarrow()
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"No columnar export found at {path}")
+        self.path = path
+        self._partitions: Dict[str, Dict[str, "pa.Table"]] = {}
+
+    def _load_partitions(self, table_name: str) -> Dict[str, "pa.Table"]:
+        if table_name not in self._partitions:
+            partitions = {}
+            table_dir = os.path.join(self.path, table_name)
+            for partition in sorted(os.listdir(table_dir)):
+                source = pa.memory_map(os.path.join(table_dir, partition, "part-0.arrow"), 'r')
+                partitions[partition] = pa.ipc.open_file(source).read_all()
+            self._partitions[table_name] = partitions
+        return self._partitions[table_name]
+
+    def table(self, table_name: str, seasons: Optional[List[str]] = None) -> "pa.Table":
+        """All rows of an exported table, optionally only for some seasons"""
+        partitions = self._load_partitions(table_name)
+        selected = list(partitions.values())
+        if seasons is not None:
+            wanted = {season_partition(season) for season in seasons}
+            selected = [t for name, t in partitions.items() if name in wanted]
+        if not selected:
+            return next(iter(partitions.values())).schema.empty_table()
+        return pa.concat_tables(selected)
+
+    # Aggregates used by QueryEngine; each returns plain Python rows shaped
+    # like the equivalent SQL result.
+
+    def season_scoring(self) -> List[tuple]:
+        """(season, runs, balls, fours, sixes, wickets) over all deliveries"""
+        deliveries = self.table('deliveries')
+        legal = pc.invert(pc.is_in(deliveries['extras_type'], value_set=pa.array(['wide', 'noball'])))
+        legal = pc.fill_null(legal, True)
+        deliveries = deliveries.append_column('legal', pc.cast(legal, pa.int64()))
+        deliveries = deliveries.append_column('four', pc.cast(pc.equal(deliveries['runs_batter'], 4), pa.int64()))
+        deliveries = deliveries.append_column('six', pc.cast(pc.equal(deliveries['runs_batter'], 6), pa.int64()))
+        deliveries = deliveries.append_column('wicket', pc.cast(deliveries['wicket_taken'], pa.int64()))
+        grouped = deliveries.group_by('season').aggregate([
+            ('runs_total', 'sum'), ('legal', 'sum'), ('four', 'sum'), ('six', 'sum'), ('wicket', 'sum')
+        ]).sort_by('season')
+        return list(zip(*(grouped[name].to_pylist() for name in
+                          ('season', 'runs_total_sum', 'legal_sum', 'four_sum', 'six_sum', 'wicket_sum'))))
+
+    def venue_scoring(self, min_innings: int = 10) -> List[tuple]:
+        """(venue, average, highest, innings count) per venue, best average first"""
+        innings = self.table('innings').select(['match_id', 'total_runs'])
+        matches = self.table('matches').select(['id', 'venue'])
+        joined = innings.join(matches, keys='match_id', right_keys='id')
+        joined = joined.filter(pc.is_valid(joined['venue']))
+        grouped = joined.group_by('venue').aggregate([
+            ('total_runs', 'mean'), ('total_runs', 'max'), ('total_runs', 'count')
+        ])
+        grouped = grouped.filter(pc.greater_equal(grouped['total_runs_count'], min_innings))
+        grouped = grouped.sort_by([('total_runs_mean', 'descending')]).slice(0, 15)
+        return list(zip(*(grouped[name].to_pylist() for name in
+                          ('venue', 'total_runs_mean', 'total_runs_max', 'total_runs_count'))))
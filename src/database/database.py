@@ -1,7 +1,13 @@
 import os
-from sqlalchemy import create_engine, text
+import sqlite3
+from typing import Dict, Iterable, Optional
+import threading
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from .models import Base
+from .shards import ShardStore, database_uri
 
 # Database URL - using SQLite for simplicity
 DATABASE_URL = "sqlite:///ipl_cricket.db"
@@ -9,9 +15,24 @@ DATABASE_URL = "sqlite:///ipl_cricket.db"
 # Create engine
 engine = create_engine(DATABASE_URL, echo=False)
 
+@event.listens_for(engine, "connect")
+def _enable_wal(dbapi_connection, connection_record):
+    # WAL lets a running server keep reading (each transaction sees one
+    # committed state) while ingestion writes. The mode is stored in the
+    # file, so read-only connections pick it up too.
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the MCP server: each aiosqlite connection runs its queries on
+# its own thread, so concurrent tool calls can wait on I/O without blocking the
+# event loop. The pool bounds how many calls hit SQLite at once; a few connections
+# are enough, since more only adds threads contending for the GIL.
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///ipl_cricket.db"
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, pool_size=4, max_overflow=4)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
@@ -25,10 +46,260 @@ def get_db():
     finally:
         db.close()
 
-def get_db_session():
-    """Get database session for direct use"""
+def get_db_session(seasons: Optional[Iterable[str]] = None):
+    """Get database session for direct use
+    
+    With a sharded store, `seasons` limits the session to those seasons' shards.
+    """
+    if seasons and _shard_store is not None:
+        return SessionLocal(bind=_pruned_engines(seasons)[0])
     return SessionLocal()
 
+def get_async_db_session(seasons: Optional[Iterable[str]] = None):
+    """Get async database session (use with `async with`); `seasons` as in get_db_session"""
+    if seasons and _shard_store is not None:
+        return AsyncSessionLocal(bind=_pruned_engines(seasons)[1])
+    return AsyncSessionLocal()
+
+def use_readonly_database():
+    """Rebind both session factories to read-only connections of the database file
+    
+    Used by server worker processes, which share one database file and never
+    write to it.
+    """
+    global engine, async_engine
+    
+    readonly_path = "file:ipl_cricket.db?mode=ro&uri=true"
+    engine = create_engine(f"sqlite:///{readonly_path}", echo=False)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{readonly_path}", echo=False, pool_size=4, max_overflow=4
+    )
+    SessionLocal.configure(bind=engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+
+# Connection that keeps the in-memory replica alive (it is freed with its last connection)
+_replica_keeper = None
+_replica_count = 0
+
+# Async engines replaced by a newer replica, disposed by the event loop later
+_retired_async_engines = []
+
+def use_memory_replica() -> Dict[str, float]:
+    """Copy ipl_cricket.db into a shared-cache in-memory database and rebind both session factories to it
+    
+    For the read-only server: after the copy no query touches the file, so
+    there are no disk page reads on a cold cache. Every pooled connection opens
+    the same named memory database (cache=shared) and is set to query_only.
+    Returns the replica's size and the time the copy took.
+    """
+    global engine, async_engine, _replica_keeper, _replica_count
+    import time
+    import aiosqlite
+    
+    # A fresh name per copy: the previous replica keeps serving until the swap
+    _replica_count += 1
+    replica_uri = f"file:ipl_replica_{_replica_count}?mode=memory&cache=shared"
+    started = time.perf_counter()
+    keeper = sqlite3.connect(replica_uri, uri=True, check_same_thread=False)
+    source = sqlite3.connect("file:ipl_cricket.db?mode=ro", uri=True)
+    try:
+        source.backup(keeper)
+    finally:
+        source.close()
+    copy_seconds = time.perf_counter() - started
+    page_count = keeper.execute("PRAGMA page_count").fetchone()[0]
+    page_size = keeper.execute("PRAGMA page_size").fetchone()[0]
+    previous_keeper, previous_engine, previous_async_engine = _replica_keeper, engine, async_engine
+    _replica_keeper = keeper
+    
+    def connect():
+        conn = sqlite3.connect(replica_uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+    
+    async def async_connect():
+        conn = await aiosqlite.connect(replica_uri, uri=True)
+        await conn.execute("PRAGMA query_only = ON")
+        return conn
+    
+    engine = create_engine("sqlite://", creator=connect, poolclass=QueuePool,
+                           pool_size=4, max_overflow=4, echo=False)
+    async_engine = create_async_engine("sqlite+aiosqlite://", async_creator=async_connect,
+                                       poolclass=AsyncAdaptedQueuePool, pool_size=4, max_overflow=4, echo=False)
+    SessionLocal.configure(bind=engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+    
+    if previous_keeper is not None:
+        # Sessions still open on the old copy keep it alive until they close
+        previous_engine.dispose()
+        _retired_async_engines.append(previous_async_engine)
+        previous_keeper.close()
+    
+    return {'bytes': page_count * page_size, 'copy_seconds': copy_seconds}
+
+# Sharded store being served (see use_sharded_database)
+_shard_store = None
+
+# (engine, async engine) pairs of the store, by the files they attach and by
+# the seasons they were asked for (so the catalog is only read once per set)
+_engines_by_attachments = {}
+_engines_by_seasons = {}
+
+def _sharded_engines(store: ShardStore, attachments):
+    """(engine, async engine) whose read-only connections federate the attached files"""
+    import aiosqlite
+    
+    federation = store.federation(attachments)
+    catalog_uri = database_uri(store.catalog_path)
+    
+    def connect():
+        return store.connect(attachments)
+    
+    async def async_connect():
+        conn = await aiosqlite.connect(catalog_uri, uri=True)
+        for sql, params in federation:
+            await conn.execute(sql, params)
+        await conn.execute("PRAGMA query_only = ON")
+        return conn
+    
+    return (
+        create_engine("sqlite://", creator=connect, poolclass=QueuePool,
+                      pool_size=4, max_overflow=4, echo=False),
+        create_async_engine("sqlite+aiosqlite://", async_creator=async_connect,
+                            poolclass=AsyncAdaptedQueuePool, pool_size=4, max_overflow=4, echo=False)
+    )
+
+def use_sharded_database(directory: str):
+    """Rebind both session factories to a sharded store: its catalog, read-only, with every season attached
+    
+    The files to attach are read from the catalog here, so a rebuilt shard
+    or catalog is picked up by calling this again (refresh_database does).
+    """
+    global engine, async_engine, _shard_store
+    
+    store = ShardStore(directory)
+    previous_engines = list(_engines_by_attachments.values()) or [(engine, async_engine)]
+    attachments = store.attachments()
+    engine, async_engine = _sharded_engines(store, attachments)
+    _shard_store = store
+    _engines_by_attachments.clear()
+    _engines_by_seasons.clear()
+    _engines_by_attachments[attachments] = (engine, async_engine)
+    SessionLocal.configure(bind=engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+    
+    # Sessions still open on the previous files keep them until they close
+    for previous_engine, previous_async_engine in previous_engines:
+        previous_engine.dispose()
+        _retired_async_engines.append(previous_async_engine)
+
+def _pruned_engines(seasons: Iterable[str]):
+    """Engines attaching only the shards of some seasons (every season if that isn't possible)"""
+    key = tuple(sorted(set(seasons)))
+    engines = _engines_by_seasons.get(key)
+    if engines is None:
+        attachments = _shard_store.attachments(key)
+        engines = _engines_by_attachments.get(attachments)
+        if engines is None:
+            engines = _engines_by_attachments[attachments] = _sharded_engines(_shard_store, attachments)
+        _engines_by_seasons[key] = engines
+    return engines
+
+def sharded_store() -> Optional[ShardStore]:
+    """The sharded store being served, if any"""
+    return _shard_store
+
+def served_database_path() -> str:
+    """File whose commits publish new data: ipl_cricket.db, or the sharded store's catalog"""
+    return _shard_store.catalog_path if _shard_store is not None else "ipl_cricket.db"
+
+def refresh_database():
+    """Make new sessions see the latest committed data
+    
+    File-backed sessions do already; an in-memory replica is recopied, and a
+    sharded store is re-attached, as its shards may have been replaced.
+    """
+    if _replica_keeper is not None:
+        use_memory_replica()
+    elif _shard_store is not None:
+        use_sharded_database(_shard_store.directory)
+
+async def dispose_retired_async_engines():
+    """Close pooled connections of replicas that have been replaced"""
+    while _retired_async_engines:
+        await _retired_async_engines.pop().dispose()
+
+class GenerationWatcher:
+    """Cheap per-request check for data committed by another process (e.g. --setup)
+    
+    PRAGMA data_version only changes when another connection commits, so the
+    generation row is read only after an ingest commit. Changes are counted
+    from when the watcher is created, and one stays pending until it is
+    acknowledged, so a refresh that fails is tried again.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        path = path or served_database_path()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True,
+                                     check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._data_version = self._current_data_version()
+    
+    def _current_data_version(self) -> int:
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def pending(self) -> Optional[int]:
+        """The data_version if anything was committed since the last acknowledged one, else None"""
+        data_version = self._current_data_version()
+        return data_version if data_version != self._data_version else None
+    
+    def acknowledge(self, data_version: int):
+        """Mark the commits up to data_version as handled"""
+        self._data_version = data_version
+    
+    def published_generation(self) -> int:
+        """Latest generation committed to the watched file (0 before the first publish)"""
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT generation FROM data_generation WHERE id = 1").fetchone()
+            except sqlite3.OperationalError:
+                # Database built before generations were published
+                return 0
+        return row[0] if row else 0
+    
+    def close(self):
+        self._conn.close()
+
+async def dispose_async_engine():
+    """Close pooled aiosqlite connections (their worker threads keep the process alive)"""
+    await dispose_retired_async_engines()
+    for _, sharded_async_engine in _engines_by_attachments.values():
+        await sharded_async_engine.dispose()
+    await async_engine.dispose()
+
+def begin_read_snapshot(session):
+    """Open a read transaction now, so every later query of the session sees one committed state
+    
+    pysqlite only issues BEGIN before writes; plain SELECTs would otherwise
+    each read whatever was committed last.
+    """
+    session.connection().exec_driver_sql("BEGIN")
+
+def current_generation(session) -> int:
+    """Data generation visible to a session (0 before the first publish)
+    
+    Leaves the session's transaction open, so it can be called on a read
+    snapshot (see begin_read_snapshot).
+    """
+    # Databases built before generations were published have no table;
+    # looking for it first avoids an error, whose rollback would end the snapshot
+    if session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_generation'"
+    )).first() is None:
+        return 0
+    return session.execute(text("SELECT generation FROM data_generation WHERE id = 1")).scalar() or 0
+
 def reset_database():
     """Drop and recreate all tables"""
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,81 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Boolean, Float, Integer, JSON
+
+from .models import Delivery, Match, OverSummary
+
+try:
+    import duckdb
+    import pyarrow as pa
+except ImportError:  # optional: uv sync --extra duckdb
+    duckdb = None
+
+# Tables the analytical statements read (see ANALYTICS_STATEMENTS)
+MIRRORED_MODELS = [Match, Delivery, OverSummary]
+
+# :name placeholders (SQLAlchemy text) -> $name (DuckDB)
+_PARAMETER = re.compile(r'(?<![:\w]):(\w+)')
+
+
+def require_duckdb():
+    if duckdb is None:
+        raise RuntimeError("The DuckDB backend needs duckdb and pyarrow: install them with `uv sync --extra duckdb`")
+
+
+def _mirror_type(column):
+    # Values are copied as SQLite stores them (booleans as 0/1, dates as ISO
+    # text), so a statement returns the same Python values from either backend
+    if isinstance(column.type, (Integer, Boolean)):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+class DuckDBMirror:
+    """In-memory DuckDB copy of the tables scan-heavy handlers aggregate over
+
+    Built from one SQLite connection, so it holds exactly the data generation
+    that connection sees; QueryEngine builds a new one with each snapshot.
+    JSON columns are left out. Statements run on a cursor of their own, so
+    calls from different threads don't share DuckDB connection state.
+    """
+
+    def __init__(self, connection):
+        require_duckdb()
+        self.database = duckdb.connect(':memory:')
+        self.row_counts: Dict[str, int] = {}
+        self._statements: Dict[str, str] = {}
+        for model in MIRRORED_MODELS:
+            self._copy_table(connection, model.__table__)
+
+    def _copy_table(self, connection, table):
+        columns = [c for c in table.columns if not isinstance(c.type, JSON)]
+        schema = pa.schema([(c.name, _mirror_type(c)) for c in columns])
+        rows = connection.exec_driver_sql(
+            f"SELECT {', '.join(c.name for c in columns)} FROM {table.name}"
+        ).fetchall()
+        if rows:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+        else:
+            arrays = [pa.array([], type=field.type) for field in schema]
+        self.database.register('mirror_source', pa.Table.from_arrays(arrays, schema=schema))
+        self.database.execute(f"CREATE TABLE {table.name} AS SELECT * FROM mirror_source")
+        self.database.unregister('mirror_source')
+        self.row_counts[table.name] = len(rows)
+
+    def execute(self, sql: str, params: Optional[Dict] = None) -> Tuple[List[str], List[tuple]]:
+        """(column names, rows) of a statement written with :name parameters"""
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self._statements[sql] = _PARAMETER.sub(r'$\1', sql)
+        cursor = self.database.cursor()
+        try:
+            cursor.execute(statement, params or {})
+            return [column[0] for column in cursor.description], cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def close(self):
+        self.database.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Float, Boolean, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Boolean, JSON, ForeignKey, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -119,6 +119,172 @@ class Delivery(Base):
     
     match = relationship("Match", back_populates="deliveries")
 
+class Partnership(Base):
+    __tablename__ = 'partnerships'
+    
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey('matches.id'), index=True)
+    innings = Column(Integer)
+    team = Column(String)
+    wicket = Column(Integer)  # 1 = opening stand, 2 = second wicket, ...
+    
+    # Pair stored in sorted order so (batter1, batter2) identifies the pair
+    batter1 = Column(String)
+    batter2 = Column(String)
+    batter1_runs = Column(Integer, default=0)
+    batter2_runs = Column(Integer, default=0)
+    
+    runs = Column(Integer, default=0)  # Includes extras
+    balls = Column(Integer, default=0)  # Excludes wides
+    unbeaten = Column(Boolean, default=False)
+    
+    __table_args__ = (
+        Index('ix_partnerships_runs', 'runs'),
+        Index('ix_partnerships_pair', 'batter1', 'batter2', 'runs'),
+        Index('ix_partnerships_wicket', 'wicket', 'runs'),
+    )
+
+class OverSummary(Base):
+    __tablename__ = 'over_summary'
+    
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey('matches.id'))
+    innings = Column(Integer)
+    team = Column(String)
+    over_number = Column(Integer)  # 1-based, same numbering as deliveries.over
+    
+    # This over only
+    runs = Column(Integer, default=0)
+    wickets = Column(Integer, default=0)
+    extras = Column(Integer, default=0)
+    legal_balls = Column(Integer, default=0)
+    
+    # Running totals for the innings up to and including this over
+    cumulative_runs = Column(Integer, default=0)
+    cumulative_wickets = Column(Integer, default=0)
+    
+    __table_args__ = (
+        Index('ix_over_summary_match', 'match_id', 'innings', 'over_number', unique=True),
+        Index('ix_over_summary_team_over', 'team', 'over_number'),
+        Index('ix_over_summary_over', 'over_number'),
+    )
+
+class Matchup(Base):
+    __tablename__ = 'matchups'
+    
+    id = Column(Integer, primary_key=True)
+    batter = Column(String)
+    bowler = Column(String)
+    
+    # Career totals for this batter facing this bowler
+    balls = Column(Integer, default=0)  # Excludes wides
+    runs = Column(Integer, default=0)  # Off the bat
+    dismissals = Column(Integer, default=0)  # Credited to the bowler
+    dots = Column(Integer, default=0)
+    fours = Column(Integer, default=0)
+    sixes = Column(Integer, default=0)
+    
+    __table_args__ = (
+        Index('ix_matchups_batter_bowler', 'batter', 'bowler', unique=True),
+        Index('ix_matchups_bowler_batter', 'bowler', 'batter'),
+    )
+
+class Dismissal(Base):
+    __tablename__ = 'dismissals'
+    
+    # One row per wicket; a ball with two run-outs has two rows
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey('matches.id'))
+    innings = Column(Integer)
+    over = Column(Integer)  # Same numbering as deliveries.over and deliveries.ball
+    ball = Column(Integer)
+    
+    bowler = Column(String)
+    batter = Column(String)  # On strike when the wicket fell
+    player_out = Column(String)
+    kind = Column(String)  # caught, bowled, run out, stumped, ...
+    bowler_credited = Column(Boolean, default=False)
+    is_super_over = Column(Boolean, default=False)
+    
+    __table_args__ = (
+        Index('ix_dismissals_match', 'match_id', 'innings', 'over', 'ball'),
+        Index('ix_dismissals_player_out_kind', 'player_out', 'kind', 'is_super_over'),
+        Index('ix_dismissals_bowler_kind', 'bowler', 'kind'),
+        Index('ix_dismissals_kind', 'kind'),
+    )
+
+class DismissalFielder(Base):
+    __tablename__ = 'dismissal_fielders'
+    
+    # Fielders involved in a dismissal: the catcher, the keeper, or every fielder in a run-out
+    id = Column(Integer, primary_key=True)
+    dismissal_id = Column(Integer, ForeignKey('dismissals.id'))
+    fielder = Column(String)
+    fielder_id = Column(String)  # Cricsheet registry ID, when the match lists one
+    substitute = Column(Boolean, default=False)
+    
+    __table_args__ = (
+        Index('ix_dismissal_fielders_dismissal', 'dismissal_id'),
+        Index('ix_dismissal_fielders_fielder', 'fielder', 'dismissal_id'),
+    )
+
+class Fielding(Base):
+    __tablename__ = 'fielding'
+    
+    id = Column(Integer, primary_key=True)
+    fielder = Column(String)
+    
+    # Career totals from dismissal_fielders, super overs excluded
+    catches = Column(Integer, default=0)  # Includes caught and bowled
+    stumpings = Column(Integer, default=0)
+    run_outs = Column(Integer, default=0)  # Every fielder involved is credited
+    
+    __table_args__ = (
+        Index('ix_fielding_fielder', 'fielder', unique=True),
+        Index('ix_fielding_catches', 'catches'),
+        Index('ix_fielding_stumpings', 'stumpings'),
+        Index('ix_fielding_run_outs', 'run_outs'),
+    )
+
+class LeaderboardTotal(Base):
+    __tablename__ = 'leaderboard_totals'
+    
+    # Running totals behind the leaderboards, one row per name per board
+    id = Column(Integer, primary_key=True)
+    metric = Column(String)  # runs, wickets, wins
+    scope_type = Column(String)  # all, season, venue, team
+    scope = Column(String)  # '' for the all-time board
+    name = Column(String)
+    
+    value = Column(Integer, default=0)  # The ranked metric
+    matches = Column(Integer, default=0)
+    balls = Column(Integer, default=0)  # Faced (runs) or bowled (wickets)
+    runs = Column(Integer, default=0)  # Scored (runs) or conceded (wickets)
+    
+    __table_args__ = (
+        Index('ix_leaderboard_totals_name', 'metric', 'scope_type', 'scope', 'name', unique=True),
+    )
+
+class LeaderboardEntry(Base):
+    __tablename__ = 'leaderboards'
+    
+    # Top LEADERBOARD_SIZE rows of every board, kept in rank order during ingestion
+    id = Column(Integer, primary_key=True)
+    metric = Column(String)
+    scope_type = Column(String)
+    scope = Column(String)
+    rank = Column(Integer)  # 1 = best
+    name = Column(String)
+    
+    value = Column(Integer, default=0)
+    matches = Column(Integer, default=0)
+    balls = Column(Integer, default=0)
+    runs = Column(Integer, default=0)
+    
+    __table_args__ = (
+        Index('ix_leaderboards_board', 'metric', 'scope_type', 'scope', 'rank', unique=True),
+    )
+
 class PlayerStats(Base):
     __tablename__ = 'player_stats'
     
@@ -162,4 +328,36 @@ class TeamStats(Base):
     highest_score = Column(Integer, default=0)
     lowest_score = Column(Integer, default=0)
     
-    win_percentage = Column(Float) 
\ No newline at end of file
+    win_percentage = Column(Float)
+
+class IngestCheckpoint(Base):
+    __tablename__ = 'ingest_checkpoints'
+    
+    id = Column(Integer, primary_key=True)
+    source = Column(String, unique=True, index=True)  # Absolute path of directory/archive
+    
+    # Number of (sorted) source entries fully committed, and the last one of them
+    position = Column(Integer, default=0)
+    last_match_id = Column(String)
+    matches_processed = Column(Integer, default=0)
+    updated_at = Column(DateTime)
+
+class DataGeneration(Base):
+    __tablename__ = 'data_generation'
+    
+    # Single row (id=1), bumped in the same transaction as every ingest commit
+    id = Column(Integer, primary_key=True)
+    generation = Column(Integer, default=0)
+    published_at = Column(DateTime)
+
+class Shard(Base):
+    __tablename__ = 'shards'
+    
+    # Catalog of a sharded store (see src/database/shards.py): one row per season file
+    id = Column(Integer, primary_key=True)  # Also numbers the shard's id range, see SHARD_ID_SPAN
+    season = Column(String, unique=True)
+    path = Column(String)  # File name, relative to the catalog
+    matches = Column(Integer, default=0)
+    deliveries = Column(Integer, default=0)
+    built_at = Column(DateTime)
+    archived_at = Column(DateTime)  # built_at of the copy in archive.db, if the season is archived
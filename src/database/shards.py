@@ -0,0 +1,116 @@
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# A sharded store is a directory holding one SQLite file per season, with
+# that season's matches and every table recorded per match, and a catalog
+# database with the list of shards and the tables spanning seasons (teams,
+# players, matchups, fielding, leaderboards, player and team stats).
+# Queries run on a connection to the catalog with shards ATTACHed, where a
+# temp view per shard table (matches, deliveries, ...) unions the attached
+# copies, so every statement written for ipl_cricket.db runs unchanged.
+
+CATALOG_FILE = 'catalog.db'
+
+# One connection can only attach a few databases (SQLITE_MAX_ATTACHED, 10 by
+# default). With more seasons than that, the oldest are also copied into this
+# file, which stands in for them when every season is needed.
+ARCHIVE_FILE = 'archive.db'
+
+# Tables with a row per match or per part of one; everything else is in the catalog
+SHARD_TABLES = ('matches', 'innings', 'deliveries', 'partnerships', 'over_summary', 'dismissals',
+                'dismissal_fielders')
+
+# Shard n numbers the rows of every shard table from n * SHARD_ID_SPAN, so
+# ids stay unique across the union, for joins and for the ORM alike
+SHARD_ID_SPAN = 10 ** 7
+
+
+def shard_file(season: str) -> str:
+    """File name of a season's shard, e.g. '2007/08' -> 'season_2007-08.db'"""
+    return f"season_{re.sub(r'[^0-9A-Za-z]+', '-', season)}.db"
+
+
+def attach_limit() -> int:
+    """Databases a connection can ATTACH in this SQLite build"""
+    conn = sqlite3.connect(':memory:')
+    try:
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    finally:
+        conn.close()
+
+
+def database_uri(path: str, readonly: bool = True) -> str:
+    return Path(path).as_uri() + ('?mode=ro' if readonly else '')
+
+
+class ShardFile(NamedTuple):
+    season: str
+    path: str
+    archived: bool  # also in archive.db
+
+
+class ShardStore:
+    """A sharded store's files, and the statements that federate them on a catalog connection"""
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self.catalog_path = os.path.join(self.directory, CATALOG_FILE)
+        self.archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+
+    def exists(self) -> bool:
+        """True once the catalog lists at least one shard"""
+        if not os.path.exists(self.catalog_path):
+            return False
+        try:
+            return bool(self.shards())
+        except sqlite3.Error:
+            return False
+
+    def shards(self) -> List[ShardFile]:
+        """Every shard in the catalog, oldest season first"""
+        conn = sqlite3.connect(database_uri(self.catalog_path), uri=True)
+        try:
+            rows = conn.execute("SELECT season, path, archived_at FROM shards ORDER BY season").fetchall()
+        finally:
+            conn.close()
+        return [ShardFile(season, os.path.join(self.directory, path), archived_at is not None)
+                for season, path, archived_at in rows]
+
+    def attachments(self, seasons: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        """Files to attach for queries over the given seasons (None: all of them)
+
+        Season-scoped queries only get their seasons' shards. Everything else
+        gets every shard, with archive.db in place of the archived ones.
+        """
+        shards = self.shards()
+        if seasons is not None:
+            wanted = set(seasons)
+            pruned = tuple(shard.path for shard in shards if shard.season in wanted)
+            if pruned and len(pruned) <= attach_limit():
+                return pruned
+        if any(shard.archived for shard in shards):
+            return (self.archive_path,) + tuple(shard.path for shard in shards if not shard.archived)
+        return tuple(shard.path for shard in shards)
+
+    @staticmethod
+    def federation(attachments: Sequence[str]) -> List[Tuple[str, tuple]]:
+        """(sql, parameters) to run on a new catalog connection: ATTACH each file read-only,
+        then a temp view per shard table over all of them"""
+        statements = [(f"ATTACH DATABASE ? AS shard_{i}", (database_uri(path),))
+                      for i, path in enumerate(attachments)]
+        for table in SHARD_TABLES:
+            union = " UNION ALL ".join(f"SELECT * FROM shard_{i}.{table}" for i in range(len(attachments)))
+            statements.append((f"CREATE TEMP VIEW {table} AS {union}", ()))
+        return statements
+
+    def connect(self, attachments: Sequence[str], readonly: bool = True) -> sqlite3.Connection:
+        """Catalog connection with the files attached; read-only connections are also query_only"""
+        conn = sqlite3.connect(database_uri(self.catalog_path, readonly), uri=True, check_same_thread=False)
+        for sql, params in self.federation(attachments):
+            conn.execute(sql, params)
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
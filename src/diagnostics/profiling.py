@@ -0,0 +1,93 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """cProfile (and optionally tracemalloc) around named sections of a run
+
+    Each section writes to output_dir:
+      <name>.pstats       - cProfile data for pstats, snakeviz, gprof2dot or flameprof
+      <name>.txt          - the top-N hotspot summary that is also printed
+      <name>.tracemalloc  - allocation snapshot (memory=True), for tracemalloc.Snapshot.load
+    A disabled profiler runs sections unchanged, so callers needn't branch.
+    """
+
+    def __init__(self, enabled: bool = False, output_dir: str = "profiles",
+                 memory: bool = False, top: int = 20):
+        self.enabled = enabled
+        self.output_dir = output_dir
+        self.memory = memory
+        self.top = top
+
+    @contextmanager
+    def section(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.memory:
+            tracemalloc.start()
+            memory_before = tracemalloc.take_snapshot()
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+
+            lines = [f"Profile of {name}: {elapsed:.2f}s wall clock", ""]
+            lines.extend(self._hotspots(profile))
+            profile.dump_stats(self._path(name, "pstats"))
+
+            if self.memory:
+                memory_after = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                memory_after.dump(self._path(name, "tracemalloc"))
+                lines.extend(["", f"Memory: {current / 2**20:.1f} MiB still allocated, "
+                                  f"{peak / 2**20:.1f} MiB peak"])
+                lines.extend(self._allocations(memory_before, memory_after))
+
+            summary = "\n".join(lines)
+            with open(self._path(name, "txt"), "w") as f:
+                f.write(summary + "\n")
+            print(summary)
+            print(f"\nProfile written to {self._path(name, 'pstats')}")
+
+    def _path(self, name: str, extension: str) -> str:
+        return os.path.join(self.output_dir, f"{name}.{extension}")
+
+    def _hotspots(self, profile: cProfile.Profile):
+        """Top-N functions by cumulative and by own time"""
+        lines = []
+        for sort_key, title in (("cumulative", "Top by cumulative time"),
+                                ("tottime", "Top by own time")):
+            stream = io.StringIO()
+            stats = pstats.Stats(profile, stream=stream)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(self.top)
+            # Drop pstats' preamble; keep the column header and rows
+            table = stream.getvalue().splitlines()
+            header = next((i for i, line in enumerate(table) if "ncalls" in line), 0)
+            lines.append(f"{title}:")
+            lines.extend(line for line in table[header:] if line.strip())
+            lines.append("")
+        return lines
+
+    def _allocations(self, before, after):
+        """Top-N source lines by memory allocated during the section"""
+        # Leave out the profiler's own bookkeeping
+        ignore = [tracemalloc.Filter(False, module.__file__) for module in (cProfile, pstats, tracemalloc)]
+        before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+        lines = ["Top allocations by line:"]
+        for stat in after.compare_to(before, "lineno")[:self.top]:
+            lines.append(f"  {stat}")
+        return lines
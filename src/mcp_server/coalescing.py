@@ -0,0 +1,42 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers with the
+    same key wait for that call and get its result (or its exception)
+
+    The call runs as a task of its own, so a caller that is cancelled (a
+    client going away) stops waiting without cancelling it for the others.
+    Nothing is kept once the call finishes: a later caller starts a new one.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0   # calls actually run
+        self.coalesced = 0    # callers that shared a call already running
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable]):
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = self._in_flight[key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieved so a failure every caller abandoned isn't logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'requests': self.executions + self.coalesced,
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._in_flight),
+        }
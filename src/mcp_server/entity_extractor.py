@@ -0,0 +1,191 @@
+import re
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Common abbreviations used for franchise names
+TEAM_ALIASES = {
+    'csk': ['Chennai Super Kings'],
+    'mi': ['Mumbai Indians'],
+    'rcb': ['Royal Challengers Bangalore', 'Royal Challengers Bengaluru'],
+    'kkr': ['Kolkata Knight Riders'],
+    'srh': ['Sunrisers Hyderabad'],
+    'rr': ['Rajasthan Royals'],
+    'dc': ['Delhi Capitals', 'Delhi Daredevils'],
+    'dd': ['Delhi Daredevils'],
+    'kxip': ['Kings XI Punjab'],
+    'pbks': ['Punjab Kings', 'Kings XI Punjab'],
+    'gl': ['Gujarat Lions'],
+    'gt': ['Gujarat Titans'],
+    'lsg': ['Lucknow Super Giants'],
+    'rps': ['Rising Pune Supergiant', 'Rising Pune Supergiants'],
+    'pwi': ['Pune Warriors'],
+    'ktk': ['Kochi Tuskers Kerala'],
+    'deccan': ['Deccan Chargers'],
+}
+
+# Trailing words that don't identify a ground ("Wankhede Stadium" -> "wankhede")
+VENUE_SUFFIX_WORDS = {'stadium', 'ground', 'cricket', 'association', 'international'}
+
+_NON_WORD = re.compile(r'[^a-z0-9]')
+
+
+def normalize(text_value: str) -> str:
+    """Lowercase and blank out punctuation, keeping character offsets unchanged"""
+    return _NON_WORD.sub(' ', text_value.lower())
+
+
+def _key(text_value: str) -> str:
+    return ' '.join(normalize(text_value).split())
+
+
+class Entity(NamedTuple):
+    """A known name found in a query: what it is, where it is and what it refers to"""
+    kind: str                # 'team', 'player', 'city' or 'venue'
+    start: int
+    end: int
+    surface: str             # the matched text
+    names: Tuple[str, ...]   # canonical values as stored in the database
+
+
+class AhoCorasick:
+    """Multi-keyword matcher: finds every dictionary key in a text in one pass"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Keys ending at each state, as (length, payload) pairs
+        self.output: List[List[Tuple[int, object]]] = [[]]
+
+    def add(self, key: str, payload: object):
+        state = 0
+        for char in key:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(key), payload))
+
+    def build(self):
+        """Compute failure links breadth-first; call once after the last add()"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state].extend(self.output[self.fail[next_state]])
+
+    def iter_matches(self, haystack: str):
+        """Yield (start, end, payload) for every key occurrence, overlapping ones included"""
+        state = 0
+        for position, char in enumerate(haystack):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, payload in self.output[state]:
+                yield position + 1 - length, position + 1, payload
+
+
+class EntityExtractor:
+    """Dictionary of every team, player, city and venue name, compiled into one automaton"""
+
+    def __init__(self, dictionary: Dict[str, Dict[str, Tuple[str, ...]]]):
+        # dictionary: normalized key -> {kind: canonical names}
+        self.size = len(dictionary)
+        self.automaton = AhoCorasick()
+        for key, by_kind in dictionary.items():
+            self.automaton.add(key, by_kind)
+        self.automaton.build()
+
+    @classmethod
+    def from_session(cls, session: Session) -> "EntityExtractor":
+        """Build the dictionary from the teams, players and matches tables"""
+        dictionary: Dict[str, Dict[str, set]] = {}
+
+        def add(key: str, kind: str, name: str):
+            key = _key(key)
+            if key:
+                dictionary.setdefault(key, {}).setdefault(kind, set()).add(name)
+
+        for alias, team_names in TEAM_ALIASES.items():
+            for team_name in team_names:
+                add(alias, 'team', team_name)
+        for (team_name,) in session.execute(text("SELECT name FROM teams")):
+            add(team_name, 'team', team_name)
+
+        for (player_name,) in session.execute(text("SELECT DISTINCT name FROM players")):
+            add(player_name, 'player', player_name)
+            # Registry names use initials ("V Kohli"); people ask for "Kohli"
+            surname = _key(player_name).split(' ')[-1]
+            if len(surname) >= 3:
+                add(surname, 'player', player_name)
+
+        for (city,) in session.execute(text("SELECT DISTINCT city FROM matches WHERE city IS NOT NULL")):
+            add(city, 'city', city)
+
+        for (venue,) in session.execute(text("SELECT DISTINCT venue FROM matches WHERE venue IS NOT NULL")):
+            add(venue, 'venue', venue)
+            ground, _, locality = venue.partition(',')
+            add(ground, 'venue', venue)
+            add(locality, 'venue', venue)
+            words = _key(ground).split(' ')
+            while words and words[-1] in VENUE_SUFFIX_WORDS:
+                words.pop()
+            # Drop leading initials: "M Chinnaswamy" -> "chinnaswamy"
+            while len(words) > 1 and len(words[0]) <= 2:
+                words.pop(0)
+            add(' '.join(words), 'venue', venue)
+
+        return cls({key: {kind: tuple(sorted(names)) for kind, names in by_kind.items()}
+                    for key, by_kind in dictionary.items()})
+
+    def extract(self, query: str) -> List[Entity]:
+        """Find known entities in a query, preferring the longest name at each position
+
+        Offsets refer to the query as given: normalization never changes its length.
+        """
+        haystack = normalize(query)
+        candidates = []
+        for start, end, by_kind in self.automaton.iter_matches(haystack):
+            # Whole words only: "mi" must not match inside "mumbai"
+            if start > 0 and haystack[start - 1] != ' ':
+                continue
+            if end < len(haystack) and haystack[end] != ' ':
+                continue
+            candidates.append((start, end, by_kind))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda c: (c[0], -c[1]))
+        entities = []
+        covered_until = 0
+        for start, end, by_kind in candidates:
+            if start < covered_until:
+                continue
+            covered_until = end
+            for kind, names in by_kind.items():
+                entities.append(Entity(kind, start, end, query[start:end], names))
+        return entities
+
+
+def entities_in_span(entities: List[Entity], kind: str, start: int, end: int) -> List[str]:
+    """Canonical names of the given kind found between two query offsets"""
+    names = []
+    for entity in entities:
+        if entity.kind == kind and entity.start >= start and entity.end <= end:
+            names.extend(name for name in entity.names if name not in names)
+    return names
+
+
+def first_entity(entities: List[Entity], kind: str) -> Optional[Entity]:
+    """The first entity of a kind in the query, if any"""
+    return next((entity for entity in entities if entity.kind == kind), None)
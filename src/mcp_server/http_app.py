@@ -0,0 +1,63 @@
+import os
+from contextlib import asynccontextmanager
+
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from ..database.database import (
+    use_readonly_database, use_memory_replica, use_sharded_database, dispose_async_engine
+)
+from .server import IPLMCPServer, PREWARM_QUERIES
+
+
+class MCPEndpoint:
+    """ASGI endpoint handing every /mcp request to the session manager"""
+
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+def create_app() -> Starlette:
+    """ASGI app factory, called once in every HTTP worker process
+    
+    Sessions are stateless: each JSON-RPC request gets a fresh transport, so
+    any worker can answer any request without sticky routing. Responses are
+    streamed back as server-sent events.
+    """
+    if os.environ.get("IPL_IN_MEMORY"):
+        # Each worker holds its own copy
+        use_memory_replica()
+    elif os.environ.get("IPL_SHARD_DIR"):
+        use_sharded_database(os.environ["IPL_SHARD_DIR"])
+    else:
+        use_readonly_database()
+    # Worker processes can't take arguments, so main.py passes options via the environment
+    ipl_server = IPLMCPServer(
+        columnar_dir=os.environ.get("IPL_COLUMNAR_DIR") or None,
+        analytics_backend=os.environ.get("IPL_ANALYTICS_BACKEND") or 'sqlite',
+        query_log=os.environ.get("IPL_QUERY_LOG") or None,
+        prewarm=int(os.environ.get("IPL_PREWARM") or PREWARM_QUERIES)
+    )
+    session_manager = StreamableHTTPSessionManager(app=ipl_server.server, stateless=True)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            # Each worker warms its own connections and caches
+            ipl_server.start_background_tasks()
+            try:
+                yield
+            finally:
+                try:
+                    await ipl_server.stop_background_tasks()
+                finally:
+                    await dispose_async_engine()
+
+    return Starlette(
+        routes=[Route("/mcp", endpoint=MCPEndpoint(session_manager))],
+        lifespan=lifespan
+    )
@@ -0,0 +1,301 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+
+from ..data_processing.leaderboards import LEADERBOARD_SIZE, season_names, venue_scope
+from .entity_extractor import Entity
+from .statements import STATEMENTS
+
+# Questions the compiler answers: "most sixes at Wankhede in 2019", "how many
+# wickets did MI take in the powerplay". The metric word has to be there.
+_LEADERS = re.compile(r'\b(?:most|top|leading|highest|best)\b')
+_TOTAL = re.compile(r'\bhow many\b|\btotal\b')
+_METRIC = re.compile(
+    r'\b(?P<sixes>sixes|6s)\b|\b(?P<fours>fours|4s)\b'
+    r'|\b(?P<wickets>wicket[\s-]?takers?|wickets?(?![\s-]?keep)|bowlers)\b'
+    r'|\b(?P<runs>run[\s-]?scorers?|runs?(?![\s-]?(?:outs?|rate))|batters|batsmen)\b'
+)
+# Questions about something other than a sum per player or overall
+_UNSUPPORTED = re.compile(
+    r'\b(?:conced\w*|economy|average|strike\s+rate|partnerships?|per\s+over'
+    r'|in\s+an?\s+(?:over|innings|match))\b'
+)
+_SEASON = re.compile(r'\b((?:19|20)\d{2})(?:/(\d{2}))?\b')
+_FIRST_INNINGS = re.compile(r'\b(?:first|1st)\s+innings\b|\bbatting\s+first\b')
+_SECOND_INNINGS = re.compile(r'\b(?:second|2nd)\s+innings\b|\bbatting\s+second\b|\bchas(?:e|es|ing)\b')
+_OVER_RANGE = re.compile(r'\bovers?\s+(\d{1,2})\s*(?:-|to)\s*(\d{1,2})\b')
+_OPPONENT_WORD = re.compile(r'\b(?:against|vs\.?|versus)\s+(?:the\s+)?$')
+
+# Named phases of a T20 innings, as (first over, last over)
+PHASES = {
+    'powerplay': (1, 6),
+    'middle overs': (7, 15),
+    'death overs': (16, 20),
+}
+_PHASE = re.compile(r'\b(power\s?play|middle\s+overs|death(?:\s+overs)?)\b')
+
+
+class Metric(NamedTuple):
+    """What a metric adds up per ball, and whose ball it counts it for"""
+    role: str   # 'batter' or 'bowler': the player a ball is credited to
+    value: str  # SQL expression over deliveries d
+
+
+# Same definitions as the leaderboards: super overs never count, wickets are
+# those credited to the bowler (every wicket of a ball, from dismissals)
+METRICS = {
+    'runs': Metric('batter', "d.runs_batter"),
+    'sixes': Metric('batter', "CASE WHEN d.runs_batter = 6 THEN 1 ELSE 0 END"),
+    'fours': Metric('batter', "CASE WHEN d.runs_batter = 4 THEN 1 ELSE 0 END"),
+    'wickets': Metric('bowler', """CASE WHEN d.wicket_taken = 1 THEN (
+                SELECT COUNT(*) FROM dismissals w
+                WHERE w.match_id = d.match_id AND w.innings = d.innings
+                AND w.over = d.over AND w.ball = d.ball AND w.bowler_credited = 1
+            ) ELSE 0 END"""),
+}
+
+# (balls, runs) columns reported next to the metric, per role
+ROLE_TOTALS = {
+    'batter': ("CASE WHEN d.extras_type = 'wide' THEN 0 ELSE 1 END", "d.runs_batter"),
+    # Runs conceded leave out byes and leg byes (a no-ball's byes still count)
+    'bowler': ("CASE WHEN d.extras_type IN ('wide', 'noball') THEN 0 ELSE 1 END",
+               "d.runs_total - CASE WHEN d.extras_type IN ('bye', 'legbye') THEN d.runs_extras ELSE 0 END"),
+}
+
+# Team playing the ball, for the batter's and the bowler's side
+_BATTING_TEAM = "i.team"
+_BOWLING_TEAM = "CASE WHEN i.team = m.team1 THEN m.team2 ELSE m.team1 END"
+
+# Filter field -> WHERE clause; each binds one parameter named after the field
+FILTER_CLAUSES = {
+    'season': "m.season IN :season",
+    'venue': "m.venue IN :venue",
+    'city': "m.city IN :city",
+    'innings': "d.innings = :innings",
+    'phase': "d.over BETWEEN :first_over AND :last_over",
+}
+# Order filters take in a spec: its shape and how its description reads
+FILTER_FIELDS = ('season', 'team', 'opponent', 'venue', 'city', 'innings', 'phase')
+# Fields whose parameter is a list
+_EXPANDING = ('season', 'venue', 'city', 'team', 'opponent')
+
+
+class Filter(NamedTuple):
+    field: str                # 'season', 'team', 'opponent', 'venue', 'city', 'innings' or 'phase'
+    values: Tuple             # names for the list fields, (n,) for innings, (first, last) for phase
+    label: str                # how the filter reads in a description
+
+
+class QuerySpec(NamedTuple):
+    """A parsed question: what to compute, over which balls"""
+    intent: str               # 'leaders' (top players) or 'total' (one number)
+    metric: str               # key of METRICS
+    filters: Tuple[Filter, ...]
+
+    @property
+    def shape(self) -> Tuple:
+        """What the SQL depends on; the values only go into parameters"""
+        return (self.intent, self.metric, tuple(f.field for f in self.filters))
+
+    def description(self) -> str:
+        labels = ', '.join(f.label for f in self.filters)
+        prefix = 'Most' if self.intent == 'leaders' else 'Total'
+        return f"{prefix} {self.metric}" + (f" ({labels})" if labels else "")
+
+
+class QueryCompiler:
+    """Parses filtered leaderboard and total questions into a QuerySpec and
+    compiles each one to a single parameterized statement
+
+    Statements are cached per query shape (intent, metric, filter fields),
+    so a new combination of values reuses the TextClause (and with it
+    SQLAlchemy's compiled form and SQLite's prepared statement) of any
+    earlier question shaped the same way.
+    """
+
+    def __init__(self):
+        self.plans: Dict[Tuple, TextClause] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, query_lower: str, entities: List[Entity]) -> Optional[QuerySpec]:
+        """The query's QuerySpec, or None when it isn't a question the compiler can answer in full"""
+        metric_match = _METRIC.search(query_lower)
+        if metric_match is None or _UNSUPPORTED.search(query_lower):
+            return None
+        if _LEADERS.search(query_lower):
+            intent = 'leaders'
+        elif _TOTAL.search(query_lower):
+            intent = 'total'
+        else:
+            return None
+        # A named player would be a filter the compiler can't apply
+        if any(entity.kind == 'player' and not self._shadowed(entity, entities) for entity in entities):
+            return None
+
+        filters = []
+        seasons = []
+        for year, suffix in _SEASON.findall(query_lower):
+            seasons.extend(season_names(f"{year}/{suffix}" if suffix else year))
+        if seasons:
+            filters.append(Filter('season', tuple(dict.fromkeys(seasons)),
+                                  '/'.join(m.group(0) for m in _SEASON.finditer(query_lower))))
+
+        teams, opponents, venues, cities = {}, {}, {}, {}
+        for start, end, by_kind in self._spans(entities):
+            if 'team' in by_kind:
+                target = opponents if _OPPONENT_WORD.search(query_lower[:start]) else teams
+                target.update(dict.fromkeys(by_kind['team']))
+            elif 'venue' in by_kind and ('city' not in by_kind or re.search(r'\bat\s+(?:the\s+)?$', query_lower[:start])):
+                venues.update(dict.fromkeys(by_kind['venue']))
+            elif 'city' in by_kind:
+                cities.update(dict.fromkeys(by_kind['city']))
+        for field, names, label in (('team', teams, ' / '.join(teams)),
+                                    ('opponent', opponents, 'vs ' + ' / '.join(opponents)),
+                                    ('venue', venues, 'at ' + min(venues, key=len, default='')),
+                                    ('city', cities, 'in ' + ' / '.join(cities))):
+            if names:
+                filters.append(Filter(field, tuple(names), label))
+
+        if _FIRST_INNINGS.search(query_lower):
+            filters.append(Filter('innings', (1,), '1st innings'))
+        elif _SECOND_INNINGS.search(query_lower):
+            filters.append(Filter('innings', (2,), '2nd innings'))
+
+        over_range = _OVER_RANGE.search(query_lower)
+        phase = _PHASE.search(query_lower)
+        if over_range:
+            first, last = sorted((int(over_range.group(1)), int(over_range.group(2))))
+            filters.append(Filter('phase', (first, last), f"overs {first}-{last}"))
+        elif phase:
+            name = 'powerplay' if phase.group(1).startswith('power') else (
+                'middle overs' if phase.group(1).startswith('middle') else 'death overs')
+            first, last = PHASES[name]
+            filters.append(Filter('phase', (first, last), f"{name} ({first}-{last})"))
+
+        metric = next(name for name, value in metric_match.groupdict().items() if value)
+        # Unfiltered runs and wickets leaders are the all-time boards, served by their own handlers
+        if not filters and (intent == 'total' or metric in ('runs', 'wickets')):
+            return None
+        return QuerySpec(intent, metric, tuple(sorted(filters, key=lambda f: FILTER_FIELDS.index(f.field))))
+
+    @staticmethod
+    def _spans(entities: List[Entity]):
+        """(start, end, {kind: names}) per matched span, in query order"""
+        spans: Dict[Tuple[int, int], Dict[str, Tuple[str, ...]]] = {}
+        for entity in entities:
+            spans.setdefault((entity.start, entity.end), {})[entity.kind] = entity.names
+        return [(start, end, by_kind) for (start, end), by_kind in spans.items()]
+
+    @staticmethod
+    def _shadowed(player: Entity, entities: List[Entity]) -> bool:
+        # "Chennai" can be a surname as well as a city: a span that is also a
+        # team, venue or city is read as that
+        return any(e.kind != 'player' and (e.start, e.end) == (player.start, player.end) for e in entities)
+
+    def compile(self, spec: QuerySpec) -> Tuple[TextClause, Dict]:
+        """(statement, parameters) for a spec; the statement is shared by every spec of its shape"""
+        source = self._source(spec)
+        key = spec.shape + (source,)
+        statement = self.plans.get(key)
+        if statement is None:
+            self.misses += 1
+            statement = self.plans[key] = self._build(spec, source)
+        else:
+            self.hits += 1
+        return statement, self._parameters(spec, source)
+
+    @staticmethod
+    def _source(spec: QuerySpec) -> str:
+        """'board' when a single leaderboard already holds the answer, else 'deliveries'"""
+        if spec.intent == 'leaders' and spec.metric in ('runs', 'wickets') and len(spec.filters) == 1:
+            only = spec.filters[0]
+            if only.field == 'season' and len({v[-2:] for v in only.values}) == 1:
+                # One year: only one of its possible names ('2008', '2007/08') is ever stored
+                return 'board'
+            if only.field == 'venue' and len({venue_scope(v) for v in only.values}) == 1:
+                return 'board'
+            if only.field == 'team' and len(only.values) == 1:
+                return 'board'
+        return 'deliveries'
+
+    def _build(self, spec: QuerySpec, source: str) -> TextClause:
+        if source == 'board':
+            return STATEMENTS['leaderboard']
+
+        metric = METRICS[spec.metric]
+        balls, runs = ROLE_TOTALS[metric.role]
+        fields = [f.field for f in spec.filters]
+        team_columns = {'team': _BATTING_TEAM, 'opponent': _BOWLING_TEAM}
+        if metric.role == 'bowler':
+            team_columns = {'team': _BOWLING_TEAM, 'opponent': _BATTING_TEAM}
+
+        # Super overs (innings 3 and up) never count
+        where = ["d.innings <= 2"]
+        for field in fields:
+            if field in team_columns:
+                where.append(f"{team_columns[field]} IN :{field}")
+            else:
+                where.append(FILTER_CLAUSES[field])
+
+        # With a filter on matches, start from the few matches it keeps and
+        # reach their balls through ix_deliveries_match_id; CROSS JOIN fixes
+        # that order in SQLite
+        teams = {'team', 'opponent'} & set(fields)
+        if {'season', 'venue', 'city'} & set(fields):
+            joins = "FROM matches m"
+            if teams:
+                joins += "\n        CROSS JOIN innings i ON i.match_id = m.id AND i.innings_number <= 2"
+                joins += "\n        CROSS JOIN deliveries d ON d.match_id = i.match_id AND d.innings = i.innings_number"
+            else:
+                joins += "\n        CROSS JOIN deliveries d ON d.match_id = m.id"
+        else:
+            joins = "FROM deliveries d\n        JOIN matches m ON m.id = d.match_id"
+            if teams:
+                joins += "\n        JOIN innings i ON i.match_id = d.match_id AND i.innings_number = d.innings"
+
+        columns = (f"SUM({metric.value}) AS {spec.metric}, COUNT(DISTINCT d.match_id) AS matches,\n"
+                   f"               SUM({balls}) AS balls, SUM({runs}) AS runs")
+        where_sql = "\n        AND ".join(where)
+        # In GROUP BY, the unary + keeps SQLite from walking ix_deliveries_batter/bowler
+        # just to skip a sort, which would visit every ball before filtering
+        if spec.intent == 'total':
+            sql = f"""
+        SELECT {columns}
+        {joins}
+        WHERE {where_sql}
+    """
+        else:
+            sql = f"""
+        SELECT d.{metric.role} AS name, {columns}
+        {joins}
+        WHERE {where_sql}
+        GROUP BY +d.{metric.role}
+        HAVING {spec.metric} > 0
+        ORDER BY {spec.metric} DESC, name
+        LIMIT {LEADERBOARD_SIZE}
+    """
+        statement = text(sql)
+        expanding = [bindparam(field, expanding=True) for field in fields if field in _EXPANDING]
+        return statement.bindparams(*expanding) if expanding else statement
+
+    @staticmethod
+    def _parameters(spec: QuerySpec, source: str) -> Dict:
+        if source == 'board':
+            only = spec.filters[0]
+            scopes = list(only.values)
+            if only.field == 'venue':
+                scopes = sorted({venue_scope(v) for v in only.values})
+            return {'metric': spec.metric, 'scope_type': only.field, 'scopes': scopes}
+
+        params = {}
+        for f in spec.filters:
+            if f.field == 'innings':
+                params['innings'] = f.values[0]
+            elif f.field == 'phase':
+                params['first_over'], params['last_over'] = f.values
+            else:
+                params[f.field] = list(f.values)
+        return params
@@ -1,14 +1,63 @@
+import asyncio
 import re
-from typing import Dict, List, Any, Optional, Tuple
+import sys
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text, desc, asc, func
 
-from ..database.database import get_db_session
+from ..database.database import (
+    get_db_session, get_async_db_session, GenerationWatcher, begin_read_snapshot, current_generation,
+    refresh_database, dispose_retired_async_engines, sharded_store
+)
 from ..database.models import *
+from ..database.columnar import ColumnarStore
+from ..database.duckdb_mirror import DuckDBMirror
+from ..data_processing.leaderboards import LEADERBOARD_SIZE, venue_scope
+from .statements import ANALYTICS_STATEMENTS, STATEMENTS
+from .query_compiler import QueryCompiler, QuerySpec, season_names
+from .entity_extractor import Entity, EntityExtractor, entities_in_span, first_entity
+from .results import OUTPUT_FORMATS, QueryResult, dumps, format_json
+
+# Session of the async call currently running handlers (see QueryEngine.aprocess_query)
+_call_session: ContextVar[Optional[Session]] = ContextVar('query_engine_call_session', default=None)
+
+# (query, entities) of the process_query call currently running handlers
+_call_entities: ContextVar[Optional[Tuple[str, List[Entity]]]] = ContextVar('query_engine_call_entities', default=None)
+
+# Where ANALYTICS_STATEMENTS run; 'sqlite' runs them like every other statement
+ANALYTICS_BACKENDS = ('sqlite', 'duckdb')
+
+class DataSnapshot(NamedTuple):
+    """One data generation as served: a session pinned to it, the entities it contains
+    and, with the DuckDB backend, a mirror of its scanned tables"""
+    generation: int
+    session: Session
+    entities: EntityExtractor
+    analytics: Optional[DuckDBMirror]
+
 
 class QueryEngine:
-    def __init__(self):
-        self.session = get_db_session()
+    def __init__(self, columnar_dir: Optional[str] = None, analytics_backend: str = 'sqlite'):
+        if analytics_backend not in ANALYTICS_BACKENDS:
+            raise ValueError(f"Unknown analytics backend '{analytics_backend}', "
+                             f"expected one of {', '.join(ANALYTICS_BACKENDS)}")
+        self.analytics_backend = analytics_backend
+        
+        # Created before the first snapshot, so any later commit triggers a refresh
+        self.generation_watcher = GenerationWatcher()
+        self._refresh_lock = threading.Lock()
+        self._refresh_task = None
+        self._snapshot = self._open_snapshot()
+        
+        # Optional memory-mapped Arrow export (see export_columnar) that
+        # scan-heavy aggregates read instead of SQLite
+        self.columnar = ColumnarStore(columnar_dir) if columnar_dir else None
+        
+        # Filtered leaderboards and totals ("most runs in 2010 at Chepauk for CSK"),
+        # compiled from their filters rather than matched by a pattern
+        self.compiler = QueryCompiler()
         
         # Pre-defined query patterns and their SQL translations
         self.query_patterns = [
@@ -24,6 +73,51 @@ class QueryEngine:
                 'description': 'Count total matches'
             },
             
+            # Fielding and dismissal queries (before "wicket" leaderboards catch "wicket keepers")
+            {
+                'pattern': r'most\s+catches|(?:best|top|leading)\s+(?:fielders?|catchers?)',
+                'handler': self.most_catches,
+                'description': 'Most catches'
+            },
+            {
+                'pattern': r'most\s+stumpings|(?:best|top|leading)\s+(?:wicket[\s-]?)?keepers?',
+                'handler': self.most_stumpings,
+                'description': 'Most stumpings'
+            },
+            {
+                'pattern': r'most\s+run[\s-]?outs|(?:best|top)\s+run[\s-]?out',
+                'handler': self.most_run_outs,
+                'description': 'Most run-outs effected'
+            },
+            {
+                'pattern': r'(.*)\s+fielding.*(?:stats|record)|(.*)\s+(?:stats|record).*fielding|show.*(.*)\s+fielding',
+                'handler': self.get_player_fielding_stats,
+                'description': 'Player fielding statistics'
+            },
+            {
+                'pattern': r'how (?:was|is|does|did|has) (.+?) (?:usually |mostly |been |get |got |gets )?(?:out|dismissed)\b',
+                'handler': self.dismissal_breakdown,
+                'description': 'How a batter gets out'
+            },
+            
+            # Leaderboards for a season, venue or team (before the all-time ones)
+            {
+                'pattern': r'^(?=.*\b(?:most|top|leading)\b)(.*\b(?:runs?|run[\s-]?scorers?|wickets?|wicket[\s-]?takers?|wins|won)\b.*?)\s+(?:in|during)\s+(?:the\s+)?(?:ipl\s+)?(?:season\s+)?(\d{4}(?:/\d{2,4})?)\b',
+                'handler': self.season_leaderboard,
+                'description': 'Season leaderboard'
+            },
+            {
+                'pattern': r'^(?=.*\b(?:most|top|leading)\b)(.*\b(?:runs?|run[\s-]?scorers?|wickets?|wicket[\s-]?takers?|wins|won)\b.*?)\s+(?:at|in)\b',
+                'entity': 'venue',
+                'handler': self.venue_leaderboard,
+                'description': 'Venue leaderboard'
+            },
+            {
+                'pattern': r'^(?=.*\b(?:most|top|leading)\b)(.*\b(?:runs?|run[\s-]?scorers?|wickets?|wicket[\s-]?takers?)\b.*?)\s+for\s+(?:the\s+)?(.+?)[?.!]*$',
+                'handler': self.team_leaderboard,
+                'description': 'Team leaderboard'
+            },
+            
             # Team performance queries
             {
                 'pattern': r'which team.*won.*most|team.*most.*wins|most.*wins.*team',
@@ -36,6 +130,28 @@ class QueryEngine:
                 'description': 'Team statistics'
             },
             
+            # Batter vs bowler matchups (before the generic "best bowler" pattern)
+            {
+                'pattern': r'how (?:does|did|has) (.+?) (?:fare|fared|do|done|perform|performed|bat|batted) (?:against|vs\.?|versus) (.+?)[?.!]*$',
+                'handler': self.head_to_head,
+                'description': 'Batter vs bowler head to head'
+            },
+            {
+                'pattern': r'(?:head[\s-]to[\s-]head|h2h|matchup)\s*(?:of|for|between)?:?\s+(.+?)\s+(?:vs\.?|versus|against|and)\s+(.+?)[?.!]*$',
+                'handler': self.head_to_head,
+                'description': 'Batter vs bowler head to head'
+            },
+            {
+                'pattern': r'(?:toughest|hardest|best)\s+bowlers?\s+(?:for|against|to)\s+(.+?)[?.!]*$|who\s+(?:dismissed|dismisses|got)\s+(.+?)\s+(?:out\s+)?(?:the\s+)?most',
+                'handler': self.toughest_bowlers,
+                'description': 'Toughest bowlers for a batter'
+            },
+            {
+                'pattern': r'(?:best|top|most successful)\s+batters?\s+(?:against|vs\.?|versus)\s+(.+?)[?.!]*$',
+                'handler': self.best_batters_against,
+                'description': 'Most successful batters against a bowler'
+            },
+            
             # Player performance queries  
             {
                 'pattern': r'who.*scored.*most.*runs|most.*runs.*scored|highest.*run.*scorer',
@@ -69,15 +185,58 @@ class QueryEngine:
                 'handler': self.lowest_total_score,
                 'description': 'Lowest team total'
             },
+            # Entity patterns only apply when the query names a known venue/city;
+            # the handler gets the canonical names instead of regex groups
+            {
+                'pattern': r'match(?:es)?\b.*\b(?:at|in)\b',
+                'entity': 'venue',
+                'handler': self.matches_by_venue,
+                'description': 'Matches by venue'
+            },
             {
-                'pattern': r'matches.*in.*(mumbai|delhi|bangalore|chennai|kolkata|hyderabad|pune|jaipur|mohali)',
+                'pattern': r'match(?:es)?\b.*\b(?:in|at)\b',
+                'entity': 'city',
                 'handler': self.matches_by_city,
                 'description': 'Matches by city'
             },
+            
+            # Partnership queries
             {
-                'pattern': r'matches.*at.*(.*stadium|.*ground)',
-                'handler': self.matches_by_venue,
-                'description': 'Matches by venue'
+                'pattern': r'partnerships?\s+(?:between|of|for)\s+(.+?)\s+and\s+(.+?)[?.!]*$',
+                'handler': self.partnerships_by_pair,
+                'description': 'Partnerships between two batters'
+            },
+            {
+                'pattern': r'opening\s+(?:partnership|stand)',
+                'handler': self.opening_partnerships,
+                'description': 'Highest opening partnerships'
+            },
+            {
+                'pattern': r'(\d+)(?:st|nd|rd|th)?\s+wicket\s+(?:partnership|stand)',
+                'handler': self.partnerships_by_wicket,
+                'description': 'Highest partnerships for a wicket'
+            },
+            {
+                'pattern': r'highest.*partnership|best.*partnership|top.*partnership|partnership.*record|biggest.*partnership',
+                'handler': self.top_partnerships,
+                'description': 'Highest partnerships'
+            },
+            
+            # Over-by-over progression queries
+            {
+                'pattern': r"(?:what\s+was\s+|what's\s+|show\s+)?(.+?)(?:'s)?\s+score\s+(?:after|at)\s+(\d+)\s+overs?",
+                'handler': self.score_at_over,
+                'description': 'Score after N overs'
+            },
+            {
+                'pattern': r'(?:run\s*rate|scoring).*overs?\s+(\d+)\s*(?:-|to)\s*(\d+)',
+                'handler': self.phase_run_rate,
+                'description': 'Run rate by team for an over range'
+            },
+            {
+                'pattern': r'(?:worm|progression|over by over).*match\s+(\d+)',
+                'handler': self.match_worm,
+                'description': 'Over-by-over score progression'
             },
             
             # Advanced analytics
@@ -91,6 +250,11 @@ class QueryEngine:
                 'handler': self.venue_highest_scores,
                 'description': 'Venues with highest scores'
             },
+            {
+                'pattern': r'(?:runs|scoring|boundaries|run rate).*(?:by|per|each|every)\s+season|season.*(?:scoring|run rate|boundaries)',
+                'handler': self.season_scoring,
+                'description': 'Scoring by season'
+            },
             {
                 'pattern': r'all.*centuries|centuries.*scored|100.*scores',
                 'handler': self.all_centuries,
@@ -108,32 +272,205 @@ class QueryEngine:
             }
         ]
     
-    def process_query(self, query: str) -> str:
+    @property
+    def session(self) -> Session:
+        """Session used by handlers: the current async call's own session, else the shared one"""
+        call_session = _call_session.get()
+        return call_session if call_session is not None else self._snapshot.session
+    
+    @property
+    def entities(self) -> EntityExtractor:
+        """Every team, player, city and venue name, matched in one pass per query"""
+        return self._snapshot.entities
+    
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+    
+    def _open_snapshot(self) -> DataSnapshot:
+        session = get_db_session()
+        # In WAL mode the session keeps seeing exactly this committed state
+        # until it is closed, however much is ingested meanwhile
+        begin_read_snapshot(session)
+        generation = current_generation(session)
+        analytics = DuckDBMirror(session.connection()) if self.analytics_backend == 'duckdb' else None
+        return DataSnapshot(generation, session, EntityExtractor.from_session(session), analytics)
+    
+    def refresh(self) -> bool:
+        """Switch to the latest published data generation, if there is a newer one
+        
+        Cheap when nothing changed (one PRAGMA). Otherwise the new snapshot is
+        built completely, including its entity dictionary and DuckDB mirror,
+        while the current one keeps serving, and then swapped in with a single
+        assignment. The previous mirror is left to the garbage collector, as a
+        call may still be reading it.
+        
+        The session factories are only rebound once a newer generation has
+        been published, and the commit only counts as seen after the swap, so
+        a rebuild that fails is tried again by the next call. This blocks
+        while rebuilding; the server uses refresh_in_background instead.
+        """
+        with self._refresh_lock:
+            data_version = self.generation_watcher.pending()
+            if data_version is None:
+                return False
+            if self.generation_watcher.published_generation() <= self._snapshot.generation:
+                # A commit that didn't publish a new generation
+                self.generation_watcher.acknowledge(data_version)
+                return False
+            refresh_database()
+            snapshot = self._open_snapshot()
+            previous, self._snapshot = self._snapshot, snapshot
+            self.generation_watcher.acknowledge(data_version)
+        previous.session.close()
+        return True
+    
+    def refresh_in_background(self) -> Optional[asyncio.Task]:
+        """Run refresh on a worker thread if anything was committed; returns the running refresh, if any
+        
+        The event loop keeps answering from the current snapshot until the
+        new one is swapped in.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            if self.generation_watcher.pending() is None:
+                return None
+            self._refresh_task = asyncio.ensure_future(self._refresh_off_loop())
+        return self._refresh_task
+    
+    async def _refresh_off_loop(self) -> bool:
+        try:
+            refreshed = await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            # Still pending, so a later call tries again; stderr, as stdout may carry the protocol
+            print(f"Error refreshing the data snapshot: {e}", file=sys.stderr)
+            return False
+        if refreshed:
+            await dispose_retired_async_engines()
+        return refreshed
+    
+    async def aprocess_query(self, query: str, output_format: str = 'text') -> str:
+        """Awaitable process_query for the asyncio server
+        
+        Each call gets its own AsyncSession on a pooled aiosqlite connection. The
+        (synchronous) handlers run through run_sync, where every statement yields
+        to the event loop while SQLite works, so concurrent calls interleave.
+        Newly published data is loaded in the background (see refresh_in_background).
+        """
+        self.refresh_in_background()
+        async with get_async_db_session(self._shard_seasons(query)) as session:
+            return await session.run_sync(self._process_query_in_session, query, output_format)
+    
+    def _process_query_in_session(self, session: Session, query: str, output_format: str) -> str:
+        begin_read_snapshot(session)
+        token = _call_session.set(session)
+        try:
+            return self.process_query(query, output_format)
+        finally:
+            _call_session.reset(token)
+    
+    def _shard_seasons(self, query: str) -> Optional[Tuple[str, ...]]:
+        """Seasons a compiled question is filtered to, when serving a sharded store
+        
+        Its session then attaches just those seasons' shards: SQLite doesn't
+        push a join into the union of every shard, but flattens a single one.
+        """
+        if sharded_store() is None:
+            return None
+        query_lower = query.lower().strip()
+        spec = self.compiler.parse(query_lower, self.entities.extract(query_lower))
+        if spec is None:
+            return None
+        return next((f.values for f in spec.filters if f.field == 'season'), None)
+    
+    def process_query(self, query: str, output_format: str = 'text') -> str:
         """Process natural language query and return formatted results"""
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {', '.join(OUTPUT_FORMATS)}")
+        if _call_session.get() is None:
+            self.refresh()
+            seasons = self._shard_seasons(query)
+            if seasons:
+                session = get_db_session(seasons)
+                try:
+                    return self._process_query_in_session(session, query, output_format)
+                finally:
+                    session.close()
         query_lower = query.lower().strip()
+        entities = self.entities.extract(query_lower)
+        token = _call_entities.set((query_lower, entities))
+        try:
+            return self._dispatch(query, query_lower, entities, output_format)
+        finally:
+            _call_entities.reset(token)
+    
+    def _dispatch(self, query: str, query_lower: str, entities: List[Entity], output_format: str) -> str:
+        spec = self.compiler.parse(query_lower, entities)
+        if spec is not None:
+            try:
+                return self.format_result(self.compiled_query(spec), spec.description(), output_format)
+            except Exception as e:
+                return self._error(e, output_format)
         
         # Try to match query patterns
         for pattern_info in self.query_patterns:
             pattern = pattern_info['pattern']
             handler = pattern_info['handler']
             
+            entity = None
+            if 'entity' in pattern_info:
+                entity = first_entity(entities, pattern_info['entity'])
+                if entity is None:
+                    continue
+            
             match = re.search(pattern, query_lower)
             if match:
                 try:
                     # Extract parameters from regex groups if any
                     groups = match.groups()
                     params = [g.strip() if g else None for g in groups if g and g.strip()]
+                    if entity is not None:
+                        # followed by the canonical names the entity pass found
+                        params.append(list(entity.names))
                     
                     result = handler(*params) if params else handler()
-                    return self.format_result(result, pattern_info['description'])
+                    return self.format_result(result, pattern_info['description'], output_format)
                 except Exception as e:
-                    return f"Error executing query: {str(e)}"
+                    return self._error(e, output_format)
         
         # If no pattern matches, try to handle as a general query
-        return self.handle_general_query(query)
+        return self.format_result(self.handle_general_query(query), 'Unrecognized query', output_format)
+    
+    @staticmethod
+    def _error(e: Exception, output_format: str) -> str:
+        message = f"Error executing query: {str(e)}"
+        return dumps({'error': message}) if output_format == 'json' else message
+    
+    def _execute(self, name: str, params: Optional[Dict] = None):
+        """Run a registered handler statement on the current session's connection"""
+        return self.session.connection().execute(STATEMENTS[name], params)
     
-    def format_result(self, result: Any, description: str) -> str:
-        """Format query results for display"""
+    def _result(self, name: str, params: Optional[Dict] = None, display=None, text=None) -> QueryResult:
+        """Run a registered statement and keep its typed rows, named by the SELECT's columns
+        
+        Scan-heavy statements go to the DuckDB mirror when there is one.
+        """
+        analytics = self._snapshot.analytics
+        if analytics is not None and name in ANALYTICS_STATEMENTS:
+            columns, rows = analytics.execute(ANALYTICS_STATEMENTS[name], params)
+            return QueryResult(columns, rows, display, text)
+        cursor = self._execute(name, params)
+        return QueryResult(cursor.keys(), cursor.fetchall(), display, text)
+    
+    def format_result(self, result: Any, description: str, output_format: str = 'text') -> str:
+        """Format query results for display, or as compact JSON"""
+        if output_format == 'json':
+            return format_json(result, description)
+        
+        if isinstance(result, QueryResult):
+            if result and result.text:
+                return result.text(result.rows)
+            result = result.display_rows()
+        
         if not result:
             return f"No results found for: {description}"
         
@@ -164,96 +501,122 @@ class QueryEngine:
         return str(result)
     
     # Query handlers
-    def get_all_matches(self) -> List[Tuple]:
+    def get_all_matches(self) -> QueryResult:
         """Get all matches with basic info"""
-        query = """
-            SELECT date, team1, team2, winner, city, venue 
-            FROM matches 
-            ORDER BY date DESC 
-            LIMIT 50
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(r[0], f"{r[1]} vs {r[2]}", r[3], r[4], r[5]) for r in result]
+        return self._result('get_all_matches', display=lambda rows: [
+            (r[0], f"{r[1]} vs {r[2]}", r[3], r[4], r[5]) for r in rows])
     
-    def count_matches(self) -> str:
+    def count_matches(self) -> QueryResult:
         """Count total matches"""
-        count = self.session.query(Match).count()
-        return f"Total matches in database: {count}"
+        return self._result('count_matches', text=lambda rows: f"Total matches in database: {rows[0][0]}")
     
-    def team_most_wins(self) -> List[Tuple]:
+    def team_most_wins(self) -> QueryResult:
         """Get teams with most wins"""
-        query = """
-            SELECT team_name, matches_won, matches_played, win_percentage
-            FROM team_stats 
-            ORDER BY matches_won DESC 
-            LIMIT 10
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[0]}", f"{r[1]} wins", f"{r[2]} matches", f"{r[3]}% win rate") for r in result]
+        return self._leaderboard('wins')
     
-    def get_team_stats(self) -> List[Tuple]:
+    def get_team_stats(self) -> QueryResult:
         """Get comprehensive team statistics"""
-        query = """
-            SELECT team_name, matches_played, matches_won, matches_lost, 
-                   win_percentage, highest_score, lowest_score
-            FROM team_stats 
-            ORDER BY matches_won DESC
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return result
+        return self._result('get_team_stats')
     
-    def player_most_runs(self) -> List[Tuple]:
+    def player_most_runs(self) -> QueryResult:
         """Get players with most runs"""
-        query = """
-            SELECT player_name, total_runs, matches_batted, highest_score, 
-                   batting_average, strike_rate
-            FROM player_stats 
-            WHERE total_runs > 0
-            ORDER BY total_runs DESC 
-            LIMIT 20
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[0]}", f"{r[1]} runs", f"{r[2]} matches", f"HS: {r[3]}", 
-                f"Avg: {r[4]}", f"SR: {r[5]}") for r in result]
+        return self._leaderboard('runs')
     
-    def player_most_wickets(self) -> List[Tuple]:
+    def player_most_wickets(self) -> QueryResult:
         """Get players with most wickets"""
-        query = """
-            SELECT player_name, wickets_taken, matches_bowled, 
-                   bowling_average, economy_rate, overs_bowled
-            FROM player_stats 
-            WHERE wickets_taken > 0
-            ORDER BY wickets_taken DESC 
-            LIMIT 20
+        return self._leaderboard('wickets')
+    
+    def season_leaderboard(self, request: str, season: str) -> QueryResult:
+        """Get a season's top run scorers, wicket takers or winning teams"""
+        return self._leaderboard(self._leaderboard_metric(request), 'season', season_names(season))
+    
+    def venue_leaderboard(self, request: str, venues: List[str]) -> QueryResult:
+        """Get a venue's top run scorers, wicket takers or winning teams"""
+        scopes = sorted({venue_scope(venue) for venue in venues})
+        return self._leaderboard(self._leaderboard_metric(request), 'venue', scopes)
+    
+    def team_leaderboard(self, request: str, team: str) -> Any:
+        """Get a team's top run scorers or wicket takers"""
+        teams = self._resolve_teams(team)
+        if not teams:
+            return f"No team found matching '{team}'"
+        return self._leaderboard(self._leaderboard_metric(request), 'team', teams)
+    
+    @staticmethod
+    def _leaderboard_metric(request: str) -> str:
+        if 'wicket' in request:
+            return 'wickets'
+        if re.search(r'\bw(?:ins|on)\b', request):
+            return 'wins'
+        return 'runs'
+    
+    def _leaderboard(self, metric: str, scope_type: str = 'all', scopes: Optional[List[str]] = None) -> QueryResult:
+        """Read a top-k board maintained during ingestion; rows arrive already ranked
+        
+        Several scopes (a team's names, a year's season names) are ranked
+        together from their running totals instead.
         """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[0]}", f"{r[1]} wickets", f"{r[2]} matches", 
-                f"Avg: {r[3]}", f"Econ: {r[4]}", f"Overs: {r[5]}") for r in result]
+        display = getattr(self, f"_{metric}_board")
+        params = {'metric': metric, 'scope_type': scope_type, 'scopes': scopes or ['']}
+        if len(params['scopes']) > 1:
+            return self._result('leaderboard_merged', {**params, 'limit': LEADERBOARD_SIZE}, display=display)
+        return self._result('leaderboard', params, display=display)
+    
+    def compiled_query(self, spec: QuerySpec) -> QueryResult:
+        """Run a parsed leaderboard or total question as the compiler's single statement"""
+        statement, params = self.compiler.compile(spec)
+        cursor = self.session.connection().execute(statement, params)
+        if spec.intent == 'total':
+            description = spec.description()
+            return QueryResult(cursor.keys(), cursor.fetchall(), text=lambda rows: (
+                f"{description}: {rows[0][0] or 0} in {rows[0][1]} matches" if rows[0][1]
+                else f"No results found for: {description}"))
+        return QueryResult(cursor.keys(), cursor.fetchall(), display=getattr(self, f"_{spec.metric}_board"))
+    
+    @staticmethod
+    def _runs_board(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}", f"{r[1]} runs", f"{r[2]} matches", f"SR: {r[4] * 100 / max(r[3], 1):.2f}")
+                for r in rows]
     
-    def get_player_batting_stats(self, player_name: str) -> str:
+    @staticmethod
+    def _wickets_board(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}", f"{r[1]} wickets", f"{r[2]} matches", f"Avg: {r[4] / r[1]:.2f}",
+                 f"Econ: {r[4] * 6 / max(r[3], 1):.2f}", f"Overs: {r[3] // 6}.{r[3] % 6}") for r in rows]
+    
+    @staticmethod
+    def _sixes_board(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}", f"{r[1]} sixes", f"{r[2]} matches", f"{r[4]} runs off {r[3]} balls") for r in rows]
+    
+    @staticmethod
+    def _fours_board(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}", f"{r[1]} fours", f"{r[2]} matches", f"{r[4]} runs off {r[3]} balls") for r in rows]
+    
+    @staticmethod
+    def _wins_board(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}", f"{r[1]} wins", f"{r[2]} matches", f"{round(r[1] * 100 / max(r[2], 1), 2)}% win rate")
+                for r in rows]
+    
+    def get_player_batting_stats(self, player_name: str) -> Any:
         """Get specific player's batting stats"""
         # Clean player name
         player_name = player_name.strip()
         if not player_name:
             return "Please specify a player name"
         
-        query = """
-            SELECT player_name, total_runs, matches_batted, highest_score,
-                   batting_average, strike_rate, centuries, fifties, sixes, fours
-            FROM player_stats 
-            WHERE LOWER(player_name) LIKE LOWER(?)
-            AND total_runs > 0
-            ORDER BY total_runs DESC
-            LIMIT 5
-        """
+        player_names = self._resolve_players(player_name)
+        if not player_names:
+            return f"No player found matching '{player_name}'"
         
-        result = self.session.execute(text(query), (f"%{player_name}%",)).fetchall()
+        result = self._result('get_player_batting_stats', {'names': player_names}, text=self._batting_cards)
         
         if not result:
             return f"No batting stats found for player matching '{player_name}'"
-        
+        return result
+    
+    @staticmethod
+    def _batting_cards(rows: List[tuple]) -> str:
         stats = []
-        for r in result:
+        for r in rows:
             stats.append(f"""
 🏏 **{r[0]}** Batting Stats:
 • Total Runs: {r[1]}
@@ -261,37 +624,34 @@ class QueryEngine:
 • Highest Score: {r[3]}
 • Average: {r[4]}
 • Strike Rate: {r[5]}
-• Centuries: {r[8]}
-• Fifties: {r[9]}
-• Sixes: {r[10]}
-• Fours: {r[11]}
+• Centuries: {r[6]}
+• Fifties: {r[7]}
+• Sixes: {r[8]}
+• Fours: {r[9]}
             """.strip())
         
         return "\n\n".join(stats)
     
-    def get_player_bowling_stats(self, player_name: str) -> str:
+    def get_player_bowling_stats(self, player_name: str) -> Any:
         """Get specific player's bowling stats"""
         player_name = player_name.strip()
         if not player_name:
             return "Please specify a player name"
         
-        query = """
-            SELECT player_name, wickets_taken, matches_bowled, runs_conceded,
-                   bowling_average, economy_rate, overs_bowled
-            FROM player_stats 
-            WHERE LOWER(player_name) LIKE LOWER(?)
-            AND wickets_taken > 0
-            ORDER BY wickets_taken DESC
-            LIMIT 5
-        """
+        player_names = self._resolve_players(player_name)
+        if not player_names:
+            return f"No player found matching '{player_name}'"
         
-        result = self.session.execute(text(query), (f"%{player_name}%",)).fetchall()
+        result = self._result('get_player_bowling_stats', {'names': player_names}, text=self._bowling_cards)
         
         if not result:
             return f"No bowling stats found for player matching '{player_name}'"
-        
+        return result
+    
+    @staticmethod
+    def _bowling_cards(rows: List[tuple]) -> str:
         stats = []
-        for r in result:
+        for r in rows:
             stats.append(f"""
 ⚾ **{r[0]}** Bowling Stats:
 • Wickets: {r[1]}
@@ -304,136 +664,270 @@ class QueryEngine:
         
         return "\n\n".join(stats)
     
-    def highest_total_score(self) -> List[Tuple]:
+    def highest_total_score(self) -> QueryResult:
         """Get highest team totals"""
-        query = """
-            SELECT i.total_runs, i.team, m.venue, m.city, m.date, 
-                   m.team1, m.team2, m.winner
-            FROM innings i
-            JOIN matches m ON i.match_id = m.id
-            ORDER BY i.total_runs DESC
-            LIMIT 15
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[1]}: {r[0]}", f"{r[6]} vs {r[7]}", r[3], r[4], f"Won by: {r[8]}") 
-                for r in result]
+        return self._result('highest_total_score', display=self._total_score_rows)
     
-    def lowest_total_score(self) -> List[Tuple]:
+    def lowest_total_score(self) -> QueryResult:
         """Get lowest team totals"""
-        query = """
-            SELECT i.total_runs, i.team, m.venue, m.city, m.date,
-                   m.team1, m.team2, m.winner
-            FROM innings i
-            JOIN matches m ON i.match_id = m.id
-            WHERE i.total_runs > 0
-            ORDER BY i.total_runs ASC
-            LIMIT 15
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[1]}: {r[0]}", f"{r[5]} vs {r[6]}", r[2], r[3], f"Won by: {r[7]}") 
-                for r in result]
+        return self._result('lowest_total_score', display=self._total_score_rows)
     
-    def matches_by_city(self, city: str) -> List[Tuple]:
+    @staticmethod
+    def _total_score_rows(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[1]}: {r[0]}", f"{r[5]} vs {r[6]}", r[2], r[3], f"Won by: {r[7]}")
+                for r in rows]
+    
+    def matches_by_city(self, cities: List[str]) -> QueryResult:
         """Get matches by city"""
-        query = """
-            SELECT date, team1, team2, winner, venue
-            FROM matches 
-            WHERE LOWER(city) LIKE LOWER(?)
-            ORDER BY date DESC
-            LIMIT 30
-        """
-        result = self.session.execute(text(query), (f"%{city}%",)).fetchall()
-        return [(r[0], f"{r[1]} vs {r[2]}", r[3], r[4]) for r in result]
+        return self._result('matches_by_city', {'cities': cities}, display=lambda rows: [
+            (r[0], f"{r[1]} vs {r[2]}", r[3], r[4]) for r in rows])
     
-    def matches_by_venue(self, venue: str) -> List[Tuple]:
+    def matches_by_venue(self, venues: List[str]) -> QueryResult:
         """Get matches by venue"""
-        query = """
-            SELECT date, team1, team2, winner, city
-            FROM matches 
-            WHERE LOWER(venue) LIKE LOWER(?)
-            ORDER BY date DESC
-            LIMIT 30
-        """
-        result = self.session.execute(text(query), (f"%{venue}%",)).fetchall()
-        return [(r[0], f"{r[1]} vs {r[2]}", r[3], r[4]) for r in result]
+        return self._result('matches_by_venue', {'venues': venues}, display=lambda rows: [
+            (r[0], f"{r[1]} vs {r[2]}", r[3], r[4]) for r in rows])
     
-    def average_first_innings_score(self) -> str:
+    def average_first_innings_score(self) -> QueryResult:
         """Get average first innings score"""
-        query = """
-            SELECT AVG(total_runs) as avg_score, COUNT(*) as total_innings
-            FROM innings 
-            WHERE innings_number = 1 AND total_runs > 0
-        """
-        result = self.session.execute(text(query)).fetchone()
-        return f"Average first innings score: {result[0]:.1f} runs (from {result[1]} innings)"
+        return self._result('average_first_innings_score', text=lambda rows:
+                            f"Average first innings score: {rows[0][0]:.1f} runs (from {rows[0][1]} innings)")
     
-    def venue_highest_scores(self) -> List[Tuple]:
+    def venue_highest_scores(self) -> QueryResult:
         """Get venues with highest scoring matches"""
-        query = """
-            SELECT m.venue, AVG(i.total_runs) as avg_score, 
-                   MAX(i.total_runs) as highest_score, COUNT(i.id) as innings_count
-            FROM matches m
-            JOIN innings i ON m.id = i.match_id
-            WHERE m.venue IS NOT NULL
-            GROUP BY m.venue
-            HAVING COUNT(i.id) >= 10
-            ORDER BY avg_score DESC
-            LIMIT 15
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(r[0], f"Avg: {r[1]:.1f}", f"Highest: {r[2]}", f"{r[3]} innings") 
-                for r in result]
+        def display(rows):
+            return [(r[0], f"Avg: {r[1]:.1f}", f"Highest: {r[2]}", f"{r[3]} innings") for r in rows]
+        if self.columnar is not None:
+            return QueryResult(('venue', 'avg_score', 'highest_score', 'innings_count'),
+                               self.columnar.venue_scoring(), display)
+        return self._result('venue_highest_scores', display=display)
     
-    def all_centuries(self) -> List[Tuple]:
+    def season_scoring(self) -> QueryResult:
+        """Get runs, run rate, boundaries and wickets per season from every delivery"""
+        def display(rows):
+            return [(r[0], f"{r[1]} runs", f"RR: {r[1] * 6 / max(r[2], 1):.2f}", f"4s: {r[3]}",
+                     f"6s: {r[4]}", f"{r[5]} wickets") for r in rows]
+        if self.columnar is not None:
+            return QueryResult(('season', 'runs', 'balls', 'fours', 'sixes', 'wickets'),
+                               self.columnar.season_scoring(), display)
+        return self._result('season_scoring', display=display)
+    
+    def all_centuries(self) -> QueryResult:
         """Get all centuries scored (individual match performances)"""
         # This would require ball-by-ball analysis - simplified version
-        query = """
-            SELECT ps.player_name, ps.highest_score, ps.total_runs, ps.matches_batted
-            FROM player_stats ps
-            WHERE ps.highest_score >= 100
-            ORDER BY ps.highest_score DESC
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(f"{r[0]}", f"Best: {r[1]}", f"Total: {r[2]} runs", f"{r[3]} matches") 
-                for r in result]
+        return self._result('all_centuries', display=lambda rows: [
+            (f"{r[0]}", f"Best: {r[1]}", f"Total: {r[2]} runs", f"{r[3]} matches") for r in rows])
     
-    def successful_chases(self) -> List[Tuple]:
+    def successful_chases(self) -> QueryResult:
         """Get highest successful chase targets"""
-        query = """
-            SELECT m.date, i.total_runs, i.team as chasing_team,
-                   m.team1, m.team2, m.winner, m.venue
-            FROM innings i
-            JOIN matches m ON i.match_id = m.id
-            WHERE i.innings_number = 2 
-            AND i.team = m.winner
-            AND i.target IS NOT NULL
-            ORDER BY i.total_runs DESC
-            LIMIT 20
-        """
-        result = self.session.execute(text(query)).fetchall()
-        return [(r[0], f"{r[2]}: {r[1]}", f"{r[3]} vs {r[4]}", r[6]) for r in result]
+        return self._result('successful_chases', display=lambda rows: [
+            (r[0], f"{r[2]}: {r[1]}", f"{r[3]} vs {r[4]}", r[6]) for r in rows])
     
-    def powerplay_performance(self) -> str:
+    def powerplay_performance(self) -> QueryResult:
         """Powerplay performance analysis"""
         # This is a simplified version - would need more complex analysis
-        query = """
-            SELECT i.team, AVG(i.total_runs) as avg_total,
-                   COUNT(*) as matches_count
-            FROM innings i
-            JOIN matches m ON i.match_id = m.id
-            GROUP BY i.team
-            HAVING COUNT(*) >= 20
-            ORDER BY avg_total DESC
-            LIMIT 10
-        """
-        result = self.session.execute(text(query)).fetchall()
-        
+        return self._result('powerplay_performance', text=self._powerplay_overview)
+    
+    @staticmethod
+    def _powerplay_overview(rows: List[tuple]) -> str:
         formatted_result = ["🚀 **Team Performance Overview**", ""]
-        for r in result:
+        for r in rows:
             formatted_result.append(f"• {r[0]}: {r[1]:.1f} avg runs ({r[2]} matches)")
         
         return "\n".join(formatted_result)
     
+    def _entity_names(self, fragment: str, kind: str) -> List[str]:
+        """Canonical names of a kind that the query's entity pass found inside a fragment"""
+        fragment = fragment.strip()
+        call = _call_entities.get()
+        if call is not None and fragment in call[0]:
+            query, entities = call
+        else:
+            # Handler called directly, not through process_query
+            query, entities = fragment, self.entities.extract(fragment)
+        start = query.find(fragment)
+        return entities_in_span(entities, kind, start, start + len(fragment))
+    
+    def _resolve_players(self, name_fragment: str) -> List[str]:
+        """Registry names matching a (partial) player name, e.g. 'kohli' -> ['V Kohli']"""
+        names = self._entity_names(name_fragment, 'player')
+        if names:
+            return names
+        
+        # Not a known name or surname: fall back to a substring scan
+        result = self._execute('resolve_players', {'name': f"%{name_fragment.strip()}%"}).fetchall()
+        return [r[0] for r in result]
+    
+    @staticmethod
+    def _format_partnerships(rows: List[tuple]) -> List[Tuple]:
+        return [(f"{r[0]}{'*' if r[7] else ''} runs ({r[1]} balls)", f"{r[2]} {r[3]} & {r[4]} {r[5]}",
+                 f"Wicket {r[6]}", r[8], r[9], f"{r[10]} vs {r[11]}") for r in rows]
+    
+    def top_partnerships(self) -> QueryResult:
+        """Get the highest partnerships for any wicket"""
+        return self._result('top_partnerships', display=self._format_partnerships)
+    
+    def partnerships_by_wicket(self, wicket: str) -> QueryResult:
+        """Get the highest partnerships for a given wicket"""
+        return self._result('partnerships_by_wicket', {'wicket': int(wicket)}, display=self._format_partnerships)
+    
+    def opening_partnerships(self) -> QueryResult:
+        """Get the highest opening partnerships"""
+        return self.partnerships_by_wicket('1')
+    
+    def partnerships_by_pair(self, first_player: str, second_player: str) -> Any:
+        """Get partnerships between two batters, best first"""
+        first_names = self._resolve_players(first_player)
+        second_names = self._resolve_players(second_player)
+        if not first_names or not second_names:
+            missing = first_player if not first_names else second_player
+            return f"No player found matching '{missing}'"
+        
+        # Pairs are stored sorted, so look the pair up in both orders
+        return self._result('partnerships_by_pair', {'first': first_names, 'second': second_names},
+                            display=self._format_partnerships)
+    
+    def head_to_head(self, batter: str, bowler: str) -> Any:
+        """Get batter vs bowler totals from the matchup index"""
+        batters = self._resolve_players(batter)
+        bowlers = self._resolve_players(bowler)
+        if not batters or not bowlers:
+            missing = batter if not batters else bowler
+            return f"No player found matching '{missing}'"
+        result = self._result('head_to_head', {'batters': batters, 'bowlers': bowlers}, text=self._head_to_head_cards)
+        
+        if not result:
+            return f"No deliveries found between '{batter}' and '{bowler}'"
+        return result
+    
+    @staticmethod
+    def _head_to_head_cards(rows: List[tuple]) -> str:
+        stats = []
+        for r in rows:
+            average = f"{r[3] / r[4]:.2f}" if r[4] else "-"
+            stats.append(f"""
+🎯 **{r[0]} vs {r[1]}**:
+• Balls: {r[2]}
+• Runs: {r[3]}
+• Dismissals: {r[4]}
+• Strike Rate: {r[3] * 100 / max(r[2], 1):.2f}
+• Average: {average}
+• Dot Balls: {r[5]}
+• Fours: {r[6]}
+• Sixes: {r[7]}
+            """.strip())
+        
+        return "\n\n".join(stats)
+    
+    def toughest_bowlers(self, batter: str) -> Any:
+        """Get the bowlers who have dismissed a batter most often and conceded least"""
+        batters = self._resolve_players(batter)
+        if not batters:
+            return f"No player found matching '{batter}'"
+        
+        # Reads only this batter's slice of the (batter, bowler) index
+        return self._result('toughest_bowlers', {'batters': batters}, display=lambda rows: [
+            (f"{r[1]} vs {r[0]}", f"{r[2]} dismissals", f"{r[3]} runs off {r[4]} balls",
+             f"SR: {r[3] * 100 / r[4]:.2f}", f"{r[5]} dots") for r in rows])
+    
+    def best_batters_against(self, bowler: str) -> Any:
+        """Get the batters who have scored most heavily off a bowler"""
+        bowlers = self._resolve_players(bowler)
+        if not bowlers:
+            return f"No player found matching '{bowler}'"
+        
+        # Reads only this bowler's slice of the (bowler, batter) index
+        return self._result('best_batters_against', {'bowlers': bowlers}, display=lambda rows: [
+            (f"{r[0]} vs {r[1]}", f"{r[2]} runs off {r[3]} balls",
+             f"SR: {r[2] * 100 / max(r[3], 1):.2f}", f"Out {r[4]} times",
+             f"4s: {r[5]}", f"6s: {r[6]}") for r in rows])
+    
+    def most_catches(self) -> QueryResult:
+        """Get the fielders with most catches, including caught and bowled"""
+        return self._result('most_catches', display=lambda rows: [
+            (r[0], f"{r[1]} catches", f"{r[2]} stumpings", f"{r[3]} run-outs") for r in rows])
+    
+    def most_stumpings(self) -> QueryResult:
+        """Get the wicket-keepers with most stumpings"""
+        return self._result('most_stumpings', display=lambda rows: [
+            (r[0], f"{r[1]} stumpings", f"{r[2]} catches") for r in rows])
+    
+    def most_run_outs(self) -> QueryResult:
+        """Get the fielders involved in most run-outs"""
+        return self._result('most_run_outs', display=lambda rows: [
+            (r[0], f"{r[1]} run-outs", f"{r[2]} catches") for r in rows])
+    
+    def get_player_fielding_stats(self, player_name: str) -> Any:
+        """Get specific player's catches, stumpings and run-outs"""
+        player_name = player_name.strip()
+        if not player_name:
+            return "Please specify a player name"
+        
+        player_names = self._resolve_players(player_name)
+        if not player_names:
+            return f"No player found matching '{player_name}'"
+        
+        result = self._result('player_fielding', {'names': player_names}, text=self._fielding_cards)
+        if not result:
+            return f"No fielding dismissals found for player matching '{player_name}'"
+        return result
+    
+    @staticmethod
+    def _fielding_cards(rows: List[tuple]) -> str:
+        return "\n\n".join(f"""
+🧤 **{r[0]}** Fielding Stats:
+• Catches: {r[1]}
+• Stumpings: {r[2]}
+• Run-outs: {r[3]}
+            """.strip() for r in rows)
+    
+    def dismissal_breakdown(self, batter: str) -> Any:
+        """Get how often a batter has been out each way"""
+        batters = self._resolve_players(batter)
+        if not batters:
+            return f"No player found matching '{batter}'"
+        return self._result('dismissal_kinds', {'names': batters}, display=lambda rows: [
+            (r[0], r[1], f"{r[2]} times") for r in rows])
+    
+    def _resolve_teams(self, name_fragment: str) -> List[str]:
+        """Team names for an abbreviation or partial name, e.g. 'rcb' or 'chennai'"""
+        name_fragment = name_fragment.strip()
+        names = self._entity_names(name_fragment, 'team')
+        if names:
+            return names
+        result = self._execute('resolve_teams', {'name': f"%{name_fragment}%"}).fetchall()
+        return [r[0] for r in result]
+    
+    def score_at_over(self, team: str, overs: str) -> Any:
+        """Get a team's score after N overs in each of its innings"""
+        teams = self._resolve_teams(team)
+        if not teams:
+            return f"No team found matching '{team}'"
+        
+        # One prefix-sum row per innings, straight off the (team, over_number) index
+        return self._result('score_at_over', {'teams': teams, 'over': int(overs)}, display=lambda rows: [
+            (f"{r[0]}: {r[1]}/{r[2]} after {overs} overs", f"Innings {r[3]}", r[4],
+             f"{r[5]} vs {r[6]}", r[7]) for r in rows])
+    
+    def phase_run_rate(self, first_over: str, last_over: str) -> QueryResult:
+        """Get each team's run rate across a range of overs (e.g. 16-20 for the death)"""
+        first, last = sorted((int(first_over), int(last_over)))
+        return self._result('phase_run_rate', {'first': first, 'last': last}, display=lambda rows: [
+            (r[0], f"RR: {r[1] * 6 / max(r[2], 1):.2f}", f"{r[1]} runs", f"{r[3]} wickets",
+             f"{r[4]} innings") for r in rows])
+    
+    def match_worm(self, match_id: str) -> QueryResult:
+        """Get the over-by-over cumulative score of both innings of a match"""
+        return self._result('match_worm', {'match_id': match_id}, display=self._worm_rows)
+    
+    @staticmethod
+    def _worm_rows(rows: List[tuple]) -> List[Tuple]:
+        # Line the innings up side by side, one row per over
+        overs = {}
+        for over_number, innings, team, runs, total, wickets in rows:
+            overs.setdefault(over_number, {})[innings] = f"{team}: {total}/{wickets} (+{runs})"
+        return [tuple([f"Over {over_number}"] + [by_innings[i] for i in sorted(by_innings)])
+                for over_number, by_innings in sorted(overs.items())]
+    
     def handle_general_query(self, query: str) -> str:
         """Handle general queries that don't match specific patterns"""
         suggestions = [
@@ -445,8 +939,15 @@ class QueryEngine:
             "• Show me Virat Kohli batting stats",
             "• Which venue has the highest scoring matches?",
             "• What's the average first innings score?",
+            "• Show runs scored by season",
             "• Show me all centuries scored",
-            "• Who took the most wickets?"
+            "• Who took the most wickets?",
+            "• Who has taken the most catches?",
+            "• How does Kohli get out?",
+            "• What are the highest partnerships?",
+            "• What was RCB's score after 10 overs?",
+            "• What is the run rate in overs 16-20?",
+            "• How does Kohli fare against Bumrah?"
         ]
         
         return f"""I couldn't understand your query: "{query}"
@@ -0,0 +1,79 @@
+import json
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Distinct queries kept; past this the least asked are forgotten
+MAX_ENTRIES = 500
+
+
+def normalize_query(query: str) -> str:
+    """A query as the server keys it: case and spacing don't change what it asks"""
+    return ' '.join(query.lower().split())
+
+
+class QueryLog:
+    """How often each normalized (query, format) is asked, optionally kept in a JSON file
+
+    Recording is one dict increment. save() adds what was recorded since the
+    previous save to the counts in the file, as they are now, and swaps the
+    result in, so every run and every HTTP worker saving into one file adds
+    to the same counts (a save racing another one can lose its increments,
+    which only costs some warm-up).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.counts: Counter = Counter(self._read())
+        self._unsaved: Counter = Counter()
+
+    def _read(self) -> Dict[Tuple[str, str], int]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return {(entry['query'], entry['format']): int(entry['count']) for entry in json.load(f)}
+        except (OSError, ValueError, KeyError, TypeError):
+            # An unreadable log starts over; it only ever steers warm-up
+            return {}
+
+    def record(self, query: str, output_format: str):
+        key = (normalize_query(query), output_format)
+        self.counts[key] += 1
+        self._unsaved[key] += 1
+        if len(self.counts) > 2 * self.max_entries:
+            self.counts = Counter(dict(self.counts.most_common(self.max_entries)))
+            self._unsaved = Counter({key: n for key, n in self._unsaved.items() if key in self.counts})
+
+    def top(self, n: int) -> List[Tuple[str, str]]:
+        """The n most asked (query, format) pairs, most asked first"""
+        return [key for key, _ in self.counts.most_common(n)]
+
+    def save(self):
+        """Add the counts recorded since the last save to the file (no-op without a path)
+        
+        Returns whether the file was written. A file that can't be written is
+        reported on stderr and the counts are kept for the next save.
+        """
+        if not self.path or not self._unsaved:
+            return False
+        counts = Counter(self._read())
+        counts.update(self._unsaved)
+        entries = counts.most_common(self.max_entries)
+        staging_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(staging_path, 'w') as f:
+                json.dump([{'query': query, 'format': output_format, 'count': count}
+                           for (query, output_format), count in entries], f, indent=1)
+            os.replace(staging_path, self.path)
+        except OSError as e:
+            # stderr, as stdout may carry the protocol
+            print(f"Error saving the query log to {self.path}: {e}", file=sys.stderr)
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            return False
+        self.counts = Counter(dict(entries))
+        self._unsaved.clear()
+        return True
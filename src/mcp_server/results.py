@@ -0,0 +1,63 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional: uv sync --extra fast-json
+    orjson = None
+
+OUTPUT_FORMATS = ('text', 'json')
+
+
+class QueryResult:
+    """Typed rows returned by a handler, plus how to show them as text
+
+    rows keep the values SQL returned (ints, floats, strings); display maps
+    them to the tuples the text formatter lists, and text renders the whole
+    result when it is a card rather than a list.
+    """
+
+    __slots__ = ('columns', 'rows', 'display', 'text')
+
+    def __init__(self, columns: Sequence[str], rows: Sequence[Sequence],
+                 display: Optional[Callable[[List[tuple]], List]] = None,
+                 text: Optional[Callable[[List[tuple]], str]] = None):
+        self.columns = list(columns)
+        self.rows = [tuple(r) for r in rows]
+        self.display = display
+        self.text = text
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def display_rows(self) -> List:
+        return self.display(self.rows) if self.display else self.rows
+
+    def to_columnar(self) -> Dict[str, list]:
+        """Column names once, then one value array per column"""
+        if self.rows:
+            data = [list(values) for values in zip(*self.rows)]
+        else:
+            data = [[] for _ in self.columns]
+        return {'columns': self.columns, 'data': data}
+
+
+def dumps(payload: Any) -> str:
+    """Compact JSON: orjson when installed, else the stdlib without whitespace"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def format_json(result: Any, description: str) -> str:
+    """Serialize a handler result for format="json" tool calls"""
+    if isinstance(result, QueryResult):
+        payload = {'description': description, **result.to_columnar(), 'count': len(result)}
+    elif isinstance(result, str):
+        payload = {'description': description, 'message': result}
+    elif isinstance(result, (int, float)):
+        payload = {'description': description, 'value': result}
+    else:
+        rows = list(result or [])
+        payload = {'description': description, 'rows': rows, 'count': len(rows)}
+    return dumps(payload)
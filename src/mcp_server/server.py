@@ -1,21 +1,113 @@
 import asyncio
 import json
+import time
 from typing import Any, Dict, List, Optional
 
 from mcp.server import Server, InitializationOptions
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp import stdio_server
 from mcp.types import Resource, Tool, TextContent
 
-from ..database.database import get_db_session
+from ..database.database import get_db_session, dispose_async_engine
 from ..database.models import *
+from .coalescing import SingleFlight
 from .query_engine import QueryEngine
+from .query_log import QueryLog, normalize_query
+from .results import OUTPUT_FORMATS
+
+# Read-only resource with the request coalescing counters
+STATS_URI = "ipl://server/stats"
+
+# Most asked queries replayed after startup and after each new data generation
+PREWARM_QUERIES = 20
+
+# Seconds between checks for a newly published data generation, and between query log saves
+GENERATION_POLL_SECONDS = 5.0
+LOG_SAVE_SECONDS = 60.0
 
 class IPLMCPServer:
-    def __init__(self):
+    def __init__(self, columnar_dir: Optional[str] = None, analytics_backend: str = 'sqlite',
+                 query_log: Optional[str] = None, prewarm: int = PREWARM_QUERIES):
         self.server = Server("ipl-cricket-server")
-        self.query_engine = QueryEngine()
+        self.query_engine = QueryEngine(columnar_dir, analytics_backend)
+        # Identical queries arriving together (everyone asking about the match
+        # that just ended) run once and share the answer
+        self.single_flight = SingleFlight()
+        # What users ask and how often (kept in the query_log file, if given);
+        # the top `prewarm` queries are replayed whenever the data is new
+        self.query_log = QueryLog(query_log)
+        self.prewarm_queries = prewarm
+        self.prewarm_stats = {'generation': None, 'queries': 0, 'seconds': 0.0}
+        self._warmed_generation = None
+        self._prewarm_task = None
+        self._background_tasks = []
         self.setup_handlers()
     
+    async def query(self, query: str, output_format: str = 'text') -> str:
+        """Answer a query, joining an identical one already running if there is one
+        
+        Queries are identical when they match ignoring case and spacing and ask
+        for the same format.
+        """
+        self.query_log.record(query, output_format)
+        key = (normalize_query(query), output_format)
+        return await self.single_flight.run(key, lambda: self.query_engine.aprocess_query(query, output_format))
+    
+    async def prewarm(self, queries: List[tuple]) -> int:
+        """Answer (query, format) pairs one after another and discard the answers
+        
+        Loads the SQLite pages, compiled plans and mirrors they need before
+        clients ask. Returns how many were answered.
+        """
+        started = time.perf_counter()
+        answered = 0
+        for query, output_format in queries:
+            try:
+                await self.query_engine.aprocess_query(query, output_format)
+                answered += 1
+            except Exception:
+                # Clients asking it get the error themselves
+                continue
+        self.prewarm_stats = {'generation': self.query_engine.generation, 'queries': answered,
+                              'seconds': round(time.perf_counter() - started, 3)}
+        return answered
+    
+    def _schedule_prewarm(self):
+        """Start a background prewarm if the served generation hasn't had one"""
+        if self.prewarm_queries <= 0 or self.query_engine.generation == self._warmed_generation:
+            return
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            # The next check starts one for the newer generation
+            return
+        self._warmed_generation = self.query_engine.generation
+        self._prewarm_task = asyncio.ensure_future(self.prewarm(self.query_log.top(self.prewarm_queries)))
+    
+    async def _watch_generations(self):
+        """Prewarm now and after every newly published generation; save the query log now and then"""
+        last_save = time.monotonic()
+        while True:
+            self._schedule_prewarm()
+            await asyncio.sleep(GENERATION_POLL_SECONDS)
+            refreshing = self.query_engine.refresh_in_background()
+            if refreshing is not None:
+                await refreshing
+            if time.monotonic() - last_save >= LOG_SAVE_SECONDS:
+                self.query_log.save()
+                last_save = time.monotonic()
+    
+    def start_background_tasks(self):
+        """Start prewarming and watching for new data; returns at once, so serving isn't delayed"""
+        self._background_tasks.append(asyncio.ensure_future(self._watch_generations()))
+    
+    async def stop_background_tasks(self):
+        """Cancel prewarming and the watch, and save the query log"""
+        tasks = self._background_tasks + ([self._prewarm_task] if self._prewarm_task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._background_tasks = []
+        self.query_log.save()
+    
     def setup_handlers(self):
         """Setup MCP server handlers"""
         
@@ -37,6 +129,9 @@ class IPLMCPServer:
                     - 'What's the average first innings score?'
                     - 'Show me all centuries scored'
                     - 'Which venue has the highest scoring matches?'
+                    - 'What are the highest partnerships?'
+                    - 'Show partnerships between Gambhir and Lynn'
+                    - 'How does Kohli fare against Bumrah?'
                     """,
                     inputSchema={
                         "type": "object",
@@ -44,6 +139,13 @@ class IPLMCPServer:
                             "query": {
                                 "type": "string",
                                 "description": "Natural language query about IPL cricket data"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": list(OUTPUT_FORMATS),
+                                "default": "text",
+                                "description": "'text' for a readable summary, 'json' for typed rows as "
+                                               "{description, columns, data: one array per column, count}"
                             }
                         },
                         "required": ["query"]
@@ -60,24 +162,52 @@ class IPLMCPServer:
                     return [TextContent(type="text", text="Please provide a query.")]
                 
                 try:
-                    result = self.query_engine.process_query(query)
+                    output_format = arguments.get("format") or "text"
+                    result = await self.query(query, output_format)
                     return [TextContent(type="text", text=result)]
                 except Exception as e:
                     return [TextContent(type="text", text=f"Error processing query: {str(e)}")]
             
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        
+        @self.server.list_resources()
+        async def handle_list_resources() -> List[Resource]:
+            return [
+                Resource(
+                    uri=STATS_URI,
+                    name="server_stats",
+                    description="Query requests received, executions run, requests coalesced "
+                                "into an identical one already running, and the last prewarm",
+                    mimeType="application/json"
+                )
+            ]
+        
+        @self.server.read_resource()
+        async def handle_read_resource(uri) -> List[ReadResourceContents]:
+            if str(uri) != STATS_URI:
+                raise ValueError(f"Unknown resource: {uri}")
+            stats = {**self.single_flight.stats(), 'prewarm': self.prewarm_stats}
+            return [ReadResourceContents(content=json.dumps(stats), mime_type="application/json")]
 
     async def run(self):
         """Run the MCP server"""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="ipl-cricket-server",
-                    server_version="1.0.0",
-                    capabilities={
-                        "tools": {}
-                    }
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                self.start_background_tasks()
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="ipl-cricket-server",
+                        server_version="1.0.0",
+                        capabilities={
+                            "tools": {},
+                            "resources": {}
+                        }
+                    )
                 )
-            ) 
\ No newline at end of file
+        finally:
+            try:
+                await self.stop_background_tasks()
+            finally:
+                await dispose_async_engine()
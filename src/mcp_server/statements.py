@@ -0,0 +1,289 @@
+from sqlalchemy import bindparam, text
+
+# Every handler's SQL, keyed by handler name. Building the TextClause objects
+# once means a call skips parsing the SQL string into a new construct and
+# generating its cache key from scratch; SQLAlchemy's compiled cache then maps
+# each one straight to its compiled form, and the pooled sqlite3 connections
+# keep the prepared statement in their own statement cache (128 per
+# connection by default, well above the size of this registry).
+#
+# Statements with expanding IN parameters render one SQL string per list
+# length, so each length is prepared once and then reused the same way.
+STATEMENTS = {
+    'get_all_matches': text("""
+        SELECT date, team1, team2, winner, city, venue 
+        FROM matches 
+        ORDER BY date DESC 
+        LIMIT 50
+    """),
+    'count_matches': text("""
+        SELECT COUNT(*) as matches FROM matches
+    """),
+    'get_team_stats': text("""
+        SELECT team_name, matches_played, matches_won, matches_lost, 
+               win_percentage, highest_score, lowest_score
+        FROM team_stats 
+        ORDER BY matches_won DESC
+    """),
+    # Boards are stored in rank order under (metric, scope_type, scope, rank),
+    # so this is an index range scan with no sort step. For one board only:
+    # several scopes would come back one board after another (the scopes may
+    # be names of one board that only one of is stored under, e.g. a season)
+    'leaderboard': text("""
+        SELECT name, value, matches, balls, runs
+        FROM leaderboards
+        WHERE metric = :metric AND scope_type = :scope_type AND scope IN :scopes
+        ORDER BY scope, rank
+    """).bindparams(bindparam('scopes', expanding=True)),
+    # One ranking over several boards ('rcb' is two team names), from the
+    # running totals: a match counts towards one season, venue and team of a
+    # player, so the totals add up
+    'leaderboard_merged': text("""
+        SELECT name, SUM(value) as value, SUM(matches) as matches, SUM(balls) as balls, SUM(runs) as runs
+        FROM leaderboard_totals
+        WHERE metric = :metric AND scope_type = :scope_type AND scope IN :scopes
+        GROUP BY name
+        HAVING SUM(value) > 0 OR :metric = 'wins'
+        ORDER BY value DESC, name
+        LIMIT :limit
+    """).bindparams(bindparam('scopes', expanding=True)),
+    'get_player_batting_stats': text("""
+        SELECT player_name, total_runs, matches_batted, highest_score,
+               batting_average, strike_rate, centuries, fifties, sixes, fours
+        FROM player_stats 
+        WHERE player_name IN :names
+        AND total_runs > 0
+        ORDER BY total_runs DESC
+        LIMIT 5
+    """).bindparams(bindparam('names', expanding=True)),
+    'get_player_bowling_stats': text("""
+        SELECT player_name, wickets_taken, matches_bowled, runs_conceded,
+               bowling_average, economy_rate, overs_bowled
+        FROM player_stats 
+        WHERE player_name IN :names
+        AND wickets_taken > 0
+        ORDER BY wickets_taken DESC
+        LIMIT 5
+    """).bindparams(bindparam('names', expanding=True)),
+    'highest_total_score': text("""
+        SELECT i.total_runs, i.team, m.venue, m.city, m.date, 
+               m.team1, m.team2, m.winner
+        FROM innings i
+        JOIN matches m ON i.match_id = m.id
+        ORDER BY i.total_runs DESC
+        LIMIT 15
+    """),
+    'lowest_total_score': text("""
+        SELECT i.total_runs, i.team, m.venue, m.city, m.date,
+               m.team1, m.team2, m.winner
+        FROM innings i
+        JOIN matches m ON i.match_id = m.id
+        WHERE i.total_runs > 0
+        ORDER BY i.total_runs ASC
+        LIMIT 15
+    """),
+    'matches_by_city': text("""
+        SELECT date, team1, team2, winner, venue
+        FROM matches 
+        WHERE city IN :cities
+        ORDER BY date DESC
+        LIMIT 30
+    """).bindparams(bindparam('cities', expanding=True)),
+    'matches_by_venue': text("""
+        SELECT date, team1, team2, winner, city
+        FROM matches 
+        WHERE venue IN :venues
+        ORDER BY date DESC
+        LIMIT 30
+    """).bindparams(bindparam('venues', expanding=True)),
+    'average_first_innings_score': text("""
+        SELECT AVG(total_runs) as avg_score, COUNT(*) as total_innings
+        FROM innings 
+        WHERE innings_number = 1 AND total_runs > 0
+    """),
+    'venue_highest_scores': text("""
+        SELECT m.venue, AVG(i.total_runs) as avg_score, 
+               MAX(i.total_runs) as highest_score, COUNT(i.id) as innings_count
+        FROM matches m
+        JOIN innings i ON m.id = i.match_id
+        WHERE m.venue IS NOT NULL
+        GROUP BY m.venue
+        HAVING COUNT(i.id) >= 10
+        ORDER BY avg_score DESC
+        LIMIT 15
+    """),
+    'season_scoring': text("""
+        SELECT m.season, SUM(d.runs_total) as runs,
+               SUM(CASE WHEN d.extras_type IN ('wide', 'noball') THEN 0 ELSE 1 END) as balls,
+               SUM(d.runs_batter = 4) as fours, SUM(d.runs_batter = 6) as sixes,
+               SUM(d.wicket_taken) as wickets
+        FROM deliveries d
+        JOIN matches m ON d.match_id = m.id
+        GROUP BY m.season
+        ORDER BY m.season NULLS FIRST
+    """),
+    'all_centuries': text("""
+        SELECT ps.player_name, ps.highest_score, ps.total_runs, ps.matches_batted
+        FROM player_stats ps
+        WHERE ps.highest_score >= 100
+        ORDER BY ps.highest_score DESC
+    """),
+    'successful_chases': text("""
+        SELECT m.date, i.total_runs, i.team as chasing_team,
+               m.team1, m.team2, m.winner, m.venue
+        FROM innings i
+        JOIN matches m ON i.match_id = m.id
+        WHERE i.innings_number = 2 
+        AND i.team = m.winner
+        AND i.target IS NOT NULL
+        ORDER BY i.total_runs DESC
+        LIMIT 20
+    """),
+    'powerplay_performance': text("""
+        SELECT i.team, AVG(i.total_runs) as avg_total,
+               COUNT(*) as matches_count
+        FROM innings i
+        JOIN matches m ON i.match_id = m.id
+        GROUP BY i.team
+        HAVING COUNT(*) >= 20
+        ORDER BY avg_total DESC
+        LIMIT 10
+    """),
+    'resolve_players': text("""
+        SELECT DISTINCT name FROM players
+        WHERE LOWER(name) LIKE LOWER(:name)
+    """),
+    'top_partnerships': text("""
+        SELECT p.runs, p.balls, p.batter1, p.batter1_runs, p.batter2, p.batter2_runs,
+               p.wicket, p.unbeaten, p.team, m.date, m.team1, m.team2
+        FROM partnerships p
+        JOIN matches m ON p.match_id = m.id
+        ORDER BY p.runs DESC
+        LIMIT 15
+    """),
+    'partnerships_by_wicket': text("""
+        SELECT p.runs, p.balls, p.batter1, p.batter1_runs, p.batter2, p.batter2_runs,
+               p.wicket, p.unbeaten, p.team, m.date, m.team1, m.team2
+        FROM partnerships p
+        JOIN matches m ON p.match_id = m.id
+        WHERE p.wicket = :wicket
+        ORDER BY p.runs DESC
+        LIMIT 15
+    """),
+    'partnerships_by_pair': text("""
+        SELECT p.runs, p.balls, p.batter1, p.batter1_runs, p.batter2, p.batter2_runs,
+               p.wicket, p.unbeaten, p.team, m.date, m.team1, m.team2
+        FROM partnerships p
+        JOIN matches m ON p.match_id = m.id
+        WHERE (p.batter1 IN :first AND p.batter2 IN :second)
+           OR (p.batter1 IN :second AND p.batter2 IN :first)
+        ORDER BY p.runs DESC
+        LIMIT 15
+    """).bindparams(bindparam('first', expanding=True), bindparam('second', expanding=True)),
+    'head_to_head': text("""
+        SELECT batter, bowler, balls, runs, dismissals, dots, fours, sixes
+        FROM matchups
+        WHERE batter IN :batters AND bowler IN :bowlers
+        ORDER BY balls DESC
+    """).bindparams(bindparam('batters', expanding=True), bindparam('bowlers', expanding=True)),
+    'toughest_bowlers': text("""
+        SELECT batter, bowler, dismissals, runs, balls, dots
+        FROM matchups
+        WHERE batter IN :batters AND balls >= 6
+        ORDER BY dismissals DESC, CAST(runs AS REAL) / balls ASC
+        LIMIT 10
+    """).bindparams(bindparam('batters', expanding=True)),
+    'best_batters_against': text("""
+        SELECT batter, bowler, runs, balls, dismissals, fours, sixes
+        FROM matchups
+        WHERE bowler IN :bowlers
+        ORDER BY runs DESC
+        LIMIT 10
+    """).bindparams(bindparam('bowlers', expanding=True)),
+    # Each leaderboard walks its fielding index backwards, no sort
+    'most_catches': text("""
+        SELECT fielder, catches, stumpings, run_outs
+        FROM fielding
+        WHERE catches > 0
+        ORDER BY catches DESC
+        LIMIT 15
+    """),
+    'most_stumpings': text("""
+        SELECT fielder, stumpings, catches, run_outs
+        FROM fielding
+        WHERE stumpings > 0
+        ORDER BY stumpings DESC
+        LIMIT 15
+    """),
+    'most_run_outs': text("""
+        SELECT fielder, run_outs, catches, stumpings
+        FROM fielding
+        WHERE run_outs > 0
+        ORDER BY run_outs DESC
+        LIMIT 15
+    """),
+    'player_fielding': text("""
+        SELECT fielder, catches, stumpings, run_outs
+        FROM fielding
+        WHERE fielder IN :names
+    """).bindparams(bindparam('names', expanding=True)),
+    # Covered by the (player_out, kind, is_super_over) index
+    'dismissal_kinds': text("""
+        SELECT player_out, kind, COUNT(*) as dismissals
+        FROM dismissals
+        WHERE player_out IN :names AND is_super_over = 0
+        GROUP BY player_out, kind
+        ORDER BY player_out, dismissals DESC
+    """).bindparams(bindparam('names', expanding=True)),
+    'resolve_teams': text("""
+        SELECT name FROM teams
+        WHERE LOWER(name) LIKE LOWER(:name)
+    """),
+    'score_at_over': text("""
+        SELECT o.team, o.cumulative_runs, o.cumulative_wickets, o.innings,
+               m.date, m.team1, m.team2, m.venue
+        FROM over_summary o
+        JOIN matches m ON o.match_id = m.id
+        WHERE o.team IN :teams AND o.over_number = :over
+        ORDER BY m.date DESC
+        LIMIT 20
+    """).bindparams(bindparam('teams', expanding=True)),
+    'phase_run_rate': text("""
+        SELECT team, SUM(runs) as runs, SUM(legal_balls) as balls, SUM(wickets) as wickets,
+               COUNT(DISTINCT match_id || '-' || innings) as innings_count
+        FROM over_summary
+        WHERE over_number BETWEEN :first AND :last
+        AND innings <= 2
+        GROUP BY team
+        ORDER BY CAST(SUM(runs) AS REAL) / MAX(SUM(legal_balls), 1) DESC NULLS LAST, team NULLS FIRST
+    """),
+    'match_worm': text("""
+        SELECT o.over_number, o.innings, o.team, o.runs, o.cumulative_runs, o.cumulative_wickets
+        FROM over_summary o
+        JOIN matches m ON o.match_id = m.id
+        WHERE m.match_id = :match_id
+        ORDER BY o.innings, o.over_number
+    """),
+}
+
+# Statements that scan ball-level tables (deliveries, over_summary) end to
+# end, which QueryEngine runs on the DuckDB mirror when the server is started
+# with --analytics-backend duckdb. Everything else stays on SQLite: lookups by
+# name are index searches, and innings-level aggregates read a few thousand
+# rows, less than DuckDB's fixed per-query cost. Both backends must return
+# identical rows (ORDER BYs end in a unique tie-breaker for that, and say
+# where NULLs go, as DuckDB puts them last and SQLite first); run
+# benchmarks/bench_duckdb.py or tests/test_duckdb_backend.py to check.
+ANALYTICS_STATEMENTS = {
+    'season_scoring': STATEMENTS['season_scoring'].text,
+    # DuckDB's MAX() is aggregate-only and its REAL is single precision
+    'phase_run_rate': """
+        SELECT team, SUM(runs) as runs, SUM(legal_balls) as balls, SUM(wickets) as wickets,
+               COUNT(DISTINCT match_id || '-' || innings) as innings_count
+        FROM over_summary
+        WHERE over_number BETWEEN :first AND :last
+        AND innings <= 2
+        GROUP BY team
+        ORDER BY CAST(SUM(runs) AS DOUBLE) / GREATEST(SUM(legal_balls), 1) DESC NULLS LAST, team NULLS FIRST
+    """,
+}
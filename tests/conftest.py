@@ -0,0 +1,84 @@
+"""
+Shared fixtures: data_small ingested once into a temporary database
+"""
+
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data_processing.json_parser import IPLDataProcessor
+from src.database import database
+from src.database.models import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_SMALL = ROOT / "data_small"
+
+
+def session_factory(db_path):
+    """(engine, sessionmaker) of a new database with every table"""
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def ingest(db_path, data_dir=DATA_SMALL, **options):
+    """Ingest data_dir into db_path and calculate statistics, as main.py --setup does"""
+    engine, factory = session_factory(db_path)
+    processor = IPLDataProcessor(session=factory())
+    count = processor.process_all_matches(str(data_dir), **options)
+    IPLDataProcessor(session=factory()).calculate_statistics()
+    engine.dispose()
+    return count
+
+
+@pytest.fixture(scope="session")
+def loaded_db(tmp_path_factory):
+    """Path of a database with data_small loaded; copy it before writing to it"""
+    db_path = tmp_path_factory.mktemp("loaded") / "ipl_cricket.db"
+    ingest(db_path)
+    return db_path
+
+
+@pytest.fixture
+def served_db(loaded_db, tmp_path, monkeypatch):
+    """A copy of the loaded database as ./ipl_cricket.db, where the server's engines look for it
+
+    Engines rebound by the test (replica, shards) are put back afterwards.
+    Tests using the async engines dispose them before their event loop
+    closes (see dispose_async_engine).
+    """
+    db_path = tmp_path / "ipl_cricket.db"
+    shutil.copy(loaded_db, db_path)
+    monkeypatch.chdir(tmp_path)
+    saved = {name: getattr(database, name) for name in ('engine', 'async_engine', '_replica_keeper', '_shard_store')}
+    # The module's engines resolved ipl_cricket.db when they were created
+    database.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    event.listen(database.engine, "connect", database._enable_wal)
+    database.async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", echo=False)
+    database.SessionLocal.configure(bind=database.engine)
+    database.AsyncSessionLocal.configure(bind=database.async_engine)
+    yield db_path
+
+    database.engine.dispose()
+    if database._replica_keeper is not saved['_replica_keeper']:
+        database._replica_keeper.close()
+    for name, value in saved.items():
+        setattr(database, name, value)
+    database.SessionLocal.configure(bind=database.engine)
+    database.AsyncSessionLocal.configure(bind=database.async_engine)
+    database._engines_by_attachments.clear()
+    database._engines_by_seasons.clear()
+    database._retired_async_engines.clear()
+
+
+def publish_generation(db_path):
+    """Commit a new data generation to db_path, as an ingest run does"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE data_generation SET generation = generation + 1 WHERE id = 1")
+    conn.commit()
+    conn.close()
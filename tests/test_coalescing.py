@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.mcp_server.coalescing import SingleFlight
+
+
+def test_concurrent_callers_share_one_result():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return ["answer"]
+
+        waiters = [asyncio.ensure_future(flight.run("q", call)) for _ in range(5)]
+        other = asyncio.ensure_future(flight.run("other", call))
+        await asyncio.sleep(0)
+        assert flight.stats() == {'requests': 6, 'executions': 2, 'coalesced': 4, 'in_flight': 2}
+        release.set()
+        results = await asyncio.gather(*waiters)
+        await other
+        # One execution per key, and every caller gets the very same object
+        assert len(calls) == 2
+        assert all(result is results[0] for result in results)
+        assert flight.stats()['in_flight'] == 0
+
+        # Nothing is cached: a later caller runs the call again
+        await flight.run("q", call)
+        assert len(calls) == 3
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_callers_share_one_exception():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            raise ValueError("no such player")
+
+        waiters = [asyncio.ensure_future(flight.run("q", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats() == {'requests': 3, 'executions': 1, 'coalesced': 2, 'in_flight': 0}
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return 42
+
+        leaving = asyncio.ensure_future(flight.run("q", call))
+        staying = asyncio.ensure_future(flight.run("q", call))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await staying == 42
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+    asyncio.run(scenario())
@@ -0,0 +1,108 @@
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.database.models import Base
+from src.mcp_server.statements import ANALYTICS_STATEMENTS, STATEMENTS
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from src.database.duckdb_mirror import DuckDBMirror  # noqa: E402
+
+# Parameters to run each statement with; statements not listed take none
+PARAMETERS = {
+    'phase_run_rate': [{'first': 1, 'last': 6}, {'first': 7, 'last': 15}, {'first': 16, 'last': 20},
+                       {'first': 1, 'last': 20}],
+}
+CASES = [(name, params) for name in ANALYTICS_STATEMENTS for params in PARAMETERS.get(name, [None])]
+
+
+def both_backends(db_path, name, params):
+    """(SQLite rows, DuckDB mirror rows) of an analytics statement"""
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    try:
+        with engine.connect() as conn:
+            expected = [tuple(row) for row in conn.execute(STATEMENTS[name], params)]
+            mirror = DuckDBMirror(conn)
+            try:
+                _, actual = mirror.execute(ANALYTICS_STATEMENTS[name], params)
+            finally:
+                mirror.close()
+    finally:
+        engine.dispose()
+    return expected, [tuple(row) for row in actual]
+
+
+@pytest.fixture(scope="module")
+def edge_case_db(loaded_db, tmp_path_factory):
+    """The loaded database plus rows that are easy to get wrong in one backend
+
+    A match without a season, NULL teams and counts in over_summary, a
+    super over in innings 3, and teams (one of them NULL) tied on run rate.
+    """
+    db_path = tmp_path_factory.mktemp("edge_cases") / "ipl_cricket.db"
+    shutil.copy(loaded_db, db_path)
+    conn = sqlite3.connect(db_path)
+    match_id = conn.execute("INSERT INTO matches (match_id, venue, season, team1, team2) "
+                            "VALUES ('edge-1', 'Nowhere', NULL, 'Tie A', 'Tie B')").lastrowid
+    super_over_match = conn.execute("SELECT id FROM matches WHERE season IS NOT NULL ORDER BY id LIMIT 1").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO deliveries (match_id, innings, over, ball, batter, bowler, runs_batter, runs_extras, "
+        "runs_total, extras_type, wicket_taken, is_super_over) VALUES (?, ?, 1, ?, 'X', 'Y', ?, ?, ?, ?, ?, ?)",
+        [(match_id, 1, 1, 4, 0, 4, None, 0, 0),
+         (match_id, 1, 2, 0, 1, 1, 'wide', 0, 0),
+         (match_id, 1, 3, None, None, None, None, None, None),
+         (super_over_match, 3, 1, 6, 0, 6, None, 0, 1),
+         (super_over_match, 3, 2, 0, 0, 0, None, 1, 1)])
+    conn.executemany(
+        "INSERT INTO over_summary (match_id, innings, team, over_number, runs, wickets, legal_balls) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(match_id, 1, 'Tie A', 1, 9, 0, 6),
+         (match_id, 2, 'Tie B', 1, 9, 1, 6),
+         (match_id, 1, None, 2, 5, None, 6),
+         (match_id, 2, 'Tie B', 2, None, 0, 0),
+         (match_id, 1, None, 3, 13, 0, 6),
+         (super_over_match, 3, 'Tie A', 1, 20, 1, 6)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.mark.parametrize("name,params", CASES)
+def test_backends_agree_on_loaded_data(loaded_db, name, params):
+    expected, actual = both_backends(loaded_db, name, params)
+    assert expected
+    assert actual == expected
+
+
+@pytest.mark.parametrize("name,params", CASES)
+def test_backends_agree_on_edge_cases(edge_case_db, name, params):
+    expected, actual = both_backends(edge_case_db, name, params)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("name,params", CASES)
+def test_backends_agree_on_empty_tables(tmp_path, name, params):
+    db_path = tmp_path / "empty.db"
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    assert both_backends(db_path, name, params) == ([], [])
+
+
+def test_edge_cases_reach_the_statements(edge_case_db):
+    # The rows above must show up, or the edge case tests check nothing
+    season_scoring, _ = both_backends(edge_case_db, 'season_scoring', None)
+    assert any(season is None for season, *_ in season_scoring)
+    phase, _ = both_backends(edge_case_db, 'phase_run_rate', {'first': 1, 'last': 1})
+    teams = [row[0] for row in phase]
+    assert teams.index('Tie A') + 1 == teams.index('Tie B')
+    # The super over is left out of phases
+    assert phase[teams.index('Tie A')][1] == 9
+    phase, _ = both_backends(edge_case_db, 'phase_run_rate', {'first': 1, 'last': 6})
+    teams = [row[0] for row in phase]
+    # Tied at 1.5 an over: the NULL team sorts first
+    assert teams[teams.index(None):teams.index(None) + 3] == [None, 'Tie A', 'Tie B']
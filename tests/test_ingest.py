@@ -0,0 +1,50 @@
+import sqlite3
+
+from src.data_processing.json_parser import IPLDataProcessor
+
+from conftest import DATA_SMALL, ingest
+
+FAILING_MATCH = "1082593"
+
+
+def table_counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('matches', 'innings', 'deliveries', 'partnerships', 'dismissals', 'matchups',
+                              'leaderboard_totals', 'players')}
+    finally:
+        conn.close()
+
+
+def test_failed_match_leaves_no_rows_and_is_retried(loaded_db, tmp_path, monkeypatch):
+    process_players = IPLDataProcessor.process_players
+
+    def fail_once(self, registry):
+        # After the match's Core inserts, like a bad registry entry would
+        if FAILING_MATCH in self.known_match_ids:
+            raise ValueError("bad registry")
+        return process_players(self, registry)
+
+    db_path = tmp_path / "partial.db"
+    monkeypatch.setattr(IPLDataProcessor, "process_players", fail_once)
+    assert ingest(db_path, commit_every=5) == 17
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM matches WHERE match_id = ?", (FAILING_MATCH,)).fetchone()[0] == 0
+    # Every row left belongs to a match that is there
+    assert conn.execute("SELECT COUNT(*) FROM deliveries WHERE match_id NOT IN (SELECT id FROM matches)"
+                        ).fetchone()[0] == 0
+    conn.close()
+
+    monkeypatch.setattr(IPLDataProcessor, "process_players", process_players)
+    assert ingest(db_path) == 1
+    counts = table_counts(db_path)
+    assert counts == table_counts(loaded_db)
+
+
+def test_rerun_skips_ingested_matches(loaded_db, tmp_path):
+    db_path = tmp_path / "ipl_cricket.db"
+    db_path.write_bytes(loaded_db.read_bytes())
+    assert ingest(db_path, data_dir=DATA_SMALL) == 0
+    assert table_counts(db_path) == table_counts(loaded_db)
@@ -0,0 +1,119 @@
+import random
+import shutil
+import sqlite3
+
+from src.data_processing.leaderboards import LEADERBOARD_SIZE, Leaderboards, merge_board
+
+from conftest import DATA_SMALL, ingest
+
+# Per-season totals of each player metric, straight from the ball-level tables
+# (super overs left out, wickets credited to the bowler)
+SEASON_TOTALS = {
+    'runs': """
+        SELECT m.season, d.batter, SUM(d.runs_batter), COUNT(DISTINCT d.match_id),
+               SUM(CASE WHEN d.extras_type = 'wide' THEN 0 ELSE 1 END), SUM(d.runs_batter)
+        FROM deliveries d JOIN matches m ON m.id = d.match_id
+        WHERE d.innings <= 2
+        GROUP BY m.season, d.batter
+    """,
+    'wickets': """
+        SELECT m.season, d.bowler,
+               SUM((SELECT COUNT(*) FROM dismissals w
+                    WHERE w.match_id = d.match_id AND w.innings = d.innings
+                    AND w.over = d.over AND w.ball = d.ball AND w.bowler_credited = 1)),
+               COUNT(DISTINCT d.match_id),
+               SUM(CASE WHEN d.extras_type IN ('wide', 'noball') THEN 0 ELSE 1 END),
+               SUM(d.runs_total - CASE WHEN d.extras_type IN ('bye', 'legbye') THEN d.runs_extras ELSE 0 END)
+        FROM deliveries d JOIN matches m ON m.id = d.match_id
+        WHERE d.innings <= 2
+        GROUP BY m.season, d.bowler
+    """,
+}
+
+
+def boards(db_path):
+    """{(metric, scope_type, scope): [(name, value, matches, balls, runs), ...]} in rank order"""
+    conn = sqlite3.connect(db_path)
+    try:
+        result = {}
+        for row in conn.execute("SELECT metric, scope_type, scope, name, value, matches, balls, runs "
+                                "FROM leaderboards ORDER BY metric, scope_type, scope, rank"):
+            result.setdefault(row[:3], []).append(row[3:])
+        return result
+    finally:
+        conn.close()
+
+
+def top(entries):
+    return sorted(entries, key=lambda entry: (-entry[1], entry[0]))[:LEADERBOARD_SIZE]
+
+
+def test_merge_board_ranks_ties_by_name_and_leaves_out_zeros():
+    current = [('B', 5, 1, 6, 5), ('D', 3, 1, 6, 3)]
+    changed = [('A', 5, 1, 6, 5), ('C', 0, 1, 6, 0), ('D', 4, 2, 12, 4)]
+    assert merge_board('wickets', current, changed) == [('A', 5, 1, 6, 5), ('B', 5, 1, 6, 5), ('D', 4, 2, 12, 4)]
+    assert merge_board('runs', current, changed, size=2) == [('A', 5, 1, 6, 5), ('B', 5, 1, 6, 5)]
+    # A team without a win still has a place on the wins board
+    assert merge_board('wins', [], [('X', 0, 1, 0, 0)]) == [('X', 0, 1, 0, 0)]
+
+
+def test_incremental_merges_equal_ranking_every_total():
+    rng = random.Random(7)
+    totals = {}
+    board = []
+    for _ in range(300):
+        changed = []
+        for name in rng.sample([f"P{i:02d}" for i in range(60)], 5):
+            totals[name] = totals.get(name, 0) + rng.randint(0, 3)
+            changed.append((name, totals[name], 0, 0, 0))
+        board = merge_board('runs', board, changed, size=10)
+        assert board == top((name, value, 0, 0, 0) for name, value in totals.items() if value > 0)[:10]
+
+
+def test_leaderboards_only_mark_changed_boards():
+    class Tracker:
+        def contributions(self):
+            yield ('runs', 'season', '2017', 'A'), [10, 8, 10]
+            yield ('runs', 'all', '', 'A'), [10, 8, 10]
+
+    leaderboards = Leaderboards({}, {('runs', 'all', ''): [('A', 0, 0, 0, 0)]})
+    leaderboards.add_match(Tracker())
+    assert leaderboards.boards[('runs', 'season', '2017')] == [('A', 10, 1, 8, 10)]
+    assert leaderboards.dirty_boards == {('runs', 'season', '2017'), ('runs', 'all', '')}
+    assert leaderboards.totals[('runs', 'all', '', 'A')] == [10, 1, 8, 10]
+
+
+def test_boards_are_the_top_of_their_totals(loaded_db):
+    conn = sqlite3.connect(loaded_db)
+    totals = {}
+    for row in conn.execute("SELECT metric, scope_type, scope, name, value, matches, balls, runs "
+                            "FROM leaderboard_totals"):
+        if row[4] > 0 or row[0] == 'wins':
+            totals.setdefault(row[:3], []).append(row[3:])
+    conn.close()
+    assert boards(loaded_db) == {board: top(entries) for board, entries in totals.items()}
+
+
+def test_season_boards_equal_the_deliveries_aggregate(loaded_db):
+    conn = sqlite3.connect(loaded_db)
+    expected = {}
+    for metric, sql in SEASON_TOTALS.items():
+        for season, name, *values in conn.execute(sql):
+            if values[0] > 0:
+                expected.setdefault((metric, 'season', season), []).append((name, *values))
+    conn.close()
+    season_boards = {board: entries for board, entries in boards(loaded_db).items()
+                     if board[1] == 'season' and board[0] != 'wins'}
+    assert season_boards == {board: top(entries) for board, entries in expected.items()}
+
+
+def test_loading_in_two_runs_gives_the_same_boards(loaded_db, tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    for i, path in enumerate(sorted(DATA_SMALL.glob("*.json"))):
+        shutil.copy(path, (first if i % 2 else second) / path.name)
+
+    db_path = tmp_path / "ipl_cricket.db"
+    assert ingest(db_path, data_dir=first) + ingest(db_path, data_dir=second) == 18
+    assert boards(db_path) == boards(loaded_db)
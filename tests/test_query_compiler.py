@@ -0,0 +1,130 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.mcp_server.entity_extractor import Entity, EntityExtractor
+from src.mcp_server.query_compiler import Filter, QueryCompiler, QuerySpec
+from src.mcp_server.query_engine import QueryEngine
+from src.mcp_server.statements import STATEMENTS
+
+
+def entity(query, surface, kind, *names):
+    start = query.index(surface)
+    return Entity(kind, start, start + len(surface), surface, names or (surface,))
+
+
+def parse(query, *entities):
+    return QueryCompiler().parse(query, list(entities))
+
+
+def filters(spec):
+    return {f.field: f.values for f in spec.filters}
+
+
+def test_wicket_keeper_is_not_the_wickets_metric():
+    spec = parse("which wicket-keeper scored the most runs in 2017")
+    assert (spec.intent, spec.metric) == ('leaders', 'runs')
+    assert parse("most wicketkeeper dismissals in 2017") is None
+
+
+def test_run_outs_and_run_rate_are_not_the_runs_metric():
+    assert parse("most run outs in 2017") is None
+    assert parse("highest run-rate in the powerplay") is None
+    spec = parse("most wickets in 2017 excluding run outs")
+    assert spec.metric == 'wickets'
+
+
+@pytest.mark.parametrize("word", ["against", "vs", "vs.", "versus", "against the"])
+def test_team_after_opponent_word_is_the_opponent(word):
+    query = f"most sixes by mumbai indians {word} chennai super kings"
+    spec = parse(query, entity(query, "mumbai indians", 'team', "Mumbai Indians"),
+                 entity(query, "chennai super kings", 'team', "Chennai Super Kings"))
+    assert filters(spec) == {'team': ("Mumbai Indians",), 'opponent': ("Chennai Super Kings",)}
+    assert spec.description() == "Most sixes (Mumbai Indians, vs Chennai Super Kings)"
+
+
+def test_city_that_is_also_a_surname_is_read_as_the_city():
+    query = "most fours in chennai"
+    spec = parse(query, entity(query, "chennai", 'player', "A Chennai"),
+                 entity(query, "chennai", 'city', "Chennai"))
+    assert filters(spec) == {'city': ("Chennai",)}
+
+
+def test_named_player_is_not_compiled():
+    query = "most sixes by kohli in chennai"
+    assert parse(query, entity(query, "kohli", 'player', "V Kohli"),
+                 entity(query, "chennai", 'city', "Chennai")) is None
+
+
+def test_season_and_phase_filters_combine():
+    spec = parse("how many sixes in the death overs of 2017 and 2008")
+    assert spec.intent == 'total'
+    # Each year under both names it may be stored as
+    assert filters(spec) == {'season': ("2017", "2016/17", "2008", "2007/08"), 'phase': (16, 20)}
+    assert spec.description() == "Total sixes (2017/2008, death overs (16-20))"
+
+    spec = parse("most wickets in overs 20 to 16 of 2007/08 batting second")
+    assert filters(spec) == {'season': ("2007/08",), 'innings': (2,), 'phase': (16, 20)}
+
+
+def test_same_shape_shares_the_statement():
+    compiler = QueryCompiler()
+    first = compiler.compile(compiler.parse("most sixes in the powerplay of 2017", []))
+    second = compiler.compile(compiler.parse("most sixes in the powerplay of 2009", []))
+    assert first[0] is second[0] and first[1] != second[1]
+    assert (compiler.hits, compiler.misses) == (1, 1)
+
+
+@pytest.fixture(scope="module")
+def loaded_session(loaded_db):
+    engine = create_engine(f"sqlite:///{loaded_db}", echo=False)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("query", [
+    "most runs in 2017",
+    "most wickets in 2008",
+    "most runs at chinnaswamy stadium",
+    "most wickets at wankhede stadium",
+    "most runs for mumbai indians",
+    "most wickets by royal challengers bangalore",
+])
+def test_board_matches_the_deliveries_statement(loaded_session, query):
+    compiler = QueryCompiler()
+    spec = compiler.parse(query, EntityExtractor.from_session(loaded_session).extract(query))
+    assert compiler._source(spec) == 'board'
+
+    connection = loaded_session.connection()
+    statement, params = compiler.compile(spec)
+    board = connection.execute(statement, params).fetchall()
+    deliveries = connection.execute(compiler._build(spec, 'deliveries'),
+                                    compiler._parameters(spec, 'deliveries')).fetchall()
+    assert board
+    assert [tuple(row) for row in board] == [tuple(row) for row in deliveries]
+
+
+@pytest.mark.parametrize("metric,team", [("runs", "kings"), ("wickets", "kings"), ("runs", "rcb")])
+def test_several_team_boards_rank_as_one(served_db, metric, team):
+    engine = QueryEngine()
+    teams = engine._resolve_teams(team)
+    assert len(teams) > 1
+    result = engine.team_leaderboard(f"most {metric}", team)
+
+    compiler = QueryCompiler()
+    spec = QuerySpec('leaders', metric, (Filter('team', tuple(teams), team),))
+    deliveries = engine.session.connection().execute(compiler._build(spec, 'deliveries'),
+                                                     compiler._parameters(spec, 'deliveries')).fetchall()
+    names = [row[0] for row in result.rows]
+    assert len(names) == len(set(names))
+    assert [tuple(row) for row in result.rows] == [tuple(row) for row in deliveries]
+
+
+def test_a_years_season_names_read_its_board(served_db):
+    engine = QueryEngine()
+    season = engine.season_leaderboard("most runs", "2017")
+    board = engine.session.connection().execute(
+        STATEMENTS['leaderboard'], {'metric': 'runs', 'scope_type': 'season', 'scopes': ['2017']}).fetchall()
+    assert season.rows and [tuple(row) for row in season.rows] == [tuple(row) for row in board]
@@ -0,0 +1,46 @@
+from src.mcp_server.query_log import QueryLog
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "query_log.json"
+    log = QueryLog(str(path))
+    for _ in range(3):
+        log.record("Who took the most  WICKETS?", "text")
+    log.record("Show me Virat Kohli batting stats", "json")
+    assert log.save()
+
+    reloaded = QueryLog(str(path))
+    assert reloaded.counts == log.counts
+    assert reloaded.top(2) == [("who took the most wickets?", "text"), ("show me virat kohli batting stats", "json")]
+
+
+def test_saves_add_to_counts_saved_by_others(tmp_path):
+    path = str(tmp_path / "query_log.json")
+    first, second = QueryLog(path), QueryLog(path)
+    first.record("most runs", "text")
+    second.record("most runs", "text")
+    second.record("most wickets", "text")
+    assert first.save() and second.save()
+    # Nothing recorded since, so nothing is counted twice
+    assert not first.save()
+
+    assert dict(QueryLog(path).counts) == {("most runs", "text"): 2, ("most wickets", "text"): 1}
+
+
+def test_unwritable_path_is_reported_and_counts_kept(tmp_path, capsys):
+    path = tmp_path / "missing" / "query_log.json"
+    log = QueryLog(str(path))
+    log.record("most runs", "text")
+    assert not log.save()
+    assert "Error saving the query log" in capsys.readouterr().err
+    assert list((tmp_path).iterdir()) == []
+
+    path.parent.mkdir()
+    assert log.save()
+    assert dict(QueryLog(str(path)).counts) == {("most runs", "text"): 1}
+
+
+def test_unreadable_log_starts_over(tmp_path):
+    path = tmp_path / "query_log.json"
+    path.write_text("{not json")
+    assert QueryLog(str(path)).top(5) == []
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.data_processing.leaderboards import season_names
+from src.data_processing.shard_builder import build_store
+from src.database import database
+from src.database.shards import ShardStore
+from src.mcp_server.query_compiler import QueryCompiler
+from src.mcp_server.query_engine import QueryEngine
+from src.mcp_server.statements import STATEMENTS
+
+from conftest import DATA_SMALL
+
+# Compiled questions, asked about each season of data_small
+SEASON_QUESTIONS = [
+    "most runs in {season}",
+    "most wickets in {season} in the death overs",
+    "total sixes in {season}",
+    "most fours in {season} batting second",
+]
+SEASONS = ["2008", "2009", "2017"]
+WHOLE_DATASET_STATEMENTS = ['season_scoring', 'average_first_innings_score', 'successful_chases', 'get_team_stats']
+SERVED_QUESTIONS = [
+    "most runs in 2017",
+    "most wickets in 2008 in the powerplay",
+    "how many sixes in 2009",
+    "Who scored the most runs?",
+    "Which team won the most matches?",
+    "Show runs scored by season",
+]
+
+
+@pytest.fixture(scope="module")
+def shard_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("shards")
+    build_store(str(directory), str(DATA_SMALL))
+    return directory
+
+
+def rows(engine, statement, params):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(statement, params)]
+
+
+def store_engine(store, seasons=None):
+    attachments = store.attachments(seasons)
+    return create_engine("sqlite://", creator=lambda: store.connect(attachments)), attachments
+
+
+def test_pruned_and_federated_statements_equal_the_single_database(loaded_db, shard_dir):
+    store = ShardStore(str(shard_dir))
+    single = create_engine(f"sqlite:///{loaded_db}", echo=False)
+    federated, every_file = store_engine(store)
+    compiler = QueryCompiler()
+    try:
+        for statement_name in WHOLE_DATASET_STATEMENTS:
+            expected = rows(single, STATEMENTS[statement_name], {})
+            assert expected
+            assert sorted(rows(federated, STATEMENTS[statement_name], {}), key=repr) == sorted(expected, key=repr)
+
+        for season in SEASONS:
+            pruned, season_files = store_engine(store, season_names(season))
+            assert len(season_files) == 1 < len(every_file)
+            try:
+                for question in SEASON_QUESTIONS:
+                    statement, params = compiler.compile(compiler.parse(question.format(season=season), []))
+                    expected = rows(single, statement, params)
+                    assert expected, question
+                    assert rows(federated, statement, params) == expected
+                    assert rows(pruned, statement, params) == expected
+            finally:
+                pruned.dispose()
+    finally:
+        single.dispose()
+        federated.dispose()
+
+
+def test_catalog_boards_equal_the_single_database(loaded_db, shard_dir):
+    query = ("SELECT metric, scope_type, scope, rank, name, value, matches, balls, runs FROM leaderboards "
+             "ORDER BY metric, scope_type, scope, rank")
+    single = sqlite3.connect(loaded_db)
+    catalog = sqlite3.connect(ShardStore(str(shard_dir)).catalog_path)
+    try:
+        assert catalog.execute(query).fetchall() == single.execute(query).fetchall()
+    finally:
+        single.close()
+        catalog.close()
+
+
+def test_served_answers_equal_the_single_database(served_db, shard_dir):
+    expected = {question: QueryEngine().process_query(question, 'json') for question in SERVED_QUESTIONS}
+
+    database.use_sharded_database(str(shard_dir))
+    engine = QueryEngine()
+    for question in SERVED_QUESTIONS:
+        assert engine.process_query(question, 'json') == expected[question], question
+    # The season-filtered questions ran on sessions attaching only their season
+    assert set(database._engines_by_seasons) == {("2016/17", "2017"), ("2007/08", "2008"), ("2008/09", "2009")}
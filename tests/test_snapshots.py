@@ -0,0 +1,109 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from src.database import database
+from src.mcp_server.query_engine import QueryEngine
+
+from conftest import publish_generation
+
+
+def test_snapshot_swaps_on_generation_bump(served_db):
+    engine = QueryEngine()
+    generation = engine.generation
+    assert not engine.refresh()
+
+    publish_generation(served_db)
+    assert engine.refresh()
+    assert engine.generation == generation + 1
+    assert not engine.refresh()
+
+
+def test_commit_without_new_generation_keeps_snapshot_and_factories(served_db):
+    database.use_memory_replica()
+    engine = QueryEngine()
+    snapshot, bound = engine._snapshot, database.engine
+
+    conn = sqlite3.connect(served_db)
+    conn.execute("UPDATE teams SET short_name = 'XX' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    assert not engine.refresh()
+    assert engine._snapshot is snapshot
+    # Not recopied: sessions opened now see the same data as the snapshot
+    assert database.engine is bound
+
+
+def test_failed_rebuild_is_retried(served_db, monkeypatch):
+    engine = QueryEngine()
+    generation = engine.generation
+    publish_generation(served_db)
+
+    def failing_open_snapshot(self):
+        raise OSError("disk I/O error")
+
+    open_snapshot = QueryEngine._open_snapshot
+    monkeypatch.setattr(QueryEngine, "_open_snapshot", failing_open_snapshot)
+    with pytest.raises(OSError):
+        engine.refresh()
+    assert engine.generation == generation
+
+    monkeypatch.setattr(QueryEngine, "_open_snapshot", open_snapshot)
+    assert engine.refresh()
+    assert engine.generation == generation + 1
+
+
+def test_background_refresh_keeps_serving_the_current_snapshot(served_db, monkeypatch):
+    engine = QueryEngine()
+    generation = engine.generation
+    rebuilding = threading.Event()
+    open_snapshot = QueryEngine._open_snapshot
+
+    def slow_open_snapshot(self):
+        rebuilding.set()
+        time.sleep(0.5)
+        return open_snapshot(self)
+
+    monkeypatch.setattr(QueryEngine, "_open_snapshot", slow_open_snapshot)
+    publish_generation(served_db)
+
+    async def scenario():
+        try:
+            started = time.perf_counter()
+            answer = await engine.aprocess_query("How many matches?")
+            answered_at = time.perf_counter() - started
+            refreshing = engine.refresh_in_background()
+            assert refreshing is not None
+            # Answered while the new snapshot was still being built
+            assert rebuilding.is_set() and answered_at < 0.5
+            assert engine.generation == generation
+            assert await refreshing
+            return answer
+        finally:
+            await database.dispose_async_engine()
+
+    assert "18" in asyncio.run(scenario())
+    assert engine.generation == generation + 1
+
+
+def test_snapshot_of_a_database_without_generations_stays_pinned(served_db):
+    conn = sqlite3.connect(served_db)
+    conn.execute("DROP TABLE data_generation")
+    conn.commit()
+
+    engine = QueryEngine()
+    assert engine.generation == 0
+    session = engine._snapshot.session
+    assert session.connection().connection.dbapi_connection.in_transaction
+    matches = session.execute(text("SELECT COUNT(*) FROM matches")).scalar()
+
+    conn.execute("DELETE FROM matches WHERE id = (SELECT MAX(id) FROM matches)")
+    conn.commit()
+    conn.close()
+    # Still the state the snapshot was opened on
+    assert session.execute(text("SELECT COUNT(*) FROM matches")).scalar() == matches
@@ -0,0 +1,29 @@
+import zipfile
+
+import pytest
+
+from src.data_processing.sources import MatchSource, open_match_source
+
+from conftest import DATA_SMALL
+
+
+def test_source_without_read_bytes_cannot_be_created():
+    class Unreadable(MatchSource):
+        pass
+
+    with pytest.raises(TypeError, match="read_bytes"):
+        Unreadable("somewhere", [])
+
+
+def test_directory_and_zip_archive_yield_the_same_matches(tmp_path):
+    archive = tmp_path / "ipl_json.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in DATA_SMALL.glob("*.json"):
+            zf.write(path, f"ipl_json/{path.name}")
+
+    with open_match_source(str(DATA_SMALL)) as directory, open_match_source(str(archive)) as zipped:
+        assert [match_id for match_id, _ in directory.entries] == [match_id for match_id, _ in zipped.entries]
+        for (match_id, from_directory), (_, from_zip) in zip(directory.iter_matches(),
+                                                             zipped.iter_matches(workers=2)):
+            assert from_directory.document == from_zip.document, match_id
+            assert from_directory.info.teams == from_zip.info.teams